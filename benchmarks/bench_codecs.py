@@ -0,0 +1,95 @@
+"""Benchmark parse and dump throughput of the configuration codecs.
+
+Compares the pure Python and libyaml YAML implementations and the available JSON
+backends across configuration sizes.
+
+Usage:
+    python benchmarks/bench_codecs.py [--sizes 0.1 1 8] [--repeat 3]
+"""
+
+import argparse
+import json
+import time
+
+import yaml
+
+from nekoconf.utils.helper import JSON_BACKENDS, Codec, get_codec
+
+
+def make_config(target_bytes: int) -> dict:
+    """Build a nested configuration whose JSON form is roughly target_bytes long."""
+    config = {}
+    section = 0
+    size = 0
+    while size < target_bytes:
+        entry = {
+            "enabled": section % 2 == 0,
+            "host": f"service-{section}.internal.example.com",
+            "port": 8000 + section,
+            "timeout": 2.5,
+            "tags": ["alpha", "beta", f"shard-{section % 16}"],
+            "limits": {"cpu": "500m", "memory": "1Gi", "replicas": section % 5 + 1},
+            "description": f"Service number {section} with a reasonably long description",
+        }
+        config[f"service_{section}"] = entry
+        size += len(json.dumps(entry)) + 16
+        section += 1
+    return config
+
+
+def pure_python_yaml() -> Codec:
+    def loads(content):
+        return yaml.load(content, Loader=yaml.SafeLoader)
+
+    def dumps(data):
+        return yaml.dump(
+            data, Dumper=yaml.SafeDumper, default_flow_style=False, sort_keys=False, indent=2
+        ).encode("utf-8")
+
+    return Codec("yaml-python", loads, dumps)
+
+
+def codecs():
+    """Yield (format, codec) pairs to compare."""
+    yield "yaml", pure_python_yaml()
+    if get_codec("yaml").name != "yaml-python":
+        yield "yaml", get_codec("yaml")
+    for factory in JSON_BACKENDS.values():
+        if factory:
+            yield "json", factory()
+
+
+def best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=float, nargs="+", default=[0.1, 1, 8], help="config sizes in MB"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    args = parser.parse_args()
+
+    print(f"{'codec':<14}{'size':>9}{'parse':>11}{'parse MB/s':>12}{'dump':>11}{'dump MB/s':>11}")
+    for size_mb in args.sizes:
+        data = make_config(int(size_mb * 1024 * 1024))
+        for fmt, codec in codecs():
+            content = codec.dumps(data)
+            mb = len(content) / (1024 * 1024)
+            parse = best_of(args.repeat, codec.loads, content)
+            dump = best_of(args.repeat, codec.dumps, data)
+            print(
+                f"{codec.name:<14}{mb:>7.2f}MB{parse * 1000:>9.1f}ms{mb / parse:>12.1f}"
+                f"{dump * 1000:>9.1f}ms{mb / dump:>11.1f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
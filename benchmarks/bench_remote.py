@@ -0,0 +1,91 @@
+"""Benchmark connection reuse of RemoteStorageBackend against a local orchestrator.
+
+Compares saves that open a new connection per request, as module-level
+``requests`` calls do, with saves through the backend's pooled session.
+
+Usage:
+    python benchmarks/bench_remote.py [--saves 500] [--size 1024] [--threads 1]
+"""
+
+import argparse
+import json
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import uvicorn
+
+from nekoconf.core.config import NekoConf
+from nekoconf.server.app import NekoConfOrchestrator
+from nekoconf.storage.remote import RemoteStorageBackend
+
+
+def start_orchestrator() -> str:
+    """Run an orchestrator on a free local port and return its URL."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    orchestrator = NekoConfOrchestrator(apps={"bench": NekoConf({}, event_emission_enabled=True)})
+    server = uvicorn.Server(
+        uvicorn.Config(orchestrator.app, host="127.0.0.1", port=port, log_level="error")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def make_config(size: int) -> dict:
+    """Build a configuration whose JSON form is roughly size bytes long."""
+    return {"values": {f"key_{i}": f"value {i:08d}" for i in range(max(1, size // 28))}}
+
+
+def unpooled_save(url: str, data: dict) -> bool:
+    payload = {"data": json.dumps(data), "format": "json"}
+    response = requests.put(f"{url}/api/apps/bench/config", json=payload, timeout=10)
+    return response.status_code == 200
+
+
+def run(label: str, save, saves: int, threads: int, data: dict) -> None:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(lambda _: save(data), range(saves)))
+    elapsed = time.perf_counter() - start
+    assert all(results), f"{label}: {results.count(False)} saves failed"
+    print(
+        f"{label:<22}{saves / elapsed:>10.0f}/s{elapsed / saves * 1000:>10.2f}ms/save"
+        f"{elapsed:>9.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--saves", type=int, default=500, help="saves per run")
+    parser.add_argument("--size", type=int, default=1024, help="config size in bytes")
+    parser.add_argument("--threads", type=int, default=1, help="concurrent savers")
+    args = parser.parse_args()
+
+    logging.getLogger("nekoconf").setLevel(logging.WARNING)
+    url = start_orchestrator()
+    data = make_config(args.size)
+
+    print(f"{'client':<22}{'throughput':>12}{'latency':>16}{'total':>9}")
+    run("new connection", lambda d: unpooled_save(url, d), args.saves, args.threads, data)
+
+    backend = RemoteStorageBackend(url, app_name="bench", pool_size=max(10, args.threads))
+    run("pooled session", backend.save, args.saves, args.threads, data)
+    backend.compress = False
+    run("pooled, uncompressed", backend.save, args.saves, args.threads, data)
+
+    pools = backend._session.get_adapter(url).poolmanager.pools
+    opened = sum(pools[key].num_connections for key in pools.keys())
+    print(f"\npooled session opened {opened} connection(s) for {2 * args.saves} saves")
+    backend.cleanup()
+
+
+if __name__ == "__main__":
+    main()
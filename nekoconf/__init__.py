@@ -10,7 +10,9 @@ from .core.config import NekoConf
 from .event.pipeline import EventType
 from .storage import (
     FileStorageBackend,
+    SharedMemoryBackend,
     StorageBackend,
+    WriteBehindBackend,
 )
 
 # Import optional features only if dependencies are installed
@@ -39,6 +41,8 @@ __all__ = [
     "EventType",
     "StorageBackend",
     "FileStorageBackend",
+    "WriteBehindBackend",
+    "SharedMemoryBackend",
 ]
 
 # Add optional components if available
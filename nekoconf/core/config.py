@@ -4,13 +4,22 @@ This module provides functionality to read, write, and manage configuration file
 in YAML, JSON, and TOML formats using pluggable storage backends.
 """
 
-import copy
+import functools
 import logging
+import threading
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Dict, List, Optional, TypeVar, Union, overload
 
-from ..event.changes import ChangeTracker, ChangeType, ConfigChange, emit_change_events
-from ..event.pipeline import EventPipeline, EventType, on_change, on_event
+from ..event.changes import (
+    ChangeTracker,
+    ChangeType,
+    ConfigChange,
+    MutationRecord,
+    emit_change_events,
+)
+from ..event.patch import PatchError, apply_patch, patch_mask, patch_paths
+from ..event.pipeline import AsyncEventPipeline, EventPipeline, EventType, on_change, on_event
 
 # Check for optional dependencies
 from ..schema import HAS_SCHEMA_DEPS, NekoSchemaValidator
@@ -21,17 +30,33 @@ from ..storage import (
 )
 from ..utils.env import EnvOverrideHandler
 from ..utils.helper import (
+    CompiledPath,
+    compile_path,
     deep_merge,
     delete_nested_value,
     get_nested_value,
     getLogger,
     set_nested_value,
 )
+from .persistent import MISSING, PersistentMap, delete_in, freeze, merge_in, set_in, thaw
 
 # Type variable for type hints
 T = TypeVar("T")
 
 
+def _synchronized(method):
+    """Run a NekoConf write method under the write lock, if thread safety is enabled."""
+
+    @functools.wraps(method)
+    def wrapper(self: "NekoConf", *args, **kwargs):
+        if self._write_lock is None:
+            return method(self, *args, **kwargs)
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class NekoConf:
     """Configuration manager for reading, writing, and event handling configuration files.
 
@@ -55,6 +80,9 @@ class NekoConf:
         env_strict_parsing: bool = False,
         # Event handling parameters
         event_emission_enabled: bool = False,
+        # Data model parameters
+        persistent: bool = False,
+        thread_safe: bool = False,
     ) -> None:
         """Initialize the configuration manager.
 
@@ -75,6 +103,15 @@ class NekoConf:
             env_preserve_case: If True, preserves the original case of keys from environment variables.
             env_strict_parsing: If True, raises exceptions when parsing fails rather than logging warnings.
             event_emission_enabled: If True, emits events for configuration changes (default: False)
+            persistent: If True, keeps the configuration in an immutable persistent tree
+                        (default: False). Writes then build a new tree sharing all unchanged
+                        nodes, making snapshots O(1) and diffs O(changed nodes). Getters
+                        return plain copies of sections, snapshot() the read-only tree.
+            thread_safe: If True, allows reads and writes from multiple threads (default: False).
+                         Implies persistent. Writers are serialized and publish a new tree
+                         atomically, while readers never block and always see a complete tree.
+                         Writers do not wait for async event handlers, which may write
+                         themselves.
 
         Examples:
             # Memory-only storage (default)
@@ -86,6 +123,12 @@ class NekoConf:
             config = NekoConf(Path("config.yaml"))
             config = NekoConf(storage=FileStorageBackend("config.yaml"))
 
+            # Immutable data model with cheap snapshots
+            config = NekoConf("config.yaml", persistent=True)
+
+            # Shared between threads, e.g. with a remote backend syncing in the background
+            config = NekoConf(storage=RemoteStorageBackend(...), thread_safe=True)
+
             # Remote storage for distributed configurations
             config = NekoConf(storage=RemoteStorageBackend("https://nekoconf-server.com", api_key="key"))
         """
@@ -95,6 +138,11 @@ class NekoConf:
         # Initialize configuration data
         self.data: Dict[str, Any] = {}
 
+        # Readers only ever see complete immutable trees, writers take the lock
+        self.thread_safe = thread_safe
+        self.persistent = persistent or thread_safe
+        self._write_lock: Optional[threading.RLock] = threading.RLock() if thread_safe else None
+
         self.read_only = read_only
 
         if self.read_only:
@@ -106,10 +154,14 @@ class NekoConf:
         if self.storage_backend:
             self.logger.debug(f"Using storage backend: {self.storage_backend}")
             self.storage_backend._sync_handler = self._handle_storage_sync
+            self.storage_backend._patch_handler = self._handle_storage_patch
         else:
             self.logger.debug("Using memory-only storage")
             self._memory_only = True
 
+        # Lazy backends leave out top-level sections until they are first accessed
+        self._lazy = bool(getattr(self.storage_backend, "lazy", False))
+
         # Initialize environment variable override handler
         self.env_handler: Optional[EnvOverrideHandler] = None
         if env_override_enabled:
@@ -125,11 +177,18 @@ class NekoConf:
 
         # Event pipeline initialization
         self.event_disabled = not event_emission_enabled
-        self.event_pipeline: EventPipeline = EventPipeline(logger=self.logger)
+        # Async handlers of sync writers run on a shared loop thread; thread safe
+        # writers hold the write lock while emitting, so they must not wait for them
+        self.event_pipeline: EventPipeline = AsyncEventPipeline(
+            logger=self.logger, wait=not thread_safe
+        )
 
         self._load_validators()
         self._init_config()
 
+        if self.persistent:
+            self.data = freeze(self.data)
+
     def _init_storage_backend(
         self, storage: Optional[Union[StorageBackend, str, Path, dict]]
     ) -> None:
@@ -176,6 +235,9 @@ class NekoConf:
         if self.storage_backend:
             self.storage_backend.cleanup()
 
+        # Deliver coalesced events, let offloaded handlers finish in the background
+        self.event_pipeline.close(wait=False)
+
     def _init_config(self) -> None:
         """
         Initialize the configuration by loading it from the storage backend.
@@ -196,14 +258,63 @@ class NekoConf:
 
         # load environment variable overrides if enabled
         if self.env_handler:
+            self._load_override_sections(self.data)
             self.env_handler.apply_overrides(self.data, in_place=True)
 
     def _handle_storage_sync(self, config_data: Dict[str, Any]) -> None:
         """
         Handle synchronization of configuration data from storage backend.
         """
+        # Environment overrides take precedence over stored data, as in load()
+        if self.env_handler:
+            config_data = self.env_handler.apply_overrides(config_data)
         self.replace(config_data)
 
+    @_synchronized
+    def _handle_storage_patch(self, ops: List[Dict[str, Any]]) -> bool:
+        """Apply patch operations from the storage backend, touching only their paths.
+
+        Args:
+            ops: JSON-Patch-like operations (see ``nekoconf.event.patch``)
+
+        Returns:
+            True if the patch was applied. False if it does not apply to the current
+            configuration, in which case the backend should sync the full data.
+        """
+        try:
+            paths = patch_paths(ops)
+        except PatchError as e:
+            self.logger.warning(f"Rejected configuration patch from storage backend: {e}")
+            return False
+
+        if self._lazy:
+            for keys in paths:
+                if keys[0] not in self.data:
+                    self._load_section(keys[0])
+
+        # Environment overrides take precedence over patched values, as in load()
+        overrides = self.env_handler.apply_overrides({}) if self.env_handler else None
+
+        try:
+            record = None if self.event_disabled else MutationRecord(self.data, patch_mask(paths))
+            if self.persistent:
+                new_data = apply_patch(self.data, ops)
+                if overrides:
+                    new_data = merge_in(new_data, overrides)
+                self._publish(self.data, new_data, record)
+                return True
+
+            apply_patch(self.data, ops)
+        except PatchError as e:
+            self.logger.warning(f"Configuration patch from storage backend does not apply: {e}")
+            return False
+
+        if overrides:
+            deep_merge(source=overrides, destination=self.data, in_place=True)
+        if record is not None:
+            emit_change_events(self, record.detect_changes(self.data))
+        return True
+
     def _load_validators(self) -> None:
         """
         Load schema validators if available.
@@ -224,6 +335,7 @@ class NekoConf:
             except Exception as e:
                 self.logger.error(f"Failed to load schema validator: {e}")
 
+    @_synchronized
     def load(self) -> Dict[str, Any]:
         """Load configuration from storage backend and apply environment variable overrides.
 
@@ -233,6 +345,11 @@ class NekoConf:
         if self._memory_only:
             self.logger.debug("Memory-only mode: no storage backend to load from")
             return self.data
+
+        # Changes are detected against the complete previous configuration
+        if not self.event_disabled:
+            self._materialize()
+
         try:
             loaded_data = self.storage_backend.load()
             self.logger.debug("Loaded configuration from storage backend")
@@ -240,14 +357,17 @@ class NekoConf:
             self.logger.error(f"Error loading configuration: {e}")
             loaded_data = {}
 
-        # Apply environment variable overrides to the loaded data
-        old_data = copy.deepcopy(self.data)
+        # The loaded data is a fresh tree, so the current one is kept as-is for diffing
+        old_data = self.data
 
         # Use the env_handler to apply overrides
         if self.env_handler:
-            self.data = self.env_handler.apply_overrides(loaded_data, in_place=False)
-        else:
-            self.data = loaded_data
+            self._load_override_sections(loaded_data)
+            loaded_data = self.env_handler.apply_overrides(loaded_data, in_place=False)
+
+        self.data = freeze(loaded_data) if self.persistent else loaded_data
+        if not self.event_disabled:
+            self._materialize()
 
         # Emit reload event with old and new values
         self.event_pipeline.emit(
@@ -258,8 +378,8 @@ class NekoConf:
             ignore=self.event_disabled,
         )
 
-        # If the loaded data is empty or unchanged, do not emit further events
-        if not old_data or old_data == self.data or self.event_disabled:
+        # If there was no previous data, do not emit further events
+        if not old_data or self.event_disabled:
             return self.data
 
         changes = ChangeTracker.detect_changes(old_data, self.data)
@@ -291,7 +411,9 @@ class NekoConf:
             return False
 
         try:
-            success = self.storage_backend.save(self.data)
+            # Sections a lazy backend has not loaded yet are kept by the backend
+            data = thaw(self.data) if self.persistent else self.data
+            success = self.storage_backend.save(data)
             if success:
                 self.logger.debug("Saved configuration to storage backend")
             else:
@@ -305,9 +427,36 @@ class NekoConf:
         """Get all *effective* configuration data (including overrides).
 
         Returns:
-            The entire effective configuration data as a dictionary
+            The entire effective configuration data as a dictionary. In persistent mode
+            this is a plain copy of the tree, use ``snapshot()`` for the tree itself.
         """
-        return self.data
+        return self.to_dict()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the *effective* configuration data as plain dictionaries and lists.
+
+        Returns:
+            The configuration data, converted from the persistent tree if needed
+        """
+        self._materialize()
+        return thaw(self.data) if self.persistent else self.data
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a snapshot of the *effective* configuration that later changes won't affect.
+
+        In persistent mode the current tree is immutable and returned as-is (O(1));
+        otherwise the data is deep-copied.
+
+        Returns:
+            The configuration snapshot
+        """
+        self._materialize()
+        if self.persistent:
+            return self.data
+
+        import copy
+
+        return copy.deepcopy(self.data)
 
     def json(self) -> str:
         """Get the *effective* configuration data as a JSON string.
@@ -317,9 +466,9 @@ class NekoConf:
         """
         import json
 
-        return json.dumps(self.data, indent=2, ensure_ascii=False)
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
 
-    def get(self, key: Optional[str] = None, default: Any = None) -> Any:
+    def get(self, key: Optional[Union[str, CompiledPath]] = None, default: Any = None) -> Any:
         """Get an *effective* configuration value (including overrides).
 
         Args:
@@ -327,13 +476,21 @@ class NekoConf:
             default: Default value to return if key is not found
 
         Returns:
-            The configuration value or default if not found
+            The configuration value or default if not found. In persistent mode
+            sections and lists are returned as plain dicts and lists.
         """
         if key is None:
-            return self.data
+            return self.get_all()
+
+        if self._lazy:
+            self._ensure_section(key)
 
         # Use the utility which handles nested keys
-        return get_nested_value(self.data, key, default)
+        if not self.persistent:
+            return get_nested_value(self.data, key, default)
+
+        value = get_nested_value(self.data, key, MISSING)
+        return default if value is MISSING else thaw(value)
 
     # Type-safe convenience methods for accessing configuration values
     @overload
@@ -488,7 +645,8 @@ class NekoConf:
         self.logger.warning(f"Value for '{key}' is not a dictionary, using default")
         return default
 
-    def set(self, key: str, value: Any) -> None:
+    @_synchronized
+    def set(self, key: Union[str, CompiledPath], value: Any) -> None:
         """Set a configuration value in the *effective* configuration.
 
         This change will be persisted on the next `save()`.
@@ -502,8 +660,18 @@ class NekoConf:
             self.logger.warning("Configuration is read-only, not setting value")
             return
 
-        # Make a copy of current state
-        old_data = copy.deepcopy(self.data)
+        if self._lazy:
+            self._ensure_section(key)
+
+        if self.persistent:
+            old_data = self.data
+            new_data, is_updated = set_in(old_data, key, value)
+            if is_updated:
+                self._publish(old_data, new_data)
+            return
+
+        # Record the state of the touched path only (skipped if events are disabled)
+        record = None if self.event_disabled else MutationRecord.for_path(self.data, key)
 
         # Apply the change
         is_updated = set_nested_value(self.data, key, value)
@@ -513,14 +681,15 @@ class NekoConf:
             return
 
         # if event emission is disabled, skip emitting events
-        if self.event_disabled:
-            return True
+        if record is None:
+            return
 
-        # Detect changes between configurations
-        changes = ChangeTracker.detect_changes(old_data, self.data)
+        # Detect changes within the touched path
+        changes = record.detect_changes(self.data)
         emit_change_events(self, changes)
 
-    def delete(self, key: str) -> bool:
+    @_synchronized
+    def delete(self, key: Union[str, CompiledPath]) -> bool:
         """Delete a configuration value from the *effective* configuration.
 
         This change will be persisted on the next `save()`.
@@ -535,11 +704,20 @@ class NekoConf:
             self.logger.warning("Configuration is read-only, not deleting value")
             return False
 
-        # Make a copy of current state for change detection
-        old_data = copy.deepcopy(self.data)
+        if self._lazy:
+            self._ensure_section(key)
+
+        if self.persistent:
+            old_data = self.data
+            self.data, success, old_value = delete_in(old_data, key)
+        else:
+            # Record the state of the touched path for change detection
+            record = None if self.event_disabled else MutationRecord.for_path(self.data, key)
 
-        # Use the utility function to delete the nested value
-        success, old_value = delete_nested_value(self.data, key)
+            # Use the utility function to delete the nested value
+            success, old_value = delete_nested_value(self.data, key)
+            if success and record is not None:
+                old_data = record.old_data
 
         if not success:
             return False  # Key didn't exist
@@ -547,13 +725,14 @@ class NekoConf:
         # Emit events if enabled
         if not self.event_disabled:
             changes = [
-                ConfigChange(ChangeType.DELETE, key, old_value=old_value, new_value=None),
+                ConfigChange(ChangeType.DELETE, str(key), old_value=old_value, new_value=None),
                 ConfigChange(ChangeType.CHANGE, old_value=old_data, new_value=self.data),
             ]
             emit_change_events(self, changes)
 
         return True
 
+    @_synchronized
     def replace(self, data: Dict[str, Any]) -> bool:
         """Replace the entire *effective* configuration with new data.
 
@@ -565,24 +744,35 @@ class NekoConf:
             True if the configuration was replaced, False if no changes were made
 
         """
-        if not data or data == self.data:
+        if not data:
             return False
 
-        old_data = copy.deepcopy(self.data)
+        # Load all stored sections first, so the comparison sees the whole tree.
+        # Replacing drops them, whether they were loaded or not.
+        self._materialize()
+
+        # Lists are tuples in the persistent tree, so compare the frozen form
+        new_data = freeze(data) if self.persistent else data
+        if new_data == self.data:
+            return False
+
+        # The current tree is swapped out rather than mutated, so no copy is needed
+        old_data = self.data
 
         # Apply the new data
-        self.data = data
+        self.data = new_data
 
         # if event emission is disabled, skip emitting events
         if self.event_disabled:
             return True
 
         # Detect changes between configurations
-        changes = ChangeTracker.detect_changes(old_data, data)
+        changes = ChangeTracker.detect_changes(old_data, self.data)
         emit_change_events(self, changes)
 
         return True
 
+    @_synchronized
     def update(self, data: Dict[str, Any]) -> bool:
         """Update multiple configuration values in the *effective* configuration (no deletion).
 
@@ -598,28 +788,131 @@ class NekoConf:
         if not data or data == self.data:
             return False
 
-        # Make deep copies to prevent mutations
-        old_data = copy.deepcopy(self.data)
+        if self._lazy:
+            for key in data:
+                if key not in self.data:
+                    self._load_section(key)
+
+        # Record the state of the keys the merge will touch
+        record = None if self.event_disabled else MutationRecord.for_merge(self.data, data)
+
+        if self.persistent:
+            self._publish(self.data, merge_in(self.data, data), record)
+            return True
 
         # Create an updated version by deep merging
         deep_merge(source=data, destination=self.data, in_place=True)
 
         # if event emission is disabled, skip emitting events
-        if self.event_disabled:
+        if record is None:
             return True
 
-        # Detect changes between configurations
-        changes = ChangeTracker.detect_changes(old_data, self.data)
+        # Detect changes within the merged keys
+        changes = record.detect_changes(self.data)
         emit_change_events(self, changes)
 
         return True
 
-    def on_change(self, path_pattern: str, priority: int = 100):
+    def _load_section(self, key: str) -> None:
+        """Add a top-level section that the lazy storage backend has not loaded yet."""
+        try:
+            value = self.storage_backend.load_section(key)
+        except KeyError:
+            return  # Not stored, or already loaded
+        except StorageError as e:
+            self.logger.error(f"Failed to load configuration section: {e}")
+            return
+
+        if self.persistent:
+            self.data = self.data.set(key, freeze(value))
+        else:
+            self.data[key] = value
+
+    def _ensure_section(self, key: Union[str, CompiledPath]) -> None:
+        """Load the top-level section of a path on first access."""
+        keys = compile_path(key).keys
+        if keys and keys[0] not in self.data:
+            with self._write_lock or nullcontext():
+                if keys[0] not in self.data:
+                    self._load_section(keys[0])
+
+    def _materialize(self) -> None:
+        """Load all top-level sections that the lazy storage backend has not loaded yet."""
+        if not self._lazy:
+            return
+        with self._write_lock or nullcontext():
+            for key in self.storage_backend.pending_sections():
+                self._load_section(key)
+
+    def _load_override_sections(self, data: Dict[str, Any]) -> None:
+        """Load the sections environment overrides apply to, so they override stored values."""
+        if not self._lazy:
+            return
+        for key in self.env_handler.apply_overrides({}):
+            if key not in data:
+                try:
+                    data[key] = self.storage_backend.load_section(key)
+                except (KeyError, StorageError):
+                    pass
+
+    def _publish(
+        self,
+        old_data: PersistentMap,
+        new_data: PersistentMap,
+        record: Optional[MutationRecord] = None,
+    ) -> bool:
+        """Swap in a new persistent tree and emit the changes from the previous one.
+
+        Args:
+            old_data: The tree the change was made against
+            new_data: The new tree
+            record: Limits the changes to the keys it touches, in the same order as
+                    in dict mode. All changes between the trees if None.
+
+        Returns:
+            True if the tree changed, False otherwise
+        """
+        if new_data is old_data:
+            return False
+
+        self.data = new_data
+
+        if self.event_disabled:
+            return True
+
+        # Shared subtrees are skipped, so this only walks the changed nodes
+        if record is not None:
+            changes = record.detect_changes(new_data)
+        else:
+            changes = ChangeTracker.detect_changes(old_data, new_data)
+        emit_change_events(self, changes)
+        return True
+
+    def on_change(
+        self,
+        path_pattern: str,
+        priority: int = 100,
+        batch: bool = False,
+        execution: str = "inline",
+        max_pending: Optional[int] = None,
+        coalesce: Union[bool, float, None] = None,
+    ):
         """Register a handler for changes to a specific configuration path.
 
         Args:
             path_pattern: Path pattern to filter events (e.g., "database.connection")
             priority: Handler priority (lower number = higher priority)
+            batch: If True, the handler is called once per commit with a ``changes``
+                   list of all matching ConfigChange objects
+            execution: Where the handler runs (default: "inline"). "inline" runs it
+                       before the write returns, "pool" on a shared thread pool in
+                       order per path, and "serial" on a thread of its own in order.
+                       Use ``flush()`` to wait for "pool" and "serial" handlers.
+            max_pending: Maximum number of queued and running calls of a "pool" or
+                         "serial" handler before writers wait, None for no limit
+            coalesce: Seconds to collect the events of a path before delivering them
+                      as one event from the first old to the last new value, True to
+                      collect them until ``flush()``, None to deliver every event
 
         Returns:
             Decorator function
@@ -629,17 +922,51 @@ class NekoConf:
             def handle_db_connection_change(event_type, path, old_value, new_value, config_data, **kwargs):
                 # Reconnect to database with new settings
                 pass
+
+            @config.on_change("database.*", batch=True)
+            def handle_db_changes(changes, config_data, **kwargs):
+                # Reconnect once, however many database keys changed
+                pass
+
+            @config.on_change("database.*", batch=True, execution="serial")
+            def reconnect(changes, config_data, **kwargs):
+                # Reconnect without blocking the writer
+                pass
+
+            @config.on_change("features.*", coalesce=0.5)
+            def handle_feature_change(path, old_value, new_value, **kwargs):
+                # Called once per feature for a burst of remote updates
+                pass
         """
 
-        return on_change(self.event_pipeline, path_pattern, priority)
+        return on_change(
+            self.event_pipeline, path_pattern, priority, batch, execution, max_pending, coalesce
+        )
 
-    def on_event(self, event_type, path_pattern=None, priority=100):
+    def on_event(
+        self,
+        event_type,
+        path_pattern=None,
+        priority=100,
+        batch=False,
+        execution="inline",
+        max_pending=None,
+        coalesce=None,
+    ):
         """Register a handler for specific event types.
 
         Args:
             event_type: Type of event to handle (or list of types)
             path_pattern: Optional path pattern to filter events
             priority: Handler priority (lower number = higher priority)
+            batch: If True, the handler is called once per commit with a ``changes``
+                   list of all matching ConfigChange objects
+            execution: Where the handler runs: "inline", "pool" or "serial"
+                       (default: "inline"), see ``on_change``
+            max_pending: Maximum number of queued and running calls of a "pool" or
+                         "serial" handler before writers wait, None for no limit
+            coalesce: Seconds to collect events before delivering them as one, True
+                      to collect them until ``flush()``, see ``on_change``
 
         Returns:
             Decorator function
@@ -650,7 +977,31 @@ class NekoConf:
                 # Clear cache entries when deleted
                 pass
         """
-        return on_event(self.event_pipeline, event_type, path_pattern, priority)
+        return on_event(
+            self.event_pipeline,
+            event_type,
+            path_pattern,
+            priority,
+            batch,
+            execution,
+            max_pending,
+            coalesce,
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Deliver the events collected for coalescing handlers, and wait for event
+        handlers running in the background to complete.
+
+        Covers handlers registered with the "pool" or "serial" execution policy, and
+        async handlers of sync writers.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if no handlers are still running
+        """
+        return self.event_pipeline.flush(timeout)
 
     def validate_schema(self, data: Optional[Dict[str, Any]] = None) -> List[str]:
         """Validate the configuration against the schema.
@@ -672,7 +1023,7 @@ class NekoConf:
         Returns:
             List of validation error messages (empty if valid)
         """
-        errors = self.validate_schema(self.data)
+        errors = self.validate_schema(self.to_dict())
 
         self.event_pipeline.emit(
             EventType.VALIDATE,
@@ -710,16 +1061,31 @@ class NekoConf:
                 self.transaction = None
 
             def __enter__(self):
-                self.transaction = TransactionManager(self.config)
+                # In thread-safe mode the transaction holds the write lock until it exits,
+                # so reads made through it cannot be invalidated by other writers
+                if self.config._write_lock is not None:
+                    self.config._write_lock.acquire()
+                try:
+                    self.config._materialize()
+                    self.transaction = TransactionManager(self.config)
+                except BaseException:
+                    # __exit__ does not run when __enter__ raises
+                    if self.config._write_lock is not None:
+                        self.config._write_lock.release()
+                    raise
                 return self.transaction
 
             def __exit__(self, exc_type, exc_val, exc_tb):
-                if exc_type is None:  # No exception occurred
-                    # Apply all changes at once
-                    self.transaction.commit()
-                    # Save if storage backend supports writes
-                    if self.config.storage_backend and not read_only:
-                        self.config.save()
+                try:
+                    if exc_type is None:  # No exception occurred
+                        # Apply all changes at once
+                        self.transaction.commit()
+                        # Save if storage backend supports writes
+                        if self.config.storage_backend and not read_only:
+                            self.config.save()
+                finally:
+                    if self.config._write_lock is not None:
+                        self.config._write_lock.release()
                 return False  # Don't suppress exceptions
 
         return TransactionContext(self)
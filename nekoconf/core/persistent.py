@@ -0,0 +1,592 @@
+"""Persistent (immutable) configuration tree for NekoConf.
+
+This module provides a hash array mapped trie (HAMT) based immutable mapping and
+path-copying helpers to read and write nested configuration values. Every write
+returns a new tree that shares all unchanged nodes with the previous one, so
+snapshots are O(1) and diffs only need to visit the changed nodes.
+"""
+
+import itertools
+from collections.abc import ItemsView, Mapping, ValuesView
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple, Union
+
+from ..utils.helper import CompiledPath, compile_path, get_nested_value
+
+__all__ = [
+    "MISSING",
+    "PersistentMap",
+    "freeze",
+    "thaw",
+    "set_in",
+    "delete_in",
+    "merge_in",
+]
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+# Insertion sequence numbers, used to iterate keys in insertion order like dict
+_sequence = itertools.count()
+
+
+class _Missing:
+    """Marker for a key absent from one side of a diff."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+
+
+class _Leaf:
+    """A single key/value entry of the trie."""
+
+    __slots__ = ("hash", "key", "value", "seq")
+
+    def __init__(self, hash_: int, key: Any, value: Any, seq: int):
+        self.hash = hash_
+        self.key = key
+        self.value = value
+        self.seq = seq
+
+
+class _CollisionNode:
+    """Entries whose keys have the same full hash."""
+
+    __slots__ = ("hash", "leaves")
+
+    def __init__(self, hash_: int, leaves: Tuple[_Leaf, ...]):
+        self.hash = hash_
+        self.leaves = leaves
+
+    def find(self, shift: int, hash_: int, key: Any) -> Optional[_Leaf]:
+        for leaf in self.leaves:
+            if leaf.key == key:
+                return leaf
+        return None
+
+    def assoc(self, shift: int, leaf: _Leaf) -> Tuple[Any, bool]:
+        if leaf.hash != self.hash:
+            # Push the collision node one level down next to the new leaf
+            node = _BitmapNode(1 << ((self.hash >> shift) & _MASK), (self,))
+            return node.assoc(shift, leaf)
+
+        for i, existing in enumerate(self.leaves):
+            if existing.key == leaf.key:
+                leaves = self.leaves[:i] + (leaf,) + self.leaves[i + 1 :]
+                return _CollisionNode(self.hash, leaves), False
+        return _CollisionNode(self.hash, self.leaves + (leaf,)), True
+
+    def without(self, shift: int, hash_: int, key: Any) -> Any:
+        for i, existing in enumerate(self.leaves):
+            if existing.key == key:
+                leaves = self.leaves[:i] + self.leaves[i + 1 :]
+                if len(leaves) == 1:
+                    return leaves[0]
+                return _CollisionNode(self.hash, leaves)
+        return self
+
+    def iter_leaves(self) -> Iterator[_Leaf]:
+        return iter(self.leaves)
+
+
+class _BitmapNode:
+    """A trie node holding up to 32 leaves or child nodes, indexed by a bitmap."""
+
+    __slots__ = ("bitmap", "array")
+
+    def __init__(self, bitmap: int, array: Tuple[Any, ...]):
+        self.bitmap = bitmap
+        self.array = array
+
+    def _index(self, bit: int) -> int:
+        return (self.bitmap & (bit - 1)).bit_count()
+
+    def find(self, shift: int, hash_: int, key: Any) -> Optional[_Leaf]:
+        node: Any = self
+        while type(node) is _BitmapNode:
+            bit = 1 << ((hash_ >> shift) & _MASK)
+            bitmap = node.bitmap
+            if not bitmap & bit:
+                return None
+            node = node.array[(bitmap & (bit - 1)).bit_count()]
+            shift += _BITS
+
+        if type(node) is _Leaf:
+            return node if node.key == key else None
+        return node.find(shift, hash_, key)
+
+    def assoc(self, shift: int, leaf: _Leaf) -> Tuple["_BitmapNode", bool]:
+        bit = 1 << ((leaf.hash >> shift) & _MASK)
+        index = self._index(bit)
+
+        if not self.bitmap & bit:
+            array = self.array[:index] + (leaf,) + self.array[index:]
+            return _BitmapNode(self.bitmap | bit, array), True
+
+        entry = self.array[index]
+        if isinstance(entry, _Leaf):
+            if entry.key == leaf.key:
+                replacement, added = leaf, False
+            else:
+                replacement, added = _merge_leaves(shift + _BITS, entry, leaf), True
+        else:
+            replacement, added = entry.assoc(shift + _BITS, leaf)
+
+        array = self.array[:index] + (replacement,) + self.array[index + 1 :]
+        return _BitmapNode(self.bitmap, array), added
+
+    def without(self, shift: int, hash_: int, key: Any) -> Any:
+        bit = 1 << ((hash_ >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return self
+
+        index = self._index(bit)
+        entry = self.array[index]
+        if isinstance(entry, _Leaf):
+            if entry.key != key:
+                return self
+            replacement = None
+        else:
+            replacement = entry.without(shift + _BITS, hash_, key)
+            if replacement is entry:
+                return self
+
+        if replacement is None:
+            array = self.array[:index] + self.array[index + 1 :]
+            if not array:
+                return None
+            # Collapse a node left with a single leaf into its parent
+            if len(array) == 1 and isinstance(array[0], _Leaf) and shift > 0:
+                return array[0]
+            return _BitmapNode(self.bitmap & ~bit, array)
+
+        if len(self.array) == 1 and isinstance(replacement, _Leaf) and shift > 0:
+            return replacement
+        array = self.array[:index] + (replacement,) + self.array[index + 1 :]
+        return _BitmapNode(self.bitmap, array)
+
+    def iter_leaves(self) -> Iterator[_Leaf]:
+        for entry in self.array:
+            if isinstance(entry, _Leaf):
+                yield entry
+            else:
+                yield from entry.iter_leaves()
+
+
+def _merge_leaves(shift: int, first: _Leaf, second: _Leaf) -> Any:
+    """Create the smallest subtree holding two leaves with different keys."""
+    if first.hash == second.hash or shift >= _HASH_BITS:
+        return _CollisionNode(first.hash, (first, second))
+
+    first_bit = 1 << ((first.hash >> shift) & _MASK)
+    second_bit = 1 << ((second.hash >> shift) & _MASK)
+    if first_bit == second_bit:
+        return _BitmapNode(first_bit, (_merge_leaves(shift + _BITS, first, second),))
+    if first_bit < second_bit:
+        return _BitmapNode(first_bit | second_bit, (first, second))
+    return _BitmapNode(first_bit | second_bit, (second, first))
+
+
+def _diff_nodes(old: Any, new: Any) -> Generator[Tuple[Any, Any], None, None]:
+    """Yield (old_leaf, new_leaf) pairs for entries that differ between two subtrees.
+
+    Subtrees shared by both sides are skipped without being visited.
+    """
+    if old is new:
+        return
+
+    if isinstance(old, _BitmapNode) and isinstance(new, _BitmapNode):
+        old_array, new_array = old.array, new.array
+        old_index = new_index = 0
+        bits = old.bitmap | new.bitmap
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            old_entry = new_entry = None
+            if old.bitmap & bit:
+                old_entry = old_array[old_index]
+                old_index += 1
+            if new.bitmap & bit:
+                new_entry = new_array[new_index]
+                new_index += 1
+            if old_entry is not new_entry:
+                yield from _diff_nodes(old_entry, new_entry)
+        return
+
+    # Mixed node kinds, leaves or a missing side: compare the entries directly
+    old_leaves = {leaf.key: leaf for leaf in _iter_entry(old)}
+    new_leaves = {leaf.key: leaf for leaf in _iter_entry(new)}
+
+    for key, leaf in old_leaves.items():
+        other = new_leaves.get(key)
+        if other is None or other.value is not leaf.value:
+            yield leaf, other
+
+    for key, leaf in new_leaves.items():
+        if key not in old_leaves:
+            yield None, leaf
+
+
+def _iter_entry(entry: Any) -> Iterator[_Leaf]:
+    if entry is None:
+        return iter(())
+    if isinstance(entry, _Leaf):
+        return iter((entry,))
+    return entry.iter_leaves()
+
+
+class PersistentMap(Mapping):
+    """
+    Immutable mapping based on a hash array mapped trie.
+
+    ``set`` and ``delete`` return a new map that shares all untouched trie nodes
+    with the original, so writes cost O(log32 n) and the original stays valid as
+    a snapshot. Keys iterate in insertion order, like a dict.
+    """
+
+    __slots__ = ("_root", "_size", "_ordered")
+
+    def __init__(self, data: Optional[Union[Mapping, Dict[Any, Any]]] = None):
+        """Create a map with the (unfrozen) items of ``data``.
+
+        Args:
+            data: Optional mapping to copy items from
+        """
+        self._root: Optional[_BitmapNode] = None
+        self._size = 0
+        self._ordered: Optional[List[_Leaf]] = None
+
+        if data:
+            root: Any = _BitmapNode(0, ())
+            for key, value in data.items():
+                root, added = root.assoc(0, _Leaf(_hash(key), key, value, next(_sequence)))
+                self._size += added
+            self._root = root
+
+    @classmethod
+    def _from_root(cls, root: Optional[_BitmapNode], size: int) -> "PersistentMap":
+        instance = cls.__new__(cls)
+        instance._root = root
+        instance._size = size
+        instance._ordered = None
+        return instance
+
+    def _find(self, key: Any) -> Optional[_Leaf]:
+        if self._root is None:
+            return None
+        return self._root.find(0, _hash(key), key)
+
+    def __getitem__(self, key: Any) -> Any:
+        # Inlined _find, this is the hot path of every nested lookup
+        if self._root is not None:
+            leaf = self._root.find(0, hash(key) & _HASH_MASK, key)
+            if leaf is not None:
+                return leaf.value
+        raise KeyError(key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        leaf = self._find(key)
+        return default if leaf is None else leaf.value
+
+    def __contains__(self, key: Any) -> bool:
+        return self._find(key) is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _leaves(self) -> List[_Leaf]:
+        """Leaves in insertion order (cached, as the map never changes)."""
+        if self._ordered is None:
+            leaves = list(self._root.iter_leaves()) if self._root is not None else []
+            leaves.sort(key=lambda leaf: leaf.seq)
+            self._ordered = leaves
+        return self._ordered
+
+    def __iter__(self) -> Iterator[Any]:
+        return (leaf.key for leaf in self._leaves())
+
+    def items(self) -> ItemsView:
+        return _ItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _ValuesView(self)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        if isinstance(other, PersistentMap) and other._root is self._root:
+            return True
+        if len(other) != self._size:
+            return False
+
+        sentinel = object()
+        for key, value in self.items():
+            other_value = other.get(key, sentinel)
+            if other_value is not value and other_value != value:
+                return False
+        return True
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"PersistentMap({dict(self.items())!r})"
+
+    def set(self, key: Any, value: Any) -> "PersistentMap":
+        """Return a new map with ``key`` set to ``value``.
+
+        Args:
+            key: The key to set
+            value: The (already frozen) value
+
+        Returns:
+            The new map, or this map if the value is already set
+        """
+        hash_ = _hash(key)
+        root: Any = self._root if self._root is not None else _BitmapNode(0, ())
+
+        existing = root.find(0, hash_, key)
+        if existing is not None and existing.value is value:
+            return self
+
+        seq = existing.seq if existing is not None else next(_sequence)
+        root, added = root.assoc(0, _Leaf(hash_, key, value, seq))
+        return PersistentMap._from_root(root, self._size + added)
+
+    def delete(self, key: Any) -> "PersistentMap":
+        """Return a new map without ``key``.
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            The new map, or this map if the key is not present
+        """
+        if self._root is None:
+            return self
+
+        root = self._root.without(0, _hash(key), key)
+        if root is self._root:
+            return self
+        return PersistentMap._from_root(root, self._size - 1)
+
+    def diff(self, other: "PersistentMap") -> Generator[Tuple[Any, Any, Any], None, None]:
+        """Yield the entries that differ from another map.
+
+        Trie nodes shared by both maps are skipped, so the cost depends on the
+        number of changed entries rather than the size of the maps.
+
+        Args:
+            other: The map to compare with
+
+        Yields:
+            Tuples of (key, value in this map, value in other), in insertion order.
+            A side where the key does not exist is MISSING. Values are compared by
+            identity only.
+        """
+        pairs = list(_diff_nodes(self._root, other._root))
+        pairs.sort(key=lambda pair: (pair[0] or pair[1]).seq)
+
+        for old_leaf, new_leaf in pairs:
+            if old_leaf is None:
+                yield new_leaf.key, MISSING, new_leaf.value
+            elif new_leaf is None:
+                yield old_leaf.key, old_leaf.value, MISSING
+            else:
+                yield old_leaf.key, old_leaf.value, new_leaf.value
+
+    def to_dict(self) -> Dict[Any, Any]:
+        """Convert the map and all nested persistent values to plain dicts and lists."""
+        return thaw(self)
+
+
+class _ItemsView(ItemsView):
+    """Items view iterating the trie leaves directly."""
+
+    def __iter__(self):
+        for leaf in self._mapping._leaves():
+            yield leaf.key, leaf.value
+
+
+class _ValuesView(ValuesView):
+    """Values view iterating the trie leaves directly."""
+
+    def __iter__(self):
+        for leaf in self._mapping._leaves():
+            yield leaf.value
+
+
+def _hash(key: Any) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def freeze(value: Any) -> Any:
+    """Convert plain dicts and lists into persistent maps and tuples, recursively.
+
+    Args:
+        value: The value to convert
+
+    Returns:
+        The immutable equivalent of the value
+    """
+    if isinstance(value, PersistentMap):
+        return value
+    if isinstance(value, Mapping):
+        return PersistentMap({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Convert persistent maps and tuples back into plain dicts and lists, recursively.
+
+    Args:
+        value: The value to convert
+
+    Returns:
+        A mutable copy of the value
+    """
+    if isinstance(value, PersistentMap):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def set_in(root: PersistentMap, path: Union[str, CompiledPath], value: Any) -> Tuple[Any, bool]:
+    """Set a nested value by path copying, mirroring ``set_nested_value``.
+
+    Args:
+        root: The persistent configuration tree
+        path: The path to set (enhanced dot notation)
+        value: The value to set
+
+    Returns:
+        Tuple of (new root, whether the tree changed)
+    """
+    compiled = compile_path(path)
+    if not compiled:
+        return root, False
+
+    frozen = freeze(value)
+
+    # Check if current value is the same to avoid unnecessary changes
+    if get_nested_value(root, compiled, MISSING) == frozen:
+        return root, False
+
+    try:
+        return _assoc_in(root, compiled, 0, frozen), True
+    except (KeyError, IndexError, TypeError):
+        return root, False
+
+
+def _assoc_in(node: Any, compiled: CompiledPath, depth: int, value: Any) -> Any:
+    segment = compiled.segments[depth]
+    is_last = depth == len(compiled.segments) - 1
+
+    if isinstance(segment, int) and isinstance(node, tuple):
+        # This is an array index; extend the list if necessary
+        filler = None if is_last else PersistentMap()
+        items = list(node) + [filler] * (segment + 1 - len(node))
+        items[segment] = value if is_last else _assoc_in(items[segment], compiled, depth + 1, value)
+        return tuple(items)
+
+    if is_last and isinstance(node, PersistentMap):
+        # Setting dict key (even if key looks like number)
+        return node.set(compiled.keys[depth], value)
+
+    if isinstance(segment, int) or not isinstance(node, PersistentMap):
+        raise TypeError(f"Cannot set '{compiled.path}': no container at '{segment}'")
+
+    child = node.get(segment, MISSING)
+    if child is MISSING:
+        child = PersistentMap()
+    return node.set(segment, _assoc_in(child, compiled, depth + 1, value))
+
+
+def delete_in(root: PersistentMap, path: Union[str, CompiledPath]) -> Tuple[Any, bool, Any]:
+    """Delete a nested value by path copying, mirroring ``delete_nested_value``.
+
+    Args:
+        root: The persistent configuration tree
+        path: The path to delete (enhanced dot notation)
+
+    Returns:
+        Tuple of (new root, success, old value)
+    """
+    compiled = compile_path(path)
+    if not compiled:
+        return root, False, None
+
+    old_value = get_nested_value(root, compiled, MISSING)
+    if old_value is MISSING:
+        return root, False, None
+
+    try:
+        return _dissoc_in(root, compiled, 0), True, old_value
+    except (KeyError, IndexError, TypeError):
+        return root, False, None
+
+
+def _dissoc_in(node: Any, compiled: CompiledPath, depth: int) -> Any:
+    segment = compiled.segments[depth]
+
+    if depth == len(compiled.segments) - 1:
+        if isinstance(segment, int):
+            if not isinstance(node, tuple):
+                raise TypeError(f"Cannot delete index {segment} of a non-list")
+            return node[:segment] + node[segment + 1 :]
+        return node.delete(segment)
+
+    child = _dissoc_in(node[segment], compiled, depth + 1)
+    if isinstance(node, tuple):
+        return node[:segment] + (child,) + node[segment + 1 :]
+    return node.set(segment, child)
+
+
+def merge_in(root: PersistentMap, source: Mapping) -> PersistentMap:
+    """Deep merge a plain mapping into a persistent tree, mirroring ``deep_merge``.
+
+    Args:
+        root: The persistent configuration tree
+        source: The values to merge in
+
+    Returns:
+        The new root
+    """
+    result = root
+    for key, value in source.items():
+        current = result.get(key, MISSING)
+        if isinstance(current, PersistentMap) and isinstance(value, Mapping):
+            result = result.set(key, merge_in(current, value))
+            continue
+
+        frozen = freeze(value)
+        # Keep the existing node for identical values so the subtree stays shared
+        if current is MISSING or not _identical(current, frozen):
+            result = result.set(key, frozen)
+    return result
+
+
+def _identical(a: Any, b: Any) -> bool:
+    """Check whether two frozen values are equal and of the same types throughout.
+
+    Unlike ``==`` this tells apart values such as 0, 0.0 and False.
+    """
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if type(a) is tuple:
+        return len(a) == len(b) and all(map(_identical, a, b))
+    if type(a) is PersistentMap:
+        return len(a) == len(b) and all(
+            _identical(value, b.get(key, MISSING)) for key, value in a.items()
+        )
+    return a == b
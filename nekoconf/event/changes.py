@@ -4,10 +4,12 @@ This module provides utilities for detecting and tracking changes between config
 generating appropriate events for path-based modifications.
 """
 
+import logging
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, Generator, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Generator, Iterable, List, Optional, Tuple, Union
 
-from ..utils.helper import getLogger
+from ..core.persistent import MISSING, PersistentMap
+from ..utils.helper import CompiledPath, compile_path, getLogger
 from .pipeline import EventType
 
 if TYPE_CHECKING:
@@ -88,23 +90,90 @@ class ChangeTracker:
         Returns:
             List of ConfigChange objects describing the changes
         """
-        changes = []
-
         if not old_config and not new_config:
-            return changes
+            return []
 
-        if old_config == new_config:
+        changes = list(ChangeTracker.iter_changes(old_config, new_config))
+        if not changes:
             return changes
 
         # record the global change
-        changes.append(ConfigChange(ChangeType.CHANGE, "*", old_config, new_config))
-
-        # Process all paths in both configs
-        for path, change in ChangeTracker._walk_changes(old_config, new_config):
-            changes.append(change)
+        changes.insert(0, ConfigChange(ChangeType.CHANGE, "*", old_config, new_config))
 
         return changes
 
+    @staticmethod
+    def iter_changes(
+        old_config: Dict[str, Any],
+        new_config: Dict[str, Any],
+        prefixes: Optional[Iterable[Union[str, CompiledPath]]] = None,
+    ) -> Generator[ConfigChange, None, None]:
+        """Lazily yield the path changes between two configuration states.
+
+        Subtrees shared by both states (``old is new``) are skipped without being
+        walked, so diffs between structurally shared trees only visit the changed
+        branches. The global CHANGE entry is not included.
+
+        Args:
+            old_config: Previous configuration state
+            new_config: New configuration state
+            prefixes: Optional paths to limit the diff to. Only changes at, below or
+                      above (e.g. a deleted parent) one of these paths are yielded.
+
+        Yields:
+            ConfigChange objects, in walk order
+        """
+        if old_config is new_config:
+            return
+
+        if prefixes is None:
+            walk = ChangeTracker._walk_changes(old_config or {}, new_config or {})
+        else:
+            touched = ChangeTracker._prefix_mask(prefixes)
+            walk = ChangeTracker._walk_touched(old_config or {}, new_config or {}, touched)
+
+        for _, change in walk:
+            yield change
+
+    @staticmethod
+    def has_changes(
+        old_config: Dict[str, Any],
+        new_config: Dict[str, Any],
+        prefixes: Optional[Iterable[Union[str, CompiledPath]]] = None,
+    ) -> bool:
+        """Check whether two configuration states differ, stopping at the first change.
+
+        Args:
+            old_config: Previous configuration state
+            new_config: New configuration state
+            prefixes: Optional paths to limit the check to
+
+        Returns:
+            True if at least one change was found
+        """
+        for _ in ChangeTracker.iter_changes(old_config, new_config, prefixes):
+            return True
+        return False
+
+    @staticmethod
+    def _prefix_mask(prefixes: Iterable[Union[str, CompiledPath]]) -> Dict[str, Any]:
+        """Build a nested mapping of watched keys, None meaning the whole subtree."""
+        mask: Dict[str, Any] = {}
+        for prefix in prefixes:
+            keys = compile_path(prefix).keys
+            if not keys:
+                continue
+
+            node = mask
+            for key in keys[:-1]:
+                child = node.setdefault(key, {})
+                if child is None:
+                    break  # an ancestor is already watched as a whole
+                node = child
+            else:
+                node[keys[-1]] = None
+        return mask
+
     @staticmethod
     def _walk_changes(
         old_data: Dict[str, Any],
@@ -121,61 +190,257 @@ class ChangeTracker:
         Yields:
             Tuples of (path, change) for each detected change
         """
-        # Find keys in both configs
-        old_keys = set(old_data.keys() if isinstance(old_data, dict) else [])
-        new_keys = set(new_data.keys() if isinstance(new_data, dict) else [])
+        if isinstance(old_data, PersistentMap) and isinstance(new_data, PersistentMap):
+            yield from ChangeTracker._walk_persistent(old_data, new_data, parent_path)
+            return
 
         # Process deleted keys (in old but not new)
-        for key in old_keys - new_keys:
-            path = f"{parent_path}.{key}" if parent_path else key
-            yield path, ConfigChange(
-                ChangeType.DELETE, path, old_value=old_data[key], new_value=None
-            )
+        for key, old_value in old_data.items():
+            if key not in new_data:
+                path = f"{parent_path}.{key}" if parent_path else key
+                yield path, ConfigChange(
+                    ChangeType.DELETE, path, old_value=old_value, new_value=None
+                )
 
         # Process created keys (in new but not old)
-        for key in new_keys - old_keys:
-            path = f"{parent_path}.{key}" if parent_path else key
-            yield path, ConfigChange(
-                ChangeType.CREATE, path, old_value=None, new_value=new_data[key]
-            )
+        for key, new_value in new_data.items():
+            if key not in old_data:
+                path = f"{parent_path}.{key}" if parent_path else key
+                yield path, ConfigChange(
+                    ChangeType.CREATE, path, old_value=None, new_value=new_value
+                )
 
         # Process common keys
-        for key in new_keys & old_keys:
-            path = f"{parent_path}.{key}" if parent_path else key
-            old_value = old_data[key]
+        for key, old_value in old_data.items():
+            if key not in new_data:
+                continue
+
             new_value = new_data[key]
 
-            # Handle different types
-            if type(old_value) != type(new_value):
+            # Shared subtrees cannot differ
+            if old_value is new_value:
+                continue
+
+            path = f"{parent_path}.{key}" if parent_path else key
+            yield from ChangeTracker._compare_values(path, old_value, new_value)
+
+    @staticmethod
+    def _walk_persistent(
+        old_data: PersistentMap,
+        new_data: PersistentMap,
+        parent_path: str = "",
+    ) -> Generator[Tuple[str, ConfigChange], None, None]:
+        """Walk two persistent maps, visiting only the entries that differ.
+
+        Yields the same changes in the same order as ``_walk_changes``, but trie
+        nodes shared by both maps are skipped, so the cost is O(changed nodes).
+        """
+        differing = list(old_data.diff(new_data))
+
+        # Process deleted keys (in old but not new)
+        for key, old_value, new_value in differing:
+            if new_value is MISSING:
+                path = f"{parent_path}.{key}" if parent_path else key
                 yield path, ConfigChange(
-                    ChangeType.UPDATE, path, old_value=old_value, new_value=new_value
+                    ChangeType.DELETE, path, old_value=old_value, new_value=None
                 )
 
-            # Both are dictionaries - recurse
-            elif isinstance(new_value, dict) and isinstance(old_value, dict):
-                yield from ChangeTracker._walk_changes(old_value, new_value, path)
-
-            # Both are lists - check if they're different
-            elif isinstance(new_value, list) and isinstance(old_value, list):
-                if new_value != old_value:
-                    yield path, ConfigChange(
-                        ChangeType.UPDATE,
-                        path,
-                        old_value=old_value,
-                        new_value=new_value,
-                    )
-
-            # Atomic values - check equality
-            elif new_value != old_value:
+        # Process created keys (in new but not old)
+        for key, old_value, new_value in differing:
+            if old_value is MISSING:
+                path = f"{parent_path}.{key}" if parent_path else key
                 yield path, ConfigChange(
-                    ChangeType.UPDATE, path, old_value=old_value, new_value=new_value
+                    ChangeType.CREATE, path, old_value=None, new_value=new_value
                 )
 
+        # Process common keys
+        for key, old_value, new_value in differing:
+            if old_value is not MISSING and new_value is not MISSING:
+                path = f"{parent_path}.{key}" if parent_path else key
+                yield from ChangeTracker._compare_values(path, old_value, new_value)
+
+    @staticmethod
+    def _walk_touched(
+        old_data: Dict[str, Any],
+        new_data: Dict[str, Any],
+        touched: Dict[str, Any],
+        parent_path: str = "",
+    ) -> Generator[Tuple[str, ConfigChange], None, None]:
+        """Walk only the touched keys of old and new configs, yielding changes.
+
+        Mirrors ``_walk_changes``: dictionaries are recursed into, any other
+        differing value is reported as a whole.
+
+        Args:
+            old_data: Previous configuration state
+            new_data: New configuration state
+            touched: Nested mapping of keys to walk, None meaning the whole subtree
+            parent_path: Path prefix for nested values
+
+        Yields:
+            Tuples of (path, change) for each detected change
+        """
+        # Process deleted keys (in old but not new)
+        for key in touched:
+            if key in old_data and key not in new_data:
+                path = f"{parent_path}.{key}" if parent_path else key
+                yield path, ConfigChange(
+                    ChangeType.DELETE, path, old_value=old_data[key], new_value=None
+                )
+
+        # Process created keys (in new but not old)
+        for key in touched:
+            if key in new_data and key not in old_data:
+                path = f"{parent_path}.{key}" if parent_path else key
+                yield path, ConfigChange(
+                    ChangeType.CREATE, path, old_value=None, new_value=new_data[key]
+                )
+
+        # Process common keys
+        for key, sub_touched in touched.items():
+            if key not in old_data or key not in new_data:
+                continue
+
+            old_value = old_data[key]
+            new_value = new_data[key]
+            if old_value is new_value:
+                continue
+
+            path = f"{parent_path}.{key}" if parent_path else key
+            if (
+                sub_touched is not None
+                and type(old_value) is type(new_value)
+                and isinstance(new_value, (dict, PersistentMap))
+            ):
+                yield from ChangeTracker._walk_touched(old_value, new_value, sub_touched, path)
+            else:
+                yield from ChangeTracker._compare_values(path, old_value, new_value)
+
+    @staticmethod
+    def _compare_values(
+        path: str, old_value: Any, new_value: Any
+    ) -> Generator[Tuple[str, ConfigChange], None, None]:
+        """Compare the old and new value of a key present in both configs."""
+        # Handle different types, even if they compare equal (True and 1)
+        if type(old_value) != type(new_value):
+            yield path, ConfigChange(
+                ChangeType.UPDATE, path, old_value=old_value, new_value=new_value
+            )
+
+        # Both are dictionaries - recurse
+        elif isinstance(new_value, (dict, PersistentMap)):
+            yield from ChangeTracker._walk_changes(old_value, new_value, path)
+
+        # Lists and atomic values - check equality
+        elif new_value != old_value:
+            yield path, ConfigChange(
+                ChangeType.UPDATE, path, old_value=old_value, new_value=new_value
+            )
+
+
+class MutationRecord:
+    """
+    Pre-mutation record of the part of a configuration touched by a write.
+
+    Instead of deep-copying the whole configuration before a change, only the
+    containers along the touched paths are shallow-copied. Everything else is
+    shared with the live data, so recording costs O(path depth) rather than
+    O(config size), and the diff afterwards only walks the touched keys.
+    """
+
+    def __init__(self, data: Dict[str, Any], touched: Dict[str, Any]):
+        """Record the current state of the touched region of ``data``.
+
+        Args:
+            data: The live configuration data, before it is mutated
+            touched: Nested mapping of the keys the write will touch. A value of
+                     None marks a key whose value is replaced as a whole.
+        """
+        self.touched = touched
+        self.old_data = MutationRecord._copy_touched(data, touched)
+
+    @classmethod
+    def for_path(cls, data: Dict[str, Any], path: Union[str, CompiledPath]) -> "MutationRecord":
+        """Create a record for a write to a single path (set/delete).
+
+        Args:
+            data: The live configuration data
+            path: The path that will be written (enhanced dot notation)
+
+        Returns:
+            A MutationRecord for the path
+        """
+        touched = None
+        for key in reversed(compile_path(path).keys):
+            touched = {key: touched}
+        return cls(data, touched or {})
+
+    @classmethod
+    def for_merge(cls, data: Dict[str, Any], source: Dict[str, Any]) -> "MutationRecord":
+        """Create a record for a deep merge of ``source`` into ``data`` (update).
+
+        Args:
+            data: The live configuration data
+            source: The dictionary that will be merged into ``data``
+
+        Returns:
+            A MutationRecord covering every key of ``source``
+        """
+
+        def touched_keys(node: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                key: touched_keys(value) if isinstance(value, dict) else None
+                for key, value in node.items()
+            }
+
+        return cls(data, touched_keys(source))
+
+    def detect_changes(self, new_data: Dict[str, Any]) -> List[ConfigChange]:
+        """Detect changes between the recorded state and ``new_data``.
+
+        Produces the same changes as ``ChangeTracker.detect_changes`` would for
+        the full old and new configurations, given that only the touched keys
+        were modified.
+
+        Args:
+            new_data: The configuration data after the mutation
+
+        Returns:
+            List of ConfigChange objects describing the changes
+        """
+        changes = [
+            change
+            for _, change in ChangeTracker._walk_touched(self.old_data, new_data, self.touched)
+        ]
+        if changes:
+            changes.insert(0, ConfigChange(ChangeType.CHANGE, "*", self.old_data, new_data))
+        return changes
+
+    @staticmethod
+    def _copy_touched(node: Any, touched: Optional[Dict[str, Any]]) -> Any:
+        """Shallow-copy the containers along the touched keys of ``node``."""
+        if touched is None or not isinstance(node, (dict, list)):
+            return node
+
+        copied = node.copy()
+        for key, sub_touched in touched.items():
+            # Values replaced as a whole are detached from the tree, not mutated
+            if sub_touched is None:
+                continue
+            if isinstance(copied, dict):
+                if key in copied:
+                    copied[key] = MutationRecord._copy_touched(copied[key], sub_touched)
+            elif key.isdigit() and int(key) < len(copied):
+                index = int(key)
+                copied[index] = MutationRecord._copy_touched(copied[index], sub_touched)
+        return copied
+
 
 def emit_change_events(config: "NekoConf", changes: List[ConfigChange]) -> None:
     """Emit events for a list of changes.
 
-    This centralizes event emission logic in one place.
+    This centralizes event emission logic in one place. Each change is emitted to
+    per-event handlers, then the whole list is delivered once to batch handlers.
 
     Args:
         config_manager: The NekoConf instance
@@ -207,8 +472,11 @@ def emit_change_events(config: "NekoConf", changes: List[ConfigChange]) -> None:
                 config_data=config.data,
             )
 
-        if change.path != "*":
+        if change.path != "*" and logger.isEnabledFor(logging.DEBUG):
             logger.debug(
                 f"Emitted {event_type.value.upper()} event for path '{change.path}' "
                 f"from '{change.old_value}' to '{change.new_value }'"
             )
+
+    # Deliver the whole commit to batch handlers
+    config.event_pipeline.emit_batch(changes, config_data=config.data)
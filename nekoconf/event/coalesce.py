@@ -0,0 +1,246 @@
+"""Coalescing of bursts of events for event handlers.
+
+Handlers registered with ``coalesce`` do not receive every event as it is
+emitted. Their events are collected per handler and path until the coalescing
+window has passed since the first of them, or until an explicit flush. The
+handler then receives one event per event type, carrying the first old value and
+the last new value. These are delivered in the order of the last event of each
+type, so the last event a handler receives for a path is the one that happened
+last. Events whose last new value equals their first old value are dropped.
+
+Coalesced batch handlers receive the changes of all commits of the window as one
+batch, with one change per path. Paths that end as they started are left out.
+"""
+
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ..utils.helper import getLogger
+from .handler import EventContext
+from .type import EventType
+
+if TYPE_CHECKING:
+    from .changes import ConfigChange
+    from .handler import EventHandler
+
+
+def _unchanged(old_value: Any, new_value: Any) -> bool:
+    """Check whether a coalesced value ends as it started, telling apart 1 and True."""
+    from .changes import ChangeTracker
+
+    return next(ChangeTracker._compare_values("", old_value, new_value), None) is None
+
+
+class _Pending:
+    """The events collected for one handler and path."""
+
+    __slots__ = ("handler", "events", "changes", "config_data", "deadline")
+
+    def __init__(self, handler: "EventHandler", deadline: float):
+        self.handler = handler
+        # Merged event per event type, ordered by the last event of each type
+        self.events: Dict[EventType, EventContext] = {}
+        # Batch handlers: path -> (whether the path existed before, merged change)
+        self.changes: Dict[str, Tuple[bool, "ConfigChange"]] = {}
+        self.config_data: Optional[Dict[str, Any]] = None
+        self.deadline = deadline
+
+    def batch(self) -> List["ConfigChange"]:
+        """Get the net change of each path, leaving out paths that end as they started."""
+        # Imported here, the changes module depends on the pipeline
+        from .changes import ChangeType
+
+        changes = []
+        for existed, change in self.changes.values():
+            if change.change_type != ChangeType.CHANGE:
+                exists = change.change_type != ChangeType.DELETE
+                if existed and exists:
+                    change.change_type = ChangeType.UPDATE
+                elif exists:
+                    change.change_type = ChangeType.CREATE
+                elif existed:
+                    change.change_type = ChangeType.DELETE
+                else:
+                    continue
+            if change.change_type in (ChangeType.UPDATE, ChangeType.CHANGE) and _unchanged(
+                change.old_value, change.new_value
+            ):
+                continue
+            changes.append(change)
+        return changes
+
+
+class Coalescer:
+    """Collects the events of coalescing handlers and delivers them when due."""
+
+    def __init__(
+        self,
+        deliver_event: Callable[["EventHandler", EventContext], None],
+        deliver_batch: Callable[["EventHandler", List["ConfigChange"], Dict[str, Any]], None],
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initialize the coalescer.
+
+        Args:
+            deliver_event: Delivers a coalesced event to a handler
+            deliver_batch: Delivers coalesced changes to a batch handler
+            logger: Optional logger for delivery errors
+        """
+        self.logger = logger or getLogger(__name__)
+        self._deliver_event = deliver_event
+        self._deliver_batch = deliver_batch
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._deadlines: List[Tuple[float, int, Hashable, _Pending]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self.received = 0
+        self.delivered = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of handler and path pairs with collected events waiting to be delivered."""
+        return len(self._pending)
+
+    def add_event(self, handler: "EventHandler", context: EventContext) -> None:
+        """Collect an event for a handler.
+
+        Args:
+            handler: A handler with a coalescing window
+            context: The event
+        """
+        with self._lock:
+            entry = self._entry(handler, (handler, context.path))
+            merged = entry.events.pop(context.event_type, None)
+            if merged is None:
+                merged = EventContext(
+                    context.event_type,
+                    context.path,
+                    context.old_value,
+                    context.new_value,
+                    context.config_data,
+                )
+            else:
+                merged.new_value = context.new_value
+                merged.config_data = context.config_data
+            # Re-inserted, so the event types stay in the order of their last event
+            entry.events[context.event_type] = merged
+
+    def add_batch(
+        self,
+        handler: "EventHandler",
+        changes: List["ConfigChange"],
+        config_data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Collect the changes of a commit for a batch handler.
+
+        Args:
+            handler: A batch handler with a coalescing window
+            changes: The changes matching the handler
+            config_data: The complete configuration data
+        """
+        from .changes import ChangeType, ConfigChange
+
+        with self._lock:
+            entry = self._entry(handler, (handler, None))
+            entry.config_data = config_data
+            for change in changes:
+                merged = entry.changes.get(change.path)
+                if merged is None:
+                    existed = change.change_type != ChangeType.CREATE
+                    entry.changes[change.path] = (
+                        existed,
+                        ConfigChange(
+                            change.change_type, change.path, change.old_value, change.new_value
+                        ),
+                    )
+                else:
+                    merged[1].change_type = change.change_type
+                    merged[1].new_value = change.new_value
+
+    def flush(self) -> int:
+        """Deliver all collected events now, on the calling thread.
+
+        Returns:
+            Number of coalesced events delivered
+        """
+        with self._lock:
+            entries = list(self._pending.values())
+            self._pending.clear()
+            self._deadlines.clear()
+        for entry in entries:
+            self._deliver(entry)
+        return len(entries)
+
+    def close(self) -> None:
+        """Deliver the collected events and stop the timer thread."""
+        with self._changed:
+            thread, self._thread = self._thread, None
+            self._changed.notify_all()
+        self.flush()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(1.0)
+
+    def _entry(self, handler: "EventHandler", key: Hashable) -> _Pending:
+        """Get the pending entry for a key, scheduling a new one. Requires the lock."""
+        self.received += 1
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = self._pending[key] = _Pending(handler, time.monotonic() + handler.coalesce)
+            if not math.isinf(handler.coalesce):
+                heapq.heappush(self._deadlines, (entry.deadline, next(self._sequence), key, entry))
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="NekoConf-Coalescer", daemon=True
+                    )
+                    self._thread.start()
+                elif self._deadlines[0][3] is entry:
+                    self._changed.notify_all()
+        return entry
+
+    def _run(self) -> None:
+        current = threading.current_thread()
+        while True:
+            with self._changed:
+                if self._thread is not current:
+                    return
+                now = time.monotonic()
+                due = []
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    _, _, key, entry = heapq.heappop(self._deadlines)
+                    if self._pending.get(key) is entry:
+                        del self._pending[key]
+                        due.append(entry)
+                if not due:
+                    timeout = self._deadlines[0][0] - now if self._deadlines else None
+                    self._changed.wait(timeout)
+                    continue
+            for entry in due:
+                self._deliver(entry)
+
+    def _deliver(self, entry: _Pending) -> None:
+        handler = entry.handler
+        try:
+            if entry.events:
+                for context in entry.events.values():
+                    if _unchanged(context.old_value, context.new_value):
+                        continue
+                    with self._lock:
+                        self.delivered += 1
+                    self._deliver_event(handler, context)
+                return
+            changes = entry.batch()
+            if changes:
+                with self._lock:
+                    self.delivered += 1
+                self._deliver_batch(handler, changes, entry.config_data)
+        except Exception as e:
+            self.logger.error(
+                f"Error delivering coalesced events to {handler.callback.__name__}: {e}"
+            )
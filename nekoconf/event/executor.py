@@ -0,0 +1,150 @@
+"""Execution of event handlers off the emitting thread.
+
+Handlers registered with the ``pool`` or ``serial`` execution policy do not run on
+the thread that changed the configuration. Their calls are queued and the writer
+returns immediately:
+
+- ``pool`` handlers run on a thread pool shared by the pipeline. Calls for the same
+  handler and path run one at a time, in the order they were emitted.
+- ``serial`` handlers run on a thread of their own, one call at a time, in the
+  order they were emitted.
+
+A handler's ``max_pending`` limits its queued and running calls. Writers emitting
+beyond it wait for calls to complete, unless they are handler threads themselves.
+"""
+
+import concurrent.futures
+import logging
+import threading
+from collections import deque
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+from ..utils.helper import getLogger
+
+if TYPE_CHECKING:
+    from .handler import EventHandler
+
+
+class ExecutionPolicy(Enum):
+    """Where an event handler runs."""
+
+    INLINE = "inline"  # On the emitting thread, before the write returns
+    POOL = "pool"  # On the shared thread pool, ordered per path
+    SERIAL = "serial"  # On a dedicated thread per handler, fully ordered
+
+
+class HandlerExecutor:
+    """Runs offloaded event handler calls and tracks them until they complete."""
+
+    def __init__(self, max_workers: Optional[int] = None, logger: Optional[logging.Logger] = None):
+        """Initialize the executor.
+
+        Args:
+            max_workers: Size of the shared thread pool, the ThreadPoolExecutor
+                         default if None
+            logger: Optional logger for handler errors
+        """
+        self.max_workers = max_workers
+        self.logger = logger or getLogger(__name__)
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._serial: Dict["EventHandler", concurrent.futures.ThreadPoolExecutor] = {}
+        # Calls waiting for the running call of the same handler and path
+        self._queues: Dict[Tuple["EventHandler", Hashable], Deque[Callable[[], None]]] = {}
+        self._pending: Dict["EventHandler", int] = {}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._local = threading.local()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of queued and running handler calls."""
+        return self._in_flight
+
+    def submit(self, handler: "EventHandler", key: Hashable, call: Callable[[], None]) -> None:
+        """Queue a handler call.
+
+        Args:
+            handler: The handler, with a ``pool`` or ``serial`` execution policy
+            key: Calls of a pool handler with equal keys run in order, one at a time
+            call: Calls the handler
+        """
+        with self._changed:
+            limit = handler.max_pending
+            if limit is not None and not getattr(self._local, "worker", False):
+                self._changed.wait_for(lambda: self._pending.get(handler, 0) < limit)
+            self._pending[handler] = self._pending.get(handler, 0) + 1
+            self._in_flight += 1
+
+            if handler.execution is ExecutionPolicy.SERIAL:
+                executor = self._serial.get(handler)
+                if executor is None:
+                    executor = self._serial[handler] = concurrent.futures.ThreadPoolExecutor(
+                        1, thread_name_prefix=f"NekoConf-Handler-{handler.callback.__name__}"
+                    )
+                executor.submit(self._run, handler, call)
+                return
+
+            queue = self._queues.get((handler, key))
+            if queue is not None:
+                queue.append(call)
+                return
+            self._queues[(handler, key)] = deque()
+            if self._pool is None:
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="NekoConf-Handler"
+                )
+            self._pool.submit(self._drain, handler, key, call)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for all queued and running handler calls to complete.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if all calls completed
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the handler threads once the queued calls have run.
+
+        Args:
+            wait: Wait for the queued calls to complete
+        """
+        with self._lock:
+            executors = list(self._serial.values())
+            if self._pool is not None:
+                executors.append(self._pool)
+            self._pool = None
+            self._serial.clear()
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+    def _drain(self, handler: "EventHandler", key: Hashable, call: Callable[[], None]) -> None:
+        """Run a pool handler's call, then the calls queued behind it for the same key."""
+        while True:
+            self._run(handler, call)
+            with self._lock:
+                queue = self._queues[(handler, key)]
+                if not queue:
+                    del self._queues[(handler, key)]
+                    return
+                call = queue.popleft()
+
+    def _run(self, handler: "EventHandler", call: Callable[[], None]) -> None:
+        self._local.worker = True
+        try:
+            call()
+        except Exception as e:
+            self.logger.error(f"Error in event handler {handler.callback.__name__}: {e}")
+        finally:
+            with self._changed:
+                self._pending[handler] -= 1
+                if not self._pending[handler]:
+                    del self._pending[handler]
+                self._in_flight -= 1
+                self._changed.notify_all()
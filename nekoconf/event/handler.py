@@ -1,9 +1,16 @@
-from typing import Any, Callable, Dict, Optional, Set
+import asyncio
+import math
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Union
 
 from ..utils.helper import getLogger, is_async_callable
-from .match import PathMatcher
+from .executor import ExecutionPolicy
+from .loop import get_loop_thread
+from .match import CompiledPattern
 from .type import EventType
 
+if TYPE_CHECKING:
+    from .changes import ConfigChange
+
 
 class EventContext:
     """
@@ -45,6 +52,10 @@ class EventHandler:
         event_types: Set[EventType],
         path_pattern: Optional[str] = None,
         priority: int = 100,
+        batch: bool = False,
+        execution: Union[ExecutionPolicy, str] = ExecutionPolicy.INLINE,
+        max_pending: Optional[int] = None,
+        coalesce: Union[bool, float, None] = None,
         **kwargs,
     ):
         """Initialize an event handler.
@@ -54,17 +65,52 @@ class EventHandler:
             event_types: Types of events this handler responds to
             path_pattern: Optional path pattern to filter events (enhanced dot notation)
             priority: Handler priority (lower number = higher priority)
+            batch: If True, the handler is called once per commit with all matching
+                   changes instead of once per change
+            execution: Where the handler runs: ``inline`` on the emitting thread,
+                       ``pool`` on the pipeline's thread pool or ``serial`` on a thread
+                       of its own (default: inline)
+            max_pending: Maximum number of queued and running calls of a ``pool`` or
+                         ``serial`` handler before emitters wait, None for no limit
+            coalesce: Seconds to collect the handler's events per path before
+                      delivering one event per event type with the first old and the
+                      last new value, True to collect them until the pipeline is
+                      flushed, None to deliver every event (default)
             **kwargs: Additional keyword arguments to pass to callback
+
+        Raises:
+            TypeError: If the callback is not callable
+            ValueError: If an async callback is not executed inline, or max_pending
+                        or coalesce is not positive
         """
         if not callable(callback):
             raise TypeError(f"Callback must be callable, received {type(callback).__name__}")
+        execution = ExecutionPolicy(execution)
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        if coalesce is True:
+            coalesce = math.inf
+        elif coalesce is False:
+            coalesce = None
+        elif coalesce is not None and not coalesce > 0:
+            raise ValueError("coalesce must be a positive number of seconds")
 
         self.callback = callback
         self.event_types = event_types
         self.path_pattern = path_pattern
+        self.compiled_pattern = CompiledPattern(path_pattern) if path_pattern else None
         self.priority = priority
+        self.batch = batch
         self.kwargs = kwargs
         self.is_async = is_async_callable(callback)
+        if self.is_async and execution is not ExecutionPolicy.INLINE:
+            raise ValueError(
+                f"Async handler {callback.__name__} runs on an event loop, "
+                f"it cannot use the {execution.value} execution policy"
+            )
+        self.execution = execution
+        self.max_pending = max_pending
+        self.coalesce: Optional[float] = coalesce
 
         self.logger = getLogger(__name__)
 
@@ -100,8 +146,8 @@ class EventHandler:
             return False
 
         try:
-            # Use PathMatcher for path matching with enhanced dot notation
-            return PathMatcher.match(self.path_pattern, context.path)
+            # Use the pattern compiled at registration for enhanced dot notation matching
+            return self.compiled_pattern.match(context.path)
         except Exception as e:
             # Log but don't fail, just consider it a non-match
             self.logger.debug(
@@ -109,8 +155,8 @@ class EventHandler:
             )
             return False
 
-    async def handle_async(self, context: EventContext) -> None:
-        """Handle event asynchronously.
+    def event_kwargs(self, context: EventContext) -> Dict[str, Any]:
+        """Get the callback arguments for an event.
 
         Args:
             context: Event context
@@ -127,19 +173,20 @@ class EventHandler:
                 "config_data": context.config_data,
             }
         )
+        return kwargs
 
-        try:
-            # Call async or sync callback
-            if self.is_async:
-                await self.callback(**kwargs)
-            else:
-                self.callback(**kwargs)
-        except Exception as e:
-            import traceback
+    def batch_kwargs(
+        self, changes: List["ConfigChange"], config_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Get the callback arguments for a batch of changes.
 
-            # Log the error but don't propagate it
-            self.logger.error(f"Error in event handler {self.callback.__name__}: {e}")
-            self.logger.debug(traceback.format_exc())
+        Args:
+            changes: The changes matching this handler, in emission order
+            config_data: The complete configuration data
+        """
+        kwargs = self.kwargs.copy()
+        kwargs.update({"changes": changes, "config_data": config_data or {}})
+        return kwargs
 
     def handle_event(self, context: EventContext) -> None:
         """Handle event synchronously.
@@ -147,32 +194,28 @@ class EventHandler:
         Args:
             context: Event context
         """
-        kwargs = self.kwargs.copy()
+        self._invoke(self.event_kwargs(context))
 
-        # Add standard parameters
-        kwargs.update(
-            {
-                "event_type": context.event_type,
-                "path": context.path,
-                "old_value": context.old_value,
-                "new_value": context.new_value,
-                "config_data": context.config_data,
-            }
-        )
+    def handle_batch(
+        self, changes: List["ConfigChange"], config_data: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Handle a batch of changes synchronously.
+
+        Args:
+            changes: The changes matching this handler, in emission order
+            config_data: The complete configuration data
+        """
+        self._invoke(self.batch_kwargs(changes, config_data))
+
+    def _invoke(self, kwargs: Dict[str, Any]) -> None:
+        """Call the callback with error handling.
 
-        # Call the callback - with error handling
+        Args:
+            kwargs: Keyword arguments for the callback
+        """
         try:
             if self.is_async:
-                # For async callbacks in sync context, we create a new event loop if needed
-                import asyncio
-
-                try:
-                    loop = asyncio.get_running_loop()
-                    # If we're already in a running event loop, schedule the task
-                    asyncio.create_task(self.callback(**kwargs))
-                except RuntimeError:
-                    # Handle case when there's no event loop
-                    asyncio.run(self.callback(**kwargs))
+                self._invoke_async(kwargs)
             else:
                 # For sync callbacks, just call directly
                 self.callback(**kwargs)
@@ -182,3 +225,27 @@ class EventHandler:
 
             self.logger.error(f"Error in event handler {self.callback.__name__}: {e}")
             self.logger.debug(traceback.format_exc())
+
+    def _invoke_async(self, kwargs: Dict[str, Any]) -> None:
+        """Run the async callback on the shared event loop thread.
+
+        Without a running event loop this waits for the callback, like a sync call.
+        Inside one it returns at once, as waiting would block that loop.
+
+        Args:
+            kwargs: Keyword arguments for the callback
+        """
+        future = get_loop_thread().submit(self._await(kwargs))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            future.result()
+
+    async def _await(self, kwargs: Dict[str, Any]) -> None:
+        try:
+            await self.callback(**kwargs)
+        except Exception as e:
+            import traceback
+
+            self.logger.error(f"Error in event handler {self.callback.__name__}: {e}")
+            self.logger.debug(traceback.format_exc())
@@ -0,0 +1,162 @@
+"""Handler index for NekoConf event dispatch.
+
+This module provides a lookup structure that resolves the handlers matching an
+event without testing every registered handler against the event path.
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from ..utils.helper import compile_path
+from .match import CompiledPattern
+from .type import EventType
+
+if TYPE_CHECKING:
+    from .handler import EventHandler
+
+# A handler together with its position in the pipeline's handler list
+RankedHandler = Tuple[int, "EventHandler"]
+
+
+class _TrieNode:
+    """
+    A node in the path pattern trie.
+    """
+
+    __slots__ = ("children", "wildcard", "exact", "prefix")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.wildcard: Optional["_TrieNode"] = None
+        # Handlers whose pattern ends at this node
+        self.exact: List[RankedHandler] = []
+        # Handlers whose pattern is this node followed by a trailing ".*"
+        self.prefix: List[RankedHandler] = []
+
+
+class PatternTrie:
+    """
+    Segment trie over handler path patterns.
+
+    Literal segments are stored as children, while "*" and "[*]" segments share
+    a single wildcard child. A trailing ".*" registers the handler as a prefix
+    handler on the node for the remaining segments.
+    """
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def insert(self, pattern: CompiledPattern, entry: RankedHandler) -> None:
+        """Add a handler under a path pattern.
+
+        Args:
+            pattern: The handler's compiled path pattern
+            entry: The handler with its rank in the pipeline
+        """
+        node = self.root
+        for key in pattern.segments:
+            if key == "*":
+                if node.wildcard is None:
+                    node.wildcard = _TrieNode()
+                node = node.wildcard
+            else:
+                node = node.children.setdefault(key, _TrieNode())
+
+        if pattern.is_prefix:
+            node.prefix.append(entry)
+        else:
+            node.exact.append(entry)
+
+    def collect(self, keys: Tuple[str, ...], out: List[RankedHandler]) -> None:
+        """Collect the handlers whose pattern matches a concrete path.
+
+        Args:
+            keys: The concrete path keys
+            out: List the matching handlers are appended to
+        """
+        depth_limit = len(keys)
+        stack = [(self.root, 0)]
+
+        while stack:
+            node, depth = stack.pop()
+            out.extend(node.prefix)
+
+            if depth == depth_limit:
+                out.extend(node.exact)
+                continue
+
+            child = node.children.get(keys[depth])
+            if child is not None:
+                stack.append((child, depth + 1))
+            if node.wildcard is not None:
+                stack.append((node.wildcard, depth + 1))
+
+
+class _TypeIndex:
+    """
+    Handlers registered for a single event type.
+    """
+
+    __slots__ = ("catch_all", "global_only", "trie")
+
+    def __init__(self):
+        # Handlers without a path filter or with the "*" pattern
+        self.catch_all: List[RankedHandler] = []
+        # Handlers with the "@global" pattern
+        self.global_only: List[RankedHandler] = []
+        self.trie = PatternTrie()
+
+
+class HandlerIndex:
+    """
+    Index of event handlers by event type and path pattern.
+
+    Lookups return exactly the handlers for which ``EventHandler.matches`` holds,
+    in the same order as the handler list the index was built from.
+    """
+
+    def __init__(self, handlers: List["EventHandler"]):
+        """Build the index.
+
+        Args:
+            handlers: Handlers in dispatch order
+        """
+        self._by_type: Dict[EventType, _TypeIndex] = {}
+
+        for rank, handler in enumerate(handlers):
+            entry = (rank, handler)
+            pattern = handler.path_pattern
+
+            for event_type in handler.event_types:
+                type_index = self._by_type.get(event_type)
+                if type_index is None:
+                    type_index = self._by_type[event_type] = _TypeIndex()
+
+                if not pattern or pattern == "*":
+                    type_index.catch_all.append(entry)
+                elif pattern == "@global":
+                    type_index.global_only.append(entry)
+                else:
+                    type_index.trie.insert(handler.compiled_pattern, entry)
+
+    def lookup(self, event_type: EventType, path: Optional[str]) -> List["EventHandler"]:
+        """Find the handlers matching an event.
+
+        Args:
+            event_type: The type of the event
+            path: The event path, "*" or None for global events
+
+        Returns:
+            Matching handlers in dispatch order
+        """
+        type_index = self._by_type.get(event_type)
+        if type_index is None:
+            return []
+
+        matched = list(type_index.catch_all)
+        if path == "*" or path is None:
+            matched.extend(type_index.global_only)
+        elif path:
+            type_index.trie.collect(compile_path(path).keys, matched)
+
+        matched.sort(key=lambda entry: entry[0])
+        return [handler for _, handler in matched]
@@ -0,0 +1,94 @@
+"""Long-lived event loop thread for running async event handlers.
+
+Synchronous code that emits events has no event loop to run async handlers on.
+Rather than creating and closing a loop per event, they are submitted to one loop
+running in a daemon thread for the lifetime of the process.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+
+class EventLoopThread:
+    """An event loop running in a daemon thread, started on first use."""
+
+    def __init__(self, name: str = "NekoConf-EventLoop"):
+        """Initialize the loop thread.
+
+        Args:
+            name: Name of the thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running event loop, started if necessary."""
+        with self._lock:
+            if self._loop is None or not self._thread.is_alive():
+                started = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._loop, started), name=self.name, daemon=True
+                )
+                self._thread.start()
+                started.wait()
+            return self._loop
+
+    @property
+    def thread(self) -> Optional[threading.Thread]:
+        """The thread running the loop, None if it was never started."""
+        return self._thread
+
+    @property
+    def running(self) -> bool:
+        """Whether the loop thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, coroutine: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Run a coroutine on the loop.
+
+        Returns:
+            A future for the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        """Stop the loop and wait for its thread to exit.
+
+        Args:
+            timeout: Maximum number of seconds to wait for the thread
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+
+
+_default_thread = EventLoopThread()
+
+
+def get_loop_thread() -> EventLoopThread:
+    """Get the loop thread shared by all event pipelines of the process."""
+    return _default_thread
@@ -1,6 +1,119 @@
-from typing import List
+import functools
+from typing import Sequence, Tuple, Union
 
-from ..utils.helper import parse_path
+from ..utils.helper import CompiledPath, compile_path
+
+# Maximum number of distinct patterns kept in the PathMatcher cache
+PATTERN_CACHE_SIZE = 1024
+
+
+class CompiledPattern:
+    """
+    A path pattern parsed once, for matching many paths.
+
+    The pattern is classified when compiled so that matching takes a fast path:
+    - "exact": no wildcards, compared as a whole
+    - "prefix": trailing ".*", compares only the leading segments
+    - "wildcard": fixed number of segments, some of which are "*"
+    - "any": the global "*" pattern
+    - "empty": the empty pattern, which only matches an empty path
+    """
+
+    __slots__ = ("pattern", "kind", "segments", "has_wildcard", "_literals")
+
+    def __init__(self, pattern: str):
+        """Compile a path pattern.
+
+        Args:
+            pattern: The pattern to compile (enhanced dot notation)
+        """
+        self.pattern = pattern or ""
+
+        if not self.pattern:
+            self.kind = "empty"
+            self.segments: Tuple[str, ...] = ()
+        elif self.pattern == "*":
+            self.kind = "any"
+            self.segments = ("*",)
+        elif self.pattern.endswith(".*"):
+            self.kind = "prefix"
+            self.segments = compile_path(self.pattern).keys[:-1]
+        else:
+            segments = compile_path(self.pattern).keys
+            self.kind = "wildcard" if "*" in segments else "exact"
+            self.segments = segments
+
+        self.has_wildcard = "*" in self.segments
+
+        # Positions that must match literally, so wildcard segments are never compared
+        self._literals = tuple(
+            (index, segment) for index, segment in enumerate(self.segments) if segment != "*"
+        )
+
+    @property
+    def is_prefix(self) -> bool:
+        """True if the pattern ends with ".*" and matches all paths below its segments."""
+        return self.kind == "prefix"
+
+    def __repr__(self) -> str:
+        return f"CompiledPattern({self.pattern!r})"
+
+    def match(self, path: Union[str, CompiledPath, Sequence[str]]) -> bool:
+        """Match a concrete path against this pattern.
+
+        Args:
+            path: The path to check, either in dot notation or already split into keys
+
+        Returns:
+            True if the path matches the pattern, False otherwise
+        """
+        if not path:
+            return self.kind == "empty"
+
+        kind = self.kind
+        if kind == "any":
+            return True
+        if kind == "empty":
+            return False
+
+        if isinstance(path, str):
+            if path == self.pattern:
+                return True
+            keys = compile_path(path).keys
+        elif isinstance(path, CompiledPath):
+            keys = path.keys
+        else:
+            keys = tuple(path)
+
+        segments = self.segments
+        if kind == "exact":
+            return keys == segments
+
+        if kind == "prefix":
+            if len(keys) < len(segments):
+                return False
+            if not self.has_wildcard:
+                return keys[: len(segments)] == segments
+        elif len(keys) != len(segments):
+            return False
+
+        for index, segment in self._literals:
+            if keys[index] != segment:
+                return False
+        return True
+
+
+@functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern: str) -> CompiledPattern:
+    """Get a cached CompiledPattern for a pattern string.
+
+    Args:
+        pattern: The pattern to compile
+
+    Returns:
+        The compiled pattern
+    """
+    return CompiledPattern(pattern)
 
 
 class PathMatcher:
@@ -26,39 +139,7 @@ class PathMatcher:
         Returns:
             True if the path matches the pattern, False otherwise
         """
-        if not pattern and not path:
-            return True
-        if not pattern or not path:
-            return False
-        if pattern == "*":
-            return True
-        if pattern == path:
-            return True
-
-        # Parse both pattern and path into segments
-        pattern_segments = parse_path(pattern)
-        path_segments = parse_path(path)
-
-        # Handle prefix matching for patterns ending with "*"
-        if pattern.endswith(".*"):
-            # Remove the trailing "*" and check if path starts with pattern prefix
-            prefix_segments = pattern_segments[:-1]
-            return len(path_segments) >= len(prefix_segments) and PathMatcher._segments_match(
-                prefix_segments, path_segments[: len(prefix_segments)]
-            )
-
-        # Exact segment count matching
-        if len(pattern_segments) != len(path_segments):
-            return False
-
-        return PathMatcher._segments_match(pattern_segments, path_segments)
+        if not pattern:
+            return not path
 
-    @staticmethod
-    def _segments_match(pattern_segments: List[str], path_segments: List[str]) -> bool:
-        """
-        Match pattern segments against path segments.
-        """
-        return all(
-            pattern_seg == "*" or pattern_seg == path_seg
-            for pattern_seg, path_seg in zip(pattern_segments, path_segments)
-        )
+        return compile_pattern(pattern).match(path)
@@ -0,0 +1,169 @@
+"""JSON-Patch-like deltas between configuration states.
+
+Patches are lists of operations in the style of RFC 6902, limited to ``add``,
+``replace`` and ``remove``, with paths given as JSON Pointers (RFC 6901):
+
+    [{"op": "replace", "path": "/server/port", "value": 9000},
+     {"op": "remove", "path": "/debug"}]
+
+They are built from the change lists NekoConf already computes, so producing a
+patch costs as much as the change itself rather than a diff of the whole
+configuration, and applying one only touches the changed paths.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..core.persistent import MISSING, PersistentMap, freeze, thaw
+from .changes import ChangeType, ConfigChange
+
+_OPS = {ChangeType.CREATE: "add", ChangeType.UPDATE: "replace", ChangeType.DELETE: "remove"}
+
+
+class PatchError(ValueError):
+    """Raised when a patch is malformed or does not apply to the configuration."""
+
+
+def encode_pointer(keys: Sequence[str]) -> str:
+    """Encode configuration keys as a JSON Pointer."""
+    return "".join("/" + str(key).replace("~", "~0").replace("/", "~1") for key in keys)
+
+
+def decode_pointer(pointer: str) -> List[str]:
+    """Decode a JSON Pointer into configuration keys.
+
+    Raises:
+        PatchError: If the pointer is not valid
+    """
+    if not isinstance(pointer, str) or not pointer.startswith("/"):
+        raise PatchError(f"Invalid JSON Pointer: {pointer!r}")
+    return [key.replace("~1", "/").replace("~0", "~") for key in pointer[1:].split("/")]
+
+
+def changes_to_patch(
+    changes: List[ConfigChange], config_data: Dict[str, Any]
+) -> Optional[List[Dict[str, Any]]]:
+    """Convert detected changes into patch operations.
+
+    Change paths are dot separated, so keys containing dots cannot be told apart
+    from nested keys. Every path is therefore checked against the new data, and no
+    patch is produced when one does not resolve.
+
+    Args:
+        changes: The changes of one commit, as emitted by NekoConf
+        config_data: The configuration data after the changes
+
+    Returns:
+        The patch operations, or None if the changes cannot be expressed as a patch
+    """
+    ops = []
+    for change in changes:
+        if change.change_type not in _OPS:
+            continue  # The global change summarizes the others
+
+        keys = change.path.split(".")
+        parent = config_data
+        for key in keys[:-1]:
+            parent = parent.get(key) if isinstance(parent, (dict, PersistentMap)) else None
+        if not isinstance(parent, (dict, PersistentMap)):
+            return None
+        if (keys[-1] in parent) == (change.change_type == ChangeType.DELETE):
+            return None
+
+        op = {"op": _OPS[change.change_type], "path": encode_pointer(keys)}
+        if change.change_type != ChangeType.DELETE:
+            op["value"] = thaw(change.new_value)
+        ops.append(op)
+    return ops
+
+
+def patch_paths(ops: List[Dict[str, Any]]) -> List[List[str]]:
+    """Get the keys of each operation's path.
+
+    Raises:
+        PatchError: If an operation is malformed
+    """
+    paths = []
+    for op in ops:
+        if not isinstance(op, dict) or op.get("op") not in ("add", "replace", "remove"):
+            raise PatchError(f"Unsupported patch operation: {op!r}")
+        if op["op"] != "remove" and "value" not in op:
+            raise PatchError(f"Patch operation without a value: {op!r}")
+        paths.append(decode_pointer(op.get("path")))
+    return paths
+
+
+def patch_mask(paths: List[List[str]]) -> Dict[str, Any]:
+    """Build the nested mapping of touched keys used for change detection.
+
+    A value of None marks a key whose value is replaced as a whole.
+    """
+    mask: Dict[str, Any] = {}
+    for keys in paths:
+        node = mask
+        for key in keys[:-1]:
+            child = node.setdefault(key, {})
+            if child is None:
+                break  # A parent is replaced as a whole
+            node = child
+        else:
+            node[keys[-1]] = None
+    return mask
+
+
+def apply_patch(data: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply patch operations to configuration data.
+
+    Plain dicts are modified in place, persistent maps are path-copied. Operations
+    are checked against the data as they are applied, so a patch made for a
+    different state is rejected: ``add`` and ``replace`` need an existing parent,
+    ``replace`` and ``remove`` an existing key.
+
+    Args:
+        data: The configuration data, a dict or PersistentMap
+        ops: The patch operations
+
+    Returns:
+        The patched data; the same object for dicts
+
+    Raises:
+        PatchError: If the patch is malformed or does not apply. Dicts may have been
+                    partially modified.
+    """
+    for op, keys in zip(ops, patch_paths(ops)):
+        if isinstance(data, PersistentMap):
+            data = _apply_persistent(data, op, keys)
+        else:
+            _apply_dict(data, op, keys)
+    return data
+
+
+def _check(op: Dict[str, Any], parent: Any, key: str) -> None:
+    if not isinstance(parent, (dict, PersistentMap)):
+        raise PatchError(f"Cannot apply {op['op']} at {op['path']}: parent is not a mapping")
+    if op["op"] != "add" and key not in parent:
+        raise PatchError(f"Cannot apply {op['op']} at {op['path']}: no such key")
+
+
+def _apply_dict(data: Dict[str, Any], op: Dict[str, Any], keys: List[str]) -> None:
+    parent = data
+    for key in keys[:-1]:
+        parent = parent.get(key, MISSING) if isinstance(parent, dict) else MISSING
+    _check(op, parent, keys[-1])
+
+    if op["op"] == "remove":
+        del parent[keys[-1]]
+    else:
+        parent[keys[-1]] = op["value"]
+
+
+def _apply_persistent(node: Any, op: Dict[str, Any], keys: List[str]) -> PersistentMap:
+    if len(keys) == 1:
+        _check(op, node, keys[0])
+        if op["op"] == "remove":
+            return node.delete(keys[0])
+        return node.set(keys[0], freeze(op["value"]))
+
+    child = node.get(keys[0], MISSING) if isinstance(node, PersistentMap) else MISSING
+    if not isinstance(child, PersistentMap):
+        raise PatchError(f"Cannot apply {op['op']} at {op['path']}: parent is not a mapping")
+    return node.set(keys[0], _apply_persistent(child, op, keys[1:]))
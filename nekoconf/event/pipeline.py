@@ -4,27 +4,98 @@ This module provides functionality to define and execute event pipelines
 for configuration changes, with support for filtering and transformation.
 """
 
+import asyncio
+import concurrent.futures
+import functools
 import logging
-from typing import Any, Callable, Dict, List, Optional, Union
+import threading
+import time
+import traceback
+import weakref
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from ..utils.helper import getLogger
+from .coalesce import Coalescer
+from .executor import ExecutionPolicy, HandlerExecutor
 from .handler import EventContext, EventHandler
+from .index import HandlerIndex
+from .loop import EventLoopThread, get_loop_thread
 from .type import EventType
 
+if TYPE_CHECKING:
+    from .changes import ConfigChange
+
 
 class EventPipeline:
     """
     Central event pipeline for NekoConf configuration events.
+
+    Handlers run inline on the emitting thread unless registered with the ``pool``
+    or ``serial`` execution policy, in which case emitting only queues their calls.
+    The events of handlers registered with ``coalesce`` are collected per path and
+    delivered as one per event type once their window has passed. ``flush`` delivers
+    the collected events and waits for the queued calls.
     """
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None, max_workers: Optional[int] = None):
         """Initialize the event pipeline.
 
         Args:
             logger: Optional logger for event logging
+            max_workers: Size of the thread pool running ``pool`` handlers, the
+                         ThreadPoolExecutor default if None
         """
         self.logger = logger or getLogger(__name__)
-        self.handlers: List[EventHandler] = []
+        self.max_workers = max_workers
+        self._handlers: List[EventHandler] = []
+        self._index: Optional[HandlerIndex] = None
+        self._batch_index: Optional[HandlerIndex] = None
+        self._index_size = 0
+        self._executor: Optional[HandlerExecutor] = None
+        self._coalescer: Optional[Coalescer] = None
+        self._lock = threading.Lock()
+
+    @property
+    def handlers(self) -> List[EventHandler]:
+        """Registered handlers, sorted by priority."""
+        return self._handlers
+
+    @handlers.setter
+    def handlers(self, handlers: List[EventHandler]) -> None:
+        self._handlers = handlers
+        self._index = None
+
+    def _get_index(self, batch: bool = False) -> HandlerIndex:
+        """Get the handler index, rebuilding it if the handlers changed.
+
+        Args:
+            batch: If True, get the index of batch handlers instead of per-event handlers
+        """
+        if self._index is None or self._index_size != len(self._handlers):
+            self._index = HandlerIndex([h for h in self._handlers if not h.batch])
+            self._batch_index = HandlerIndex([h for h in self._handlers if h.batch])
+            self._index_size = len(self._handlers)
+        return self._batch_index if batch else self._index
+
+    @property
+    def executor(self) -> HandlerExecutor:
+        """The executor running ``pool`` and ``serial`` handlers, created on first use."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = HandlerExecutor(self.max_workers, self.logger)
+        return self._executor
+
+    @property
+    def coalescer(self) -> Coalescer:
+        """The coalescer collecting the events of coalescing handlers, created on first use."""
+        if self._coalescer is None:
+            with self._lock:
+                if self._coalescer is None:
+                    self._coalescer = Coalescer(
+                        self._deliver_event, self._deliver_batch, self.logger
+                    )
+        return self._coalescer
 
     def register_handler(
         self,
@@ -32,6 +103,10 @@ class EventPipeline:
         event_types: Union[EventType, List[EventType]],
         path_pattern: Optional[str] = None,
         priority: int = 100,
+        batch: bool = False,
+        execution: Union[ExecutionPolicy, str] = ExecutionPolicy.INLINE,
+        max_pending: Optional[int] = None,
+        coalesce: Union[bool, float, None] = None,
         **kwargs,
     ) -> EventHandler:
         """Register a new event handler.
@@ -41,6 +116,26 @@ class EventPipeline:
             event_types: Type(s) of events this handler responds to
             path_pattern: Optional path pattern to filter events
             priority: Handler priority (lower number = higher priority)
+            batch: If True, call the handler once per commit with the list of matching
+                   changes (as ``changes``) instead of once per change event
+            execution: Where the handler runs (default: inline):
+
+                       - ``inline``: on the emitting thread, before the write returns
+                       - ``pool``: on the pipeline's thread pool. Calls for the same
+                         path run one at a time in emission order; batch calls run
+                         one at a time in commit order.
+                       - ``serial``: on a thread of its own, one call at a time in
+                         emission order
+            max_pending: Maximum number of queued and running calls of a ``pool`` or
+                         ``serial`` handler, None for no limit. Emitters beyond it
+                         wait, so the handler must not wait for the emitting thread.
+            coalesce: Seconds to collect the handler's events before delivering them,
+                      True to collect them until ``flush``, None to deliver every
+                      event (default). Events are collected per path, and delivered
+                      as one event per event type with the first old value and the
+                      last new value, in the order of the last event of each type.
+                      Batch handlers receive the collected commits as one batch with
+                      the net change of each path.
             **kwargs: Additional keyword arguments to pass to callback
 
         Returns:
@@ -53,16 +148,34 @@ class EventPipeline:
         else:
             event_types = set(event_types)
 
-        handler = EventHandler(callback, event_types, path_pattern, priority, **kwargs)
-        self.handlers.append(handler)
+        handler = EventHandler(
+            callback,
+            event_types,
+            path_pattern,
+            priority,
+            batch,
+            execution=execution,
+            max_pending=max_pending,
+            coalesce=coalesce,
+            **kwargs,
+        )
+        self._handlers.append(handler)
 
         # Sort handlers by priority
-        self.handlers.sort(key=lambda h: h.priority)
+        self._handlers.sort(key=lambda h: h.priority)
+        self._index = None
 
         self.logger.debug(
             f"Registered handler {callback.__name__} for "
             f"{[e.value for e in event_types]}"
             + (f" with path pattern '{path_pattern}'" if path_pattern else "")
+            + (" in batch mode" if batch else "")
+            + (
+                f" on the {handler.execution.value} executor"
+                if handler.execution is not ExecutionPolicy.INLINE
+                else ""
+            )
+            + (" with coalescing" if handler.coalesce is not None else "")
         )
 
         return handler
@@ -76,8 +189,9 @@ class EventPipeline:
         Returns:
             True if handler was found and removed
         """
-        if handler in self.handlers:
-            self.handlers.remove(handler)
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+            self._index = None
             self.logger.debug(f"Unregistered handler {handler.callback.__name__}")
             return True
         return False
@@ -102,32 +216,502 @@ class EventPipeline:
             ignore: If True, ignore this event
 
         Returns:
-            Number of handlers that processed the event
+            Number of handlers that processed the event, not counting coalescing handlers
         """
         if ignore:
             return 0
 
+        handlers = self._get_index().lookup(event_type, path)
+        if not handlers:
+            return 0
+
         context = EventContext(event_type, path, old_value, new_value, config_data)
         count = 0
 
-        for handler in self.handlers:
-            if handler.matches(context):
-                try:
-                    handler.handle_event(context)
-                    count += 1
-                except Exception as e:
-                    self.logger.error(
-                        f"Error in handler {handler.callback.__name__} for {event_type.value}: {e}"
-                    )
+        # The index only returns handlers that match the event
+        for handler in handlers:
+            if handler.coalesce is not None:
+                self.coalescer.add_event(handler, context)
+                continue
+            try:
+                self._deliver_event(handler, context)
+                count += 1
+            except Exception as e:
+                self.logger.error(
+                    f"Error in handler {handler.callback.__name__} for {event_type.value}: {e}"
+                )
 
         return count
 
+    def emit_batch(
+        self,
+        changes: List["ConfigChange"],
+        config_data: Optional[Dict[str, Any]] = None,
+        ignore: Optional[bool] = False,
+    ) -> int:
+        """Deliver a committed list of changes to batch handlers.
+
+        Each batch handler is called at most once, with the changes it would have
+        received as individual events: those matching its path pattern whose change
+        type, or CHANGE, is among its event types.
+
+        Args:
+            changes: The changes of one commit, in emission order
+            config_data: Complete updated configuration data
+            ignore: If True, ignore these changes
+
+        Returns:
+            Number of handlers that processed the batch, not counting coalescing handlers
+        """
+        if ignore or not changes:
+            return 0
+
+        count = 0
+        for handler, handler_changes in self._match_batch(changes):
+            if handler.coalesce is not None:
+                self.coalescer.add_batch(handler, handler_changes, config_data)
+                continue
+            try:
+                self._deliver_batch(handler, handler_changes, config_data)
+                count += 1
+            except Exception as e:
+                self.logger.error(f"Error in batch handler {handler.callback.__name__}: {e}")
+
+        return count
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Deliver the collected events of coalescing handlers, and wait for the calls
+        of ``pool`` and ``serial`` handlers to complete.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if no handler calls are still queued or running
+        """
+        if self._coalescer is not None:
+            self._coalescer.flush()
+        if self._executor is None:
+            return True
+        return self._executor.flush(timeout)
+
+    def close(self, wait: bool = True) -> None:
+        """Deliver the collected events of coalescing handlers, and stop the handler
+        threads once their queued calls have run.
+
+        The threads are started again if handlers are called afterwards.
+
+        Args:
+            wait: Wait for the queued calls to complete
+        """
+        with self._lock:
+            coalescer, self._coalescer = self._coalescer, None
+        if coalescer is not None:
+            coalescer.close()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait)
+
+    def _deliver_event(self, handler: EventHandler, context: EventContext) -> None:
+        """Call a handler with an event, queued on the executor unless it runs inline."""
+        if handler.execution is ExecutionPolicy.INLINE:
+            handler.handle_event(context)
+        else:
+            self.executor.submit(
+                handler, context.path, functools.partial(handler.handle_event, context)
+            )
+
+    def _deliver_batch(
+        self,
+        handler: EventHandler,
+        changes: List["ConfigChange"],
+        config_data: Optional[Dict[str, Any]],
+    ) -> None:
+        """Call a batch handler with changes, queued on the executor unless it runs inline."""
+        if handler.execution is ExecutionPolicy.INLINE:
+            handler.handle_batch(changes, config_data)
+        else:
+            call = functools.partial(handler.handle_batch, changes, config_data)
+            self.executor.submit(handler, None, call)
+
+    def _match_batch(
+        self, changes: List["ConfigChange"]
+    ) -> List[Tuple[EventHandler, List["ConfigChange"]]]:
+        """Get the batch handlers matching any of the changes, with their changes.
+
+        Returns:
+            Pairs of handler and matching changes, in handler priority order
+        """
+        index = self._get_index(batch=True)
+        matched: Dict[EventHandler, List["ConfigChange"]] = {}
+
+        for change in changes:
+            event_type = change.to_event_type()
+            handlers = index.lookup(event_type, change.path)
+            if event_type != EventType.CHANGE:
+                handlers += index.lookup(EventType.CHANGE, change.path)
+
+            for handler in handlers:
+                handler_changes = matched.setdefault(handler, [])
+                # A handler listening to both the specific type and CHANGE gets the change once
+                if not handler_changes or handler_changes[-1] is not change:
+                    handler_changes.append(change)
+
+        return [(handler, matched[handler]) for handler in self._handlers if handler in matched]
+
+
+class AsyncEventPipeline(EventPipeline):
+    """Event pipeline that runs async handlers on a long-lived event loop.
+
+    Sync handlers are called in priority order as they are matched. The coroutines
+    of the async handlers of one emit are started in priority order and gathered,
+    optionally with a limit on how many run at once:
+
+    - ``emit_async`` runs them on the caller's event loop.
+    - ``emit`` and ``emit_batch`` run them as a task on the running event loop if
+      there is one, and otherwise on a shared loop thread instead of a new event loop
+      per handler call. With ``wait``, sync callers block until the handlers finish.
+
+    Handlers that are still running are tracked, see ``pending``, ``join`` and
+    ``join_async``.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        max_concurrency: Optional[int] = None,
+        wait: bool = True,
+        loop_thread: Optional[EventLoopThread] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize the event pipeline.
+
+        Args:
+            logger: Optional logger for event logging
+            max_concurrency: Maximum number of async handlers running at once per
+                             event loop, None for no limit
+            wait: Wait for async handlers to finish before returning from a sync emit
+                  without a running event loop (default: True). Must be off if async
+                  handlers may wait for the emitting thread, e.g. to take a lock it
+                  holds while emitting.
+            loop_thread: Loop thread for sync callers, the shared one by default
+            max_workers: Size of the thread pool running ``pool`` handlers, the
+                         ThreadPoolExecutor default if None
+        """
+        super().__init__(logger, max_workers)
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.wait = wait
+        self._loop_thread = loop_thread
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._pending: Set[Union[asyncio.Future, concurrent.futures.Future]] = set()
+        self._pending_lock = threading.Lock()
+
+    @property
+    def loop_thread(self) -> EventLoopThread:
+        """The loop thread running async handlers for sync callers."""
+        return self._loop_thread or get_loop_thread()
+
+    @property
+    def pending(self) -> int:
+        """Number of emits whose async handlers are still running."""
+        return len(self._pending)
+
+    def emit(
+        self,
+        event_type: EventType,
+        path: Optional[str] = None,
+        old_value: Any = None,
+        new_value: Any = None,
+        config_data: Optional[Dict[str, Any]] = None,
+        ignore: Optional[bool] = False,
+    ) -> int:
+        """Emit an event to be processed by handlers.
+
+        Args:
+            event_type: Type of event, e.g., CHANGE, CREATE, DELETE
+            path: Configuration path that changed
+            old_value: Previous value
+            new_value: New value
+            config_data: Complete updated configuration data
+            ignore: If True, ignore this event
+
+        Returns:
+            Number of handlers that processed the event
+        """
+        calls = self._event_calls(event_type, path, old_value, new_value, config_data, ignore)
+        self._dispatch(calls)
+        return len(calls)
+
+    def emit_batch(
+        self,
+        changes: List["ConfigChange"],
+        config_data: Optional[Dict[str, Any]] = None,
+        ignore: Optional[bool] = False,
+    ) -> int:
+        """Deliver a committed list of changes to batch handlers.
+
+        Args:
+            changes: The changes of one commit, in emission order
+            config_data: Complete updated configuration data
+            ignore: If True, ignore these changes
+
+        Returns:
+            Number of handlers that processed the batch
+        """
+        calls = self._batch_calls(changes, config_data, ignore)
+        self._dispatch(calls)
+        return len(calls)
+
+    async def emit_async(
+        self,
+        event_type: EventType,
+        path: Optional[str] = None,
+        old_value: Any = None,
+        new_value: Any = None,
+        config_data: Optional[Dict[str, Any]] = None,
+        ignore: Optional[bool] = False,
+        wait: bool = True,
+    ) -> int:
+        """Emit an event on the running event loop.
+
+        Args:
+            event_type: Type of event, e.g., CHANGE, CREATE, DELETE
+            path: Configuration path that changed
+            old_value: Previous value
+            new_value: New value
+            config_data: Complete updated configuration data
+            ignore: If True, ignore this event
+            wait: Wait for the async handlers to finish (default: True)
+
+        Returns:
+            Number of handlers that processed the event
+        """
+        calls = self._event_calls(event_type, path, old_value, new_value, config_data, ignore)
+        await self._run_async(calls, wait)
+        return len(calls)
+
+    async def emit_batch_async(
+        self,
+        changes: List["ConfigChange"],
+        config_data: Optional[Dict[str, Any]] = None,
+        ignore: Optional[bool] = False,
+        wait: bool = True,
+    ) -> int:
+        """Deliver a committed list of changes to batch handlers on the running event loop.
+
+        Args:
+            changes: The changes of one commit, in emission order
+            config_data: Complete updated configuration data
+            ignore: If True, ignore these changes
+            wait: Wait for the async handlers to finish (default: True)
+
+        Returns:
+            Number of handlers that processed the batch
+        """
+        calls = self._batch_calls(changes, config_data, ignore)
+        await self._run_async(calls, wait)
+        return len(calls)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for async handlers running on the loop thread.
+
+        Handlers running as tasks on another event loop are awaited with
+        ``join_async`` on that loop instead.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if no handlers on the loop thread are still running
+        """
+        with self._pending_lock:
+            futures = [f for f in self._pending if isinstance(f, concurrent.futures.Future)]
+        _, not_done = concurrent.futures.wait(futures, timeout)
+        return not not_done
+
+    async def join_async(self) -> None:
+        """Wait for the async handlers running as tasks on the current event loop."""
+        loop = asyncio.get_running_loop()
+        with self._pending_lock:
+            tasks = [
+                t for t in self._pending if isinstance(t, asyncio.Future) and t.get_loop() is loop
+            ]
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Deliver the collected events of coalescing handlers, and wait for the calls
+        of ``pool`` and ``serial`` handlers and the async handlers running on the loop
+        thread to complete.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if none of these handlers are still queued or running
+        """
+        # Joined last, delivering the collected events may start async handlers
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not super().flush(timeout):
+            return False
+        return self.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def _event_calls(
+        self,
+        event_type: EventType,
+        path: Optional[str],
+        old_value: Any,
+        new_value: Any,
+        config_data: Optional[Dict[str, Any]],
+        ignore: Optional[bool],
+    ) -> List[Tuple[EventHandler, Dict[str, Any]]]:
+        if ignore:
+            return []
+        handlers = self._get_index().lookup(event_type, path)
+        if not handlers:
+            return []
+        context = EventContext(event_type, path, old_value, new_value, config_data)
+        calls = []
+        for handler in handlers:
+            if handler.coalesce is not None:
+                self.coalescer.add_event(handler, context)
+            else:
+                calls.append((handler, handler.event_kwargs(context)))
+        return calls
+
+    def _batch_calls(
+        self,
+        changes: List["ConfigChange"],
+        config_data: Optional[Dict[str, Any]],
+        ignore: Optional[bool],
+    ) -> List[Tuple[EventHandler, Dict[str, Any]]]:
+        if ignore or not changes:
+            return []
+        calls = []
+        for handler, handler_changes in self._match_batch(changes):
+            if handler.coalesce is not None:
+                self.coalescer.add_batch(handler, handler_changes, config_data)
+            else:
+                calls.append((handler, handler.batch_kwargs(handler_changes, config_data)))
+        return calls
+
+    def _deliver_event(self, handler: EventHandler, context: EventContext) -> None:
+        self._dispatch([(handler, handler.event_kwargs(context))])
+
+    def _deliver_batch(
+        self,
+        handler: EventHandler,
+        changes: List["ConfigChange"],
+        config_data: Optional[Dict[str, Any]],
+    ) -> None:
+        self._dispatch([(handler, handler.batch_kwargs(changes, config_data))])
+
+    def _dispatch(self, calls: List[Tuple[EventHandler, Dict[str, Any]]]) -> None:
+        """Call the handlers of a sync emit, scheduling the async ones."""
+        coroutines = self._call_sync(calls)
+        if coroutines:
+            self._schedule(self._gather(coroutines))
+
+    def _call_sync(
+        self, calls: List[Tuple[EventHandler, Dict[str, Any]]]
+    ) -> List[Tuple[EventHandler, Awaitable]]:
+        """Call the inline sync handlers, queue the offloaded ones and create the
+        coroutines of the async ones."""
+        coroutines = []
+        for handler, kwargs in calls:
+            if handler.execution is not ExecutionPolicy.INLINE:
+                # Batch calls have no path, they are ordered per handler
+                call = functools.partial(handler.callback, **kwargs)
+                self.executor.submit(handler, kwargs.get("path"), call)
+                continue
+            try:
+                result = handler.callback(**kwargs)
+            except Exception as e:
+                self._log_error(handler, e)
+                continue
+            if handler.is_async:
+                coroutines.append((handler, result))
+        return coroutines
+
+    async def _run_async(
+        self, calls: List[Tuple[EventHandler, Dict[str, Any]]], wait: bool
+    ) -> None:
+        coroutines = self._call_sync(calls)
+        if not coroutines:
+            return
+        if wait:
+            await self._gather(coroutines)
+        else:
+            self._track(asyncio.get_running_loop().create_task(self._gather(coroutines)))
+
+    def _schedule(self, coroutine: Awaitable) -> None:
+        """Run gathered handlers on the running event loop, or on the loop thread."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None:
+            self._track(loop.create_task(coroutine))
+            return
+
+        future = self.loop_thread.submit(coroutine)
+        self._track(future)
+        if self.wait:
+            future.result()
+
+    async def _gather(self, coroutines: List[Tuple[EventHandler, Awaitable]]) -> None:
+        semaphore = self._semaphore()
+        await asyncio.gather(*(self._run(handler, c, semaphore) for handler, c in coroutines))
+
+    async def _run(
+        self, handler: EventHandler, coroutine: Awaitable, semaphore: Optional[asyncio.Semaphore]
+    ) -> None:
+        try:
+            if semaphore is None:
+                await coroutine
+            else:
+                async with semaphore:
+                    await coroutine
+        except Exception as e:
+            self._log_error(handler, e)
+
+    def _semaphore(self) -> Optional[asyncio.Semaphore]:
+        """Get the concurrency limit of the running event loop."""
+        if self.max_concurrency is None:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _track(self, future: Union[asyncio.Future, concurrent.futures.Future]) -> None:
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._untrack)
+
+    def _untrack(self, future: Union[asyncio.Future, concurrent.futures.Future]) -> None:
+        with self._pending_lock:
+            self._pending.discard(future)
+
+    def _log_error(self, handler: EventHandler, error: Exception) -> None:
+        self.logger.error(f"Error in event handler {handler.callback.__name__}: {error}")
+        self.logger.debug("".join(traceback.format_exception(error)))
+
 
 def on_event(
     event_pipeline: EventPipeline,
     event_type: Union[EventType, List[EventType]],
     path_pattern: Optional[str] = None,
     priority: int = 100,
+    batch: bool = False,
+    execution: Union[ExecutionPolicy, str] = ExecutionPolicy.INLINE,
+    max_pending: Optional[int] = None,
+    coalesce: Union[bool, float, None] = None,
 ):
     """Decorator to register a function as an event handler.
 
@@ -142,19 +726,41 @@ def on_event(
         event_type: Type(s) of events to handle
         path_pattern: Optional path pattern to filter events
         priority: Handler priority (lower number = higher priority)
+        batch: If True, receive all matching changes of a commit in one call
+        execution: Where the handler runs: ``inline``, ``pool`` or ``serial``
+        max_pending: Maximum number of queued and running calls of an offloaded handler
+        coalesce: Seconds to collect events per path before delivering them as one per
+                  event type, True to collect them until the pipeline is flushed
 
     Returns:
         Decorator function
     """
 
     def decorator(func):
-        event_pipeline.register_handler(func, event_type, path_pattern, priority)
+        event_pipeline.register_handler(
+            func,
+            event_type,
+            path_pattern,
+            priority,
+            batch,
+            execution=execution,
+            max_pending=max_pending,
+            coalesce=coalesce,
+        )
         return func
 
     return decorator
 
 
-def on_change(event_pipeline: EventPipeline, path_pattern: str, priority: int = 100):
+def on_change(
+    event_pipeline: EventPipeline,
+    path_pattern: str,
+    priority: int = 100,
+    batch: bool = False,
+    execution: Union[ExecutionPolicy, str] = ExecutionPolicy.INLINE,
+    max_pending: Optional[int] = None,
+    coalesce: Union[bool, float, None] = None,
+):
     """Decorator to register a function as a change event handler.
 
     Example:
@@ -167,8 +773,22 @@ def on_change(event_pipeline: EventPipeline, path_pattern: str, priority: int =
         event_pipeline: The event pipeline to register with
         path_pattern: Path pattern to filter events
         priority: Handler priority (lower number = higher priority)
+        batch: If True, receive all matching changes of a commit in one call
+        execution: Where the handler runs: ``inline``, ``pool`` or ``serial``
+        max_pending: Maximum number of queued and running calls of an offloaded handler
+        coalesce: Seconds to collect events per path before delivering them as one per
+                  event type, True to collect them until the pipeline is flushed
 
     Returns:
         Decorator function
     """
-    return on_event(event_pipeline, EventType.CHANGE, path_pattern, priority)
+    return on_event(
+        event_pipeline,
+        EventType.CHANGE,
+        path_pattern,
+        priority,
+        batch,
+        execution,
+        max_pending,
+        coalesce,
+    )
@@ -1,7 +1,14 @@
 import copy
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
-
-from ..utils.helper import deep_merge, get_nested_value, set_nested_value
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from ..core.persistent import MISSING, PersistentMap, delete_in, freeze, merge_in, set_in, thaw
+from ..utils.helper import (
+    CompiledPath,
+    deep_merge,
+    delete_nested_value,
+    get_nested_value,
+    set_nested_value,
+)
 from .changes import ChangeTracker, ConfigChange, emit_change_events
 
 if TYPE_CHECKING:
@@ -21,10 +28,17 @@ class TransactionManager:
         """
         self.config = config
         self.old_data = self.config.data
-        self.transaction_data = copy.deepcopy(self.config.data)
+
+        # A persistent tree is its own snapshot: writes build a new tree and the
+        # committed one stays untouched, so the deep copy is only needed for dicts
+        self.persistent = isinstance(self.old_data, PersistentMap)
+        if self.persistent:
+            self.transaction_data = self.old_data
+        else:
+            self.transaction_data = copy.deepcopy(self.config.data)
         self.changes = []
 
-    def get(self, key: Optional[str] = None, default: Any = None) -> Any:
+    def get(self, key: Optional[Union[str, CompiledPath]] = None, default: Any = None) -> Any:
         """Get configuration value from the transaction state.
 
         Args:
@@ -36,10 +50,14 @@ class TransactionManager:
         """
 
         if key is None:
-            return self.transaction_data
-        return get_nested_value(self.transaction_data, key, default)
+            return thaw(self.transaction_data) if self.persistent else self.transaction_data
+        if not self.persistent:
+            return get_nested_value(self.transaction_data, key, default)
 
-    def set(self, key: str, value: Any) -> None:
+        value = get_nested_value(self.transaction_data, key, MISSING)
+        return default if value is MISSING else thaw(value)
+
+    def set(self, key: Union[str, CompiledPath], value: Any) -> None:
         """Set configuration value in the transaction.
 
         Args:
@@ -47,9 +65,12 @@ class TransactionManager:
             value: Value to set
         """
 
-        set_nested_value(self.transaction_data, key, value)
+        if self.persistent:
+            self.transaction_data, _ = set_in(self.transaction_data, key, value)
+        else:
+            set_nested_value(self.transaction_data, key, value)
 
-    def delete(self, key: str) -> bool:
+    def delete(self, key: Union[str, CompiledPath]) -> bool:
         """Delete configuration value in the transaction.
 
         Args:
@@ -58,20 +79,11 @@ class TransactionManager:
         Returns:
             True if successful
         """
-        parts = key.split(".")
-        data_ptr = self.transaction_data
-
-        # Navigate to the parent of the target key
-        for part in parts[:-1]:
-            if not isinstance(data_ptr, dict) or part not in data_ptr:
-                return False
-            data_ptr = data_ptr[part]
-
-        # Delete the key
-        if isinstance(data_ptr, dict) and parts[-1] in data_ptr:
-            del data_ptr[parts[-1]]
-            return True
-        return False
+        if self.persistent:
+            self.transaction_data, success, _ = delete_in(self.transaction_data, key)
+        else:
+            success, _ = delete_nested_value(self.transaction_data, key)
+        return success
 
     def update(self, data: Dict[str, Any]) -> None:
         """Update multiple configuration values in the transaction.
@@ -80,7 +92,10 @@ class TransactionManager:
             data: Dictionary of values to update
         """
 
-        deep_merge(source=data, destination=self.transaction_data, in_place=True)
+        if self.persistent:
+            self.transaction_data = merge_in(self.transaction_data, data)
+        else:
+            deep_merge(source=data, destination=self.transaction_data, in_place=True)
 
     def replace(self, data: Dict[str, Any]) -> None:
         """Replace entire configuration in the transaction.
@@ -88,7 +103,10 @@ class TransactionManager:
         Args:
             data: New configuration data
         """
-        self.transaction_data = copy.deepcopy(data)
+        if self.persistent:
+            self.transaction_data = freeze(data)
+        else:
+            self.transaction_data = copy.deepcopy(data)
 
     def commit(self) -> List[ConfigChange]:
         """Commit the transaction to the configuration manager.
@@ -97,6 +115,15 @@ class TransactionManager:
             List of changes applied
         """
 
+        lock = getattr(self.config, "_write_lock", None)
+        if lock is None:
+            return self._apply()
+
+        with lock:
+            return self._apply()
+
+    def _apply(self) -> List[ConfigChange]:
+        """Publish the transaction data and emit its changes."""
         # Detect changes between old and new config
         changes = ChangeTracker.detect_changes(self.old_data, self.transaction_data)
 
@@ -5,21 +5,31 @@ with real-time updates and intuitive APIs.
 """
 
 import asyncio
+import functools
+import gzip
 import importlib.resources
 import json
 import re
+import secrets
+import time
 from contextlib import asynccontextmanager
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Union
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import FileResponse, HTMLResponse, Response
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from nekoconf._version import __version__
 from nekoconf.core.config import NekoConf
+from nekoconf.core.persistent import thaw
+from nekoconf.event.patch import changes_to_patch
 from nekoconf.server.auth import AuthMiddleware, NekoAuthGuard
+from nekoconf.server.compression import GZipRequestMiddleware
+from nekoconf.server.fanout import Fanout, SlowConsumerPolicy
 from nekoconf.utils.helper import getLogger, load_string
 
 if TYPE_CHECKING:
@@ -40,6 +50,9 @@ SUPPORTED_FORMATS: Set[str] = {"json", "yaml", "toml"}
 # Valid types for configuration values
 VALID_TYPES: Set[str] = {"str", "int", "float", "bool", "list", "dict"}
 
+# Minimum response size in bytes worth compressing
+GZIP_MIN_SIZE = 1024
+
 
 class ConfigRequest(BaseModel):
     """Request model for configuration operations."""
@@ -121,8 +134,59 @@ class AppUpdateMetadataRequest(BaseModel):
         return v
 
 
+def _message_type(text: str) -> Optional[str]:
+    """Get the type of a JSON message from a client, if it has one."""
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return None
+    return message.get("type") if isinstance(message, dict) else None
+
+
+class ConfigPayload:
+    """The serialized configuration of one app version, shared by all clients.
+
+    The encoded and gzip-compressed bodies are produced on first use.
+    """
+
+    __slots__ = ("version", "etag", "text", "_body", "_gzipped")
+
+    def __init__(self, version: int, etag: Optional[str], text: str):
+        self.version = version
+        self.etag = etag
+        self.text = text
+        self._body: Optional[bytes] = None
+        self._gzipped: Optional[bytes] = None
+
+    @property
+    def body(self) -> bytes:
+        """The configuration as UTF-8 encoded JSON."""
+        if self._body is None:
+            self._body = self.text.encode("utf-8")
+        return self._body
+
+    @property
+    def gzipped(self) -> bytes:
+        """The gzip-compressed JSON body."""
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=9, mtime=0)
+        return self._gzipped
+
+
 class ConfigApp:
-    """Represents a single configuration app with its associated resources."""
+    """Represents a single configuration app with its associated resources.
+
+    Every committed change bumps the app's version. WebSocket clients that opted in
+    to deltas receive it as a patch of the changed paths, tagged with the version it
+    applies to; other clients receive the full configuration.
+
+    The version also serves as the entity tag of the configuration, so clients can
+    revalidate a cached copy instead of downloading it again. A random per-instance
+    token keeps tags of a recreated app or restarted server from matching old ones.
+
+    The configuration is serialized once per version and the payload reused for
+    every response and WebSocket message until the next change.
+    """
 
     def __init__(
         self,
@@ -130,13 +194,26 @@ class ConfigApp:
         config: NekoConf,
         description: Optional[str] = None,
         logger: Optional["Logger"] = None,
+        ws_options: Optional[Dict[str, Any]] = None,
     ):
+        """Initialize the app.
+
+        Args:
+            name: Name of the app
+            config: The app's configuration
+            description: Optional app description
+            logger: Optional logger instance
+            ws_options: Keyword arguments for the app's ``WebSocketManager``
+        """
         self.name = name
         self.description = description
         self.config = config
         self.logger = logger or getLogger(__name__)
         self.last_modified = None
-        self.ws_manager = WebSocketManager(name, self.logger)
+        self.version = 0
+        self._etag_token = secrets.token_hex(4)
+        self._payload: Optional[ConfigPayload] = None
+        self.ws_manager = WebSocketManager(name, self.logger, **(ws_options or {}))
         self._setup_event_handlers()
 
     def _setup_event_handlers(self) -> None:
@@ -150,16 +227,95 @@ class ConfigApp:
         self.config.event_pipeline.register_handler(
             self._on_config_change,
             event_types=[EventType.CHANGE],
-            path_pattern="@global",
+            path_pattern="*",
             priority=100,
+            batch=True,
         )
 
-    async def _on_config_change(
-        self,
-        **kwargs,
-    ) -> None:
-        """Handle configuration changes and notify WebSocket clients."""
-        await self.ws_manager.broadcast({"type": "update", "data": self.config.get_all()})
+    def _on_config_change(self, changes: List[Any], config_data: Dict[str, Any], **kwargs) -> None:
+        """Handle a committed configuration change and notify WebSocket clients.
+
+        Messages are encoded right away, as later changes may modify the data.
+        """
+        started = time.perf_counter()
+        self.version += 1
+        manager = self.ws_manager
+        if not manager.connections:
+            return
+
+        try:
+            ops = changes_to_patch(changes, config_data)
+            patch_message = full_message = None
+            if ops is not None and manager.delta_connections:
+                patch_message = _dumps(
+                    {
+                        "type": "patch",
+                        "version": self.version,
+                        "base": self.version - 1,
+                        "etag": self.etag,
+                        "ops": ops,
+                    }
+                )
+            if ops is None or len(manager.delta_connections) < len(manager.connections):
+                full_message = self.full_message("update", config_data)
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Cannot encode configuration update for '{self.name}': {e}")
+            return
+
+        snapshot = functools.partial(self.full_message, "update")
+        _run_on_loop(
+            manager.broadcast_update(patch_message, full_message, snapshot, started), manager.loop
+        )
+
+    @property
+    def etag(self) -> Optional[str]:
+        """Entity tag of the current configuration version.
+
+        Without events, changes cannot be counted, so the configuration has no tag.
+        """
+        return self._etag(self.version)
+
+    def _etag(self, version: int) -> Optional[str]:
+        if self.config.event_disabled:
+            return None
+        return f'"{self._etag_token}-{version}"'
+
+    def payload(self, config_data: Optional[Dict[str, Any]] = None) -> ConfigPayload:
+        """Get the serialized configuration of the current version.
+
+        The version is taken before the data, so a payload never claims a newer
+        version than its data. Without events, changes cannot be counted, and the
+        configuration is serialized on every call.
+
+        Args:
+            config_data: The configuration data of the current version, if known
+
+        Returns:
+            The cached payload, or a new one if the configuration changed
+        """
+        version = self.version
+        payload = self._payload
+        if payload is not None and payload.version == version and not self.config.event_disabled:
+            return payload
+
+        data = self.config.get_all() if config_data is None else config_data
+        payload = ConfigPayload(version, self._etag(version), _dumps(thaw(data)))
+        if not self.config.event_disabled:
+            self._payload = payload
+        return payload
+
+    def full_message(self, message_type: str, config_data: Optional[Dict[str, Any]] = None) -> str:
+        """Encode the full configuration as a WebSocket message of the current version."""
+        payload = self.payload(config_data)
+        header = _dumps({"type": message_type, "version": payload.version, "etag": payload.etag})
+        return f'{header[:-1]},"data":{payload.text}}}'
+
+    def unchanged_message(self, etag: Optional[str]) -> Optional[str]:
+        """Encode a WebSocket message confirming a client's copy, if etag is current."""
+        version = self.version
+        if etag is None or etag != self._etag(version):
+            return None
+        return _dumps({"type": "unchanged", "version": version, "etag": etag})
 
     def cleanup(self) -> None:
         """Clean up app resources."""
@@ -176,27 +332,109 @@ class ConfigApp:
             "last_modified": self.last_modified,
             "status": "active",
             "connections": len(self.ws_manager.connections),
+            "fanout": self.ws_manager.stats,
         }
 
 
+def _run_on_loop(coroutine, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Run a coroutine on the current event loop, or on loop from another thread.
+
+    Changes can be committed outside the event loop, e.g. by a watched file.
+    """
+    try:
+        asyncio.get_running_loop().create_task(coroutine)
+        return
+    except RuntimeError:
+        pass
+
+    if isinstance(loop, asyncio.AbstractEventLoop) and loop.is_running():
+        asyncio.run_coroutine_threadsafe(coroutine, loop)
+    else:
+        coroutine.close()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Check an ``If-None-Match`` header against the current entity tag."""
+    if not if_none_match or etag is None:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _dumps(message: Any) -> str:
+    """Encode a WebSocket message or response body the way ``send_json`` does.
+
+    Values JSON does not support, such as dates, are converted like FastAPI responses.
+    """
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=jsonable_encoder)
+
+
 class WebSocketManager:
-    """Elegant WebSocket connection manager for real-time updates."""
+    """Elegant WebSocket connection manager for real-time updates.
+
+    Messages are fanned out through a bounded send queue and writer task per
+    connection, so slow clients do not delay the others. See ``Fanout`` for the
+    slow-consumer policies.
+    """
 
-    def __init__(self, app_name: str, logger: Optional["Logger"] = None):
+    def __init__(
+        self,
+        app_name: str,
+        logger: Optional["Logger"] = None,
+        queue_size: int = 64,
+        slow_consumer_policy: Union[SlowConsumerPolicy, str] = SlowConsumerPolicy.COALESCE,
+        send_timeout: Optional[float] = 10.0,
+    ):
+        """Initialize the WebSocket manager.
+
+        Args:
+            app_name: Name of the app the connections belong to
+            logger: Optional logger instance
+            queue_size: Maximum number of queued messages per connection (default: 64)
+            slow_consumer_policy: What to do with connections whose queue is full:
+                                  "drop", "coalesce" or "disconnect" (default: "coalesce")
+            send_timeout: Seconds a single send may take before the connection is
+                          dropped, None to wait indefinitely (default: 10.0)
+        """
         self.app_name = app_name
         self.logger = logger or getLogger(__name__)
         self.connections: List[WebSocket] = []
+        # Connections that receive patches rather than the full configuration
+        self.delta_connections: Set[WebSocket] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.fanout = Fanout(
+            queue_size, SlowConsumerPolicy(slow_consumer_policy), send_timeout, self._send_failed
+        )
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Fan-out statistics of this app."""
+        return self.fanout.stats.to_dict()
+
+    async def connect(self, websocket: WebSocket, delta: bool = False) -> None:
+        """Accept and register a new WebSocket connection.
 
-    async def connect(self, websocket: WebSocket) -> None:
-        """Accept and register a new WebSocket connection."""
+        Args:
+            websocket: The connection
+            delta: Send this connection patches instead of the full configuration
+        """
         await websocket.accept()
+        self.loop = asyncio.get_running_loop()
         self.connections.append(websocket)
+        if delta:
+            self.delta_connections.add(websocket)
+        self.fanout.add(websocket)
         self.logger.debug(
             f"WebSocket connected to '{self.app_name}' ({len(self.connections)} total)"
         )
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection."""
+        self.fanout.remove(websocket)
+        self.delta_connections.discard(websocket)
         if websocket in self.connections:
             self.connections.remove(websocket)
             self.logger.debug(
@@ -205,38 +443,72 @@ class WebSocketManager:
             )
 
     async def broadcast(self, message: Dict[str, Any]) -> None:
-        """Broadcast message to all connected clients."""
+        """Queue a message for all connected clients, encoded once for all of them."""
         if not self.connections:
             return
 
-        failed_connections = []
-        for websocket in self.connections[:]:  # Create a copy to iterate safely
-            try:
-                self.logger.debug(f"Broadcasting message to WebSocket ({websocket.client})")
-                await websocket.send_json(message)
-            except Exception as e:
-                self.logger.warning(f"Failed to send to WebSocket: {e}")
-                failed_connections.append(websocket)
+        text = _dumps(message)
+        self.fanout.publish(self.connections[:], lambda websocket: text)
 
-        # Clean up failed connections
-        for websocket in failed_connections:
-            self.disconnect(websocket)
+    async def broadcast_update(
+        self,
+        patch_message: Optional[str],
+        full_message: Optional[str],
+        snapshot: Optional[Callable[[], str]] = None,
+        started: Optional[float] = None,
+    ) -> None:
+        """Queue an encoded configuration update for all connected clients.
+
+        Updates are queued in the order they are scheduled, so every client receives
+        the versions in sequence.
+
+        Args:
+            patch_message: Message for delta connections, None to send them the full one
+            full_message: Message for the other connections
+            snapshot: Returns the latest full configuration message, sent to slow
+                      consumers instead of their queued updates
+            started: ``time.perf_counter()`` value of the change, for latency statistics
+        """
+        delta_connections = self.delta_connections
+
+        def message_for(websocket: WebSocket) -> Optional[str]:
+            message = patch_message if websocket in delta_connections else None
+            return message or full_message
+
+        self.fanout.publish(self.connections[:], message_for, snapshot, started)
+
+    async def send(self, websocket: WebSocket, message: str) -> None:
+        """Queue an encoded message for one client, in order with broadcast updates."""
+        self.fanout.send(websocket, message)
+
+    async def join(self) -> None:
+        """Wait until all queued messages have been sent."""
+        await self.fanout.join()
+
+    def _send_failed(self, websocket: WebSocket, error: Exception) -> None:
+        self.logger.warning(f"Dropping WebSocket client of '{self.app_name}': {error}")
+        self.disconnect(websocket)
 
     def cleanup(self) -> None:
         """Close all connections gracefully."""
+        self.fanout.close()
         for websocket in self.connections[:]:
             try:
                 asyncio.create_task(websocket.close())
             except Exception:
                 pass
         self.connections.clear()
+        self.delta_connections.clear()
 
 
 class AppManager:
     """Elegant manager for multiple NekoConf app instances."""
 
-    def __init__(self, logger: Optional["Logger"] = None):
+    def __init__(
+        self, logger: Optional["Logger"] = None, ws_options: Optional[Dict[str, Any]] = None
+    ):
         self.logger = logger or getLogger(__name__)
+        self.ws_options = ws_options or {}
         self.apps: Dict[str, ConfigApp] = {}
 
     def create_app(
@@ -257,7 +529,7 @@ class AppManager:
             default = self._get_default_data()
             config = NekoConf(default, event_emission_enabled=True)
 
-        app = ConfigApp(name, config, description, self.logger)
+        app = ConfigApp(name, config, description, self.logger, self.ws_options)
         self.apps[name] = app
 
         self.logger.info(f"Created app: {name}")
@@ -368,6 +640,9 @@ class NekoConfOrchestrator:
         api_key: Optional[str] = None,
         read_only: bool = False,
         logger: Optional["Logger"] = None,
+        ws_queue_size: int = 64,
+        slow_consumer_policy: Union[SlowConsumerPolicy, str] = SlowConsumerPolicy.COALESCE,
+        ws_send_timeout: Optional[float] = 10.0,
     ):
         """Initialize the configuration orchestrator.
 
@@ -376,12 +651,25 @@ class NekoConfOrchestrator:
             api_key: Optional API key for authentication
             read_only: If True, disables write operations
             logger: Optional logger instance
+            ws_queue_size: Maximum number of queued messages per WebSocket client
+            slow_consumer_policy: What to do with WebSocket clients whose queue is full:
+                                  "drop" new messages, "coalesce" the queue into the
+                                  latest configuration, or "disconnect" the client
+            ws_send_timeout: Seconds a single WebSocket send may take before the client
+                             is dropped, None to wait indefinitely
         """
         self.read_only = read_only
         self.logger = logger or getLogger(__name__)
 
         # Initialize components
-        self.manager = AppManager(self.logger)
+        self.manager = AppManager(
+            self.logger,
+            ws_options={
+                "queue_size": ws_queue_size,
+                "slow_consumer_policy": SlowConsumerPolicy(slow_consumer_policy),
+                "send_timeout": ws_send_timeout,
+            },
+        )
         self.auth = NekoAuthGuard(api_key=api_key) if api_key else None
 
         # Add initial apps if provided
@@ -421,6 +709,10 @@ class NekoConfOrchestrator:
 
     def _setup_middleware(self) -> None:
         """Setup middleware for the FastAPI application."""
+        # Compressed request and response bodies
+        self.app.add_middleware(GZipRequestMiddleware)
+        self.app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+
         # CORS middleware
         self.app.add_middleware(
             CORSMiddleware,
@@ -577,10 +869,16 @@ class NekoConfOrchestrator:
         """Setup configuration management routes."""
 
         @self.app.get("/api/apps/{app_name}/config")
-        async def get_app_config(app_name: str):
-            """Get configuration for a specific app."""
+        async def get_app_config(app_name: str, request: Request):
+            """Get configuration for a specific app.
+
+            Responds with 304 Not Modified when ``If-None-Match`` holds the current ETag.
+            """
             app = self._get_app_or_404(app_name)
-            return app.config.get_all()
+            etag = app.etag
+            if _etag_matches(request.headers.get("if-none-match"), etag):
+                return self._not_modified(etag)
+            return self._payload_response(request, app.payload())
 
         @self.app.put("/api/apps/{app_name}/config")
         async def update_app_config(app_name: str, request: ConfigRequest):
@@ -605,9 +903,13 @@ class NekoConfOrchestrator:
                 )
 
         @self.app.get("/api/apps/{app_name}/config/{path:path}")
-        async def get_config_path(app_name: str, path: str):
+        async def get_config_path(app_name: str, path: str, request: Request, response: Response):
             """Get a specific configuration path."""
             app = self._get_app_or_404(app_name)
+            etag = app.etag
+            if _etag_matches(request.headers.get("if-none-match"), etag):
+                return self._not_modified(etag)
+            self._set_etag(response, etag)
 
             try:
                 value = app.config.get(path, "DOES_NOT_EXIST")
@@ -710,10 +1012,12 @@ class NekoConfOrchestrator:
                 return
 
             try:
-                await app.ws_manager.connect(websocket)
+                delta = websocket.query_params.get("protocol") == "delta"
+                await app.ws_manager.connect(websocket, delta=delta)
 
-                # Send initial configuration
-                await websocket.send_json({"type": "initial_config", "data": app.config.get_all()})
+                # Send initial configuration, unless the client's copy is current
+                message = app.unchanged_message(websocket.query_params.get("since"))
+                await app.ws_manager.send(websocket, message or app.full_message("initial_config"))
 
                 # Keep connection alive and handle incoming messages
                 while True:
@@ -723,6 +1027,10 @@ class NekoConfOrchestrator:
                     except WebSocketDisconnect:
                         break
 
+                    # Clients that missed a version ask for the full configuration
+                    if _message_type(data) == "resync":
+                        await app.ws_manager.send(websocket, app.full_message("update"))
+
             except Exception as e:
                 self.logger.error(f"WebSocket error for {app_name}: {e}")
             finally:
@@ -779,6 +1087,34 @@ class NekoConfOrchestrator:
             )
         return app
 
+    @staticmethod
+    def _set_etag(response: Response, etag: Optional[str]) -> None:
+        """Tag a configuration response and ask clients to revalidate it before reuse."""
+        if etag is not None:
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
+
+    @staticmethod
+    def _payload_response(request: Request, payload: ConfigPayload) -> Response:
+        """Respond with a cached configuration payload, pre-compressed if accepted."""
+        headers = {}
+        if payload.etag is not None:
+            headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+
+        body = payload.body
+        if len(body) >= GZIP_MIN_SIZE and "gzip" in request.headers.get("accept-encoding", ""):
+            body = payload.gzipped
+            headers.update({"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+        return Response(body, media_type="application/json", headers=headers)
+
+    @staticmethod
+    def _not_modified(etag: str) -> Response:
+        """Response for a client whose cached configuration is current."""
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": "no-cache"},
+        )
+
     def _parse_config_data(self, data: str, format: str) -> Dict[str, Any]:
         """Parse configuration data from string."""
         try:
@@ -0,0 +1,84 @@
+"""
+Request body compression support for the NekoConf orchestrator.
+"""
+
+import zlib
+
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bound on decompressed request bodies, against compression bombs
+MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+
+
+class GZipRequestMiddleware:
+    """ASGI middleware decompressing request bodies sent with ``Content-Encoding: gzip``.
+
+    Other requests are passed through untouched. Corrupt bodies are rejected with
+    400, and bodies decompressing to more than ``max_size`` bytes with 413. Response
+    compression is handled separately by Starlette's ``GZipMiddleware``.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int = MAX_DECOMPRESSED_SIZE):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._is_gzip(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Decompressed as it arrives, so neither form of the body is held beyond the limit
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        body = bytearray()
+        status = None
+        while True:
+            message = await receive()
+            try:
+                # One byte over the limit tells an oversized body from one that fits
+                body += decompressor.decompress(
+                    message.get("body", b""), self.max_size - len(body) + 1
+                )
+            except zlib.error:
+                status = 400
+                break
+            if len(body) > self.max_size:
+                status = 413
+                break
+            if not message.get("more_body", False):
+                if not decompressor.eof:
+                    status = 400
+                break
+
+        if status is not None:
+            detail = "Invalid gzip request body" if status == 400 else "Request body too large"
+            response = PlainTextResponse(detail, status)
+            await response(scope, receive, send)
+            return
+        body = bytes(body)
+
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        scope = dict(scope, headers=headers)
+
+        sent = False
+
+        async def receive_body() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, receive_body, send)
+
+    @staticmethod
+    def _is_gzip(scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"content-encoding":
+                return value.strip().lower() == b"gzip"
+        return False
@@ -0,0 +1,290 @@
+"""
+Bounded WebSocket fan-out for the NekoConf orchestrator.
+
+Every connection gets a bounded queue of encoded messages and a writer task that
+sends them, so publishing a message only enqueues it and a slow client delays
+nobody but itself. When a client's queue is full, a slow-consumer policy decides
+what happens to it.
+"""
+
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple
+
+from starlette.websockets import WebSocket
+
+# WebSocket close code asking clients to reconnect later
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class SlowConsumerPolicy(Enum):
+    """What to do with a client whose send queue is full."""
+
+    DROP = "drop"  # Drop the new message
+    COALESCE = "coalesce"  # Replace the queued messages with the latest snapshot
+    DISCONNECT = "disconnect"  # Close the connection, the client reconnects
+
+
+class FanoutStats:
+    """Counters and latencies of an app's fan-out.
+
+    The latency of a broadcast is the time from its publication until the last
+    client has been sent the message, or skipped it.
+    """
+
+    def __init__(self):
+        self.broadcasts = 0
+        self.messages_sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.disconnected = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a completed broadcast."""
+        self.broadcasts += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self._total_latency += latency
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the statistics, with latencies in milliseconds."""
+        average = self._total_latency / self.broadcasts if self.broadcasts else 0.0
+        return {
+            "broadcasts": self.broadcasts,
+            "messages_sent": self.messages_sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "disconnected": self.disconnected,
+            "last_latency_ms": round(self.last_latency * 1000, 3),
+            "avg_latency_ms": round(average * 1000, 3),
+            "max_latency_ms": round(self.max_latency * 1000, 3),
+        }
+
+
+class _Broadcast:
+    """Tracks the clients a published message is still pending for."""
+
+    __slots__ = ("started", "pending", "stats")
+
+    def __init__(self, started: float, stats: FanoutStats):
+        self.started = started
+        self.pending = 1  # Held by the publisher until all clients are queued
+        self.stats = stats
+
+    def done(self) -> None:
+        self.pending -= 1
+        if self.pending == 0:
+            self.stats.record(time.perf_counter() - self.started)
+
+
+class Channel:
+    """The send queue and writer task of one WebSocket connection.
+
+    Must be created and used on the event loop serving the connection.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        send_timeout: Optional[float],
+        stats: FanoutStats,
+        on_failure: Callable[["Channel", Exception], None],
+    ):
+        self.websocket = websocket
+        self.send_timeout = send_timeout
+        self._stats = stats
+        self._on_failure = on_failure
+        self._queue: Deque[Tuple[str, Optional[_Broadcast]]] = deque()
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = asyncio.get_running_loop().create_task(self._write())
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, message: str, broadcast: Optional[_Broadcast] = None) -> None:
+        """Queue an encoded message for sending."""
+        if broadcast is not None:
+            broadcast.pending += 1
+        self._queue.append((message, broadcast))
+        self._idle.clear()
+        self._ready.set()
+
+    def clear(self) -> int:
+        """Discard the queued messages.
+
+        Returns:
+            The number of discarded messages
+        """
+        count = len(self._queue)
+        while self._queue:
+            _, broadcast = self._queue.popleft()
+            if broadcast is not None:
+                broadcast.done()
+        return count
+
+    async def wait_idle(self) -> None:
+        """Wait until all queued messages have been sent."""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Stop the writer and discard the queued messages."""
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+        self.clear()
+        self._idle.set()
+
+    async def _write(self) -> None:
+        while True:
+            if not self._queue:
+                self._idle.set()
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            message, broadcast = self._queue.popleft()
+            try:
+                if self.send_timeout is None:
+                    await self.websocket.send_text(message)
+                else:
+                    await asyncio.wait_for(self.websocket.send_text(message), self.send_timeout)
+            except Exception as e:
+                if broadcast is not None:
+                    broadcast.done()
+                self._on_failure(self, e)
+                return
+
+            self._stats.messages_sent += 1
+            if broadcast is not None:
+                broadcast.done()
+
+
+class Fanout:
+    """Publishes encoded messages to a set of WebSocket connections.
+
+    Messages are queued per connection and sent by the connection's writer task.
+    Queues hold at most ``queue_size`` published messages; messages sent directly
+    to one client with ``send`` are never dropped.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 64,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.COALESCE,
+        send_timeout: Optional[float] = 10.0,
+        on_failure: Optional[Callable[[WebSocket, Exception], None]] = None,
+    ):
+        """Initialize the fan-out.
+
+        Args:
+            queue_size: Maximum number of queued messages per connection
+            policy: What to do with connections whose queue is full
+            send_timeout: Seconds a single send may take before the connection is
+                          dropped, None to wait indefinitely
+            on_failure: Called with connections whose send failed or timed out, or
+                        that were disconnected as slow consumers
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        self.queue_size = queue_size
+        self.policy = SlowConsumerPolicy(policy)
+        self.send_timeout = send_timeout
+        self.stats = FanoutStats()
+        self._on_failure = on_failure
+        self._channels: Dict[WebSocket, Channel] = {}
+
+    def add(self, websocket: WebSocket) -> None:
+        """Start a writer for a connection."""
+        if websocket not in self._channels:
+            self._channels[websocket] = Channel(
+                websocket, self.send_timeout, self.stats, self._channel_failed
+            )
+
+    def remove(self, websocket: WebSocket) -> None:
+        """Stop the writer of a connection and discard its queued messages."""
+        channel = self._channels.pop(websocket, None)
+        if channel is not None:
+            channel.close()
+
+    def send(self, websocket: WebSocket, message: str) -> None:
+        """Queue a message for one connection, after the messages already queued."""
+        channel = self._channels.get(websocket)
+        if channel is not None:
+            channel.put(message)
+
+    def publish(
+        self,
+        websockets: Iterable[WebSocket],
+        message_for: Callable[[WebSocket], Optional[str]],
+        snapshot: Optional[Callable[[], str]] = None,
+        started: Optional[float] = None,
+    ) -> None:
+        """Queue a message for each connection.
+
+        Args:
+            websockets: The connections to publish to
+            message_for: Returns the encoded message for a connection, or None to skip it
+            snapshot: Returns the latest full state, replacing the queued messages of
+                      slow consumers under the coalesce policy. Without it, the new
+                      message replaces them.
+            started: ``time.perf_counter()`` value the latency is measured from
+        """
+        broadcast = _Broadcast(time.perf_counter() if started is None else started, self.stats)
+        latest = None
+        for websocket in websockets:
+            channel = self._channels.get(websocket)
+            message = message_for(websocket)
+            if channel is None or message is None:
+                continue
+
+            if len(channel) < self.queue_size:
+                channel.put(message, broadcast)
+            elif self.policy is SlowConsumerPolicy.DROP:
+                self.stats.dropped += 1
+            elif self.policy is SlowConsumerPolicy.COALESCE:
+                if snapshot is not None and latest is None:
+                    latest = snapshot()
+                self.stats.coalesced += channel.clear()
+                channel.put(message if snapshot is None else latest, broadcast)
+            else:
+                self.stats.disconnected += 1
+                self._disconnect(channel)
+        broadcast.done()
+
+    async def join(self) -> None:
+        """Wait until all queued messages have been sent."""
+        for channel in list(self._channels.values()):
+            await channel.wait_idle()
+
+    def close(self) -> None:
+        """Stop all writers."""
+        for websocket in list(self._channels):
+            self.remove(websocket)
+
+    def _channel_failed(self, channel: Channel, error: Exception) -> None:
+        if self._channels.get(channel.websocket) is not channel:
+            return
+        self.remove(channel.websocket)
+        if self._on_failure is not None:
+            self._on_failure(channel.websocket, error)
+
+    def _disconnect(self, channel: Channel) -> None:
+        """Disconnect a slow consumer; its client reconnects and resynchronizes."""
+        websocket = channel.websocket
+        self.remove(websocket)
+        if self._on_failure is not None:
+            self._on_failure(websocket, OverflowError("send queue full"))
+
+        async def close() -> None:
+            try:
+                await asyncio.wait_for(websocket.close(code=CLOSE_TRY_AGAIN_LATER), 5.0)
+            except Exception:
+                pass
+
+        asyncio.get_running_loop().create_task(close())
@@ -2,6 +2,8 @@
 
 from .base import StorageBackend, StorageError
 from .file import FileStorageBackend
+from .shared import SharedMemoryBackend
+from .writebehind import WriteBehindBackend
 
 try:
     import requests
@@ -36,6 +38,8 @@ __all__ = [
     "StorageBackend",
     "StorageError",
     "FileStorageBackend",
+    "WriteBehindBackend",
+    "SharedMemoryBackend",
     "RemoteStorageBackend",
     "HAS_REMOTE_DEPS",
 ]
@@ -4,7 +4,7 @@ Abstract base class for storage backends.
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 class StorageBackend(ABC):
@@ -15,6 +15,10 @@ class StorageBackend(ABC):
     to provide different storage mechanisms.
     """
 
+    # Whether load() may leave out top-level sections, which are then fetched on
+    # first access with load_section()
+    lazy = False
+
     def __init__(self, logger: Optional[logging.Logger] = None):
         """Initialize the storage backend.
 
@@ -25,6 +29,7 @@ class StorageBackend(ABC):
 
         # callbacks for syncing hooks
         self._sync_handler: callable = None
+        self._patch_handler: callable = None
 
     def __str__(self):
         return f"{self.__class__.__name__}(backend)"
@@ -79,6 +84,31 @@ class StorageBackend(ABC):
         """
         return self.load()
 
+    def load_section(self, key: str) -> Any:
+        """Load a top-level section that a lazy load() left out.
+
+        Args:
+            key: The section key
+
+        Returns:
+            The section data
+
+        Raises:
+            KeyError: If there is no such section left to load
+        """
+        raise KeyError(key)
+
+    def pending_sections(self) -> List[str]:
+        """Get the top-level sections that a lazy load() has not loaded yet."""
+        return []
+
+    def cleanup(self) -> None:
+        """Release resources held by the backend.
+
+        Called when the owning NekoConf is cleaned up. The default does nothing.
+        """
+        pass
+
     def sync(self, data: Dict[str, Any]) -> None:
         """Synchronize the configuration from backend to sync handler.
 
@@ -92,6 +122,23 @@ class StorageBackend(ABC):
         if self._sync_handler:
             self._sync_handler(data)
 
+    def patch(self, ops: List[Dict[str, Any]]) -> bool:
+        """Pass JSON-Patch-like operations from the backend to the patch handler.
+
+        Backends receiving deltas call this instead of ``sync()``, so the owner only
+        applies the changed paths.
+
+        Args:
+            ops: Patch operations (see ``nekoconf.event.patch``)
+
+        Returns:
+            True if the operations were applied. False if there is no patch handler or
+            the operations do not apply; the backend should then sync the full data.
+        """
+        if self._patch_handler:
+            return self._patch_handler(ops)
+        return False
+
 
 class StorageError(Exception):
     """
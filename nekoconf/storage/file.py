@@ -2,35 +2,187 @@
 File-based storage backend.
 """
 
+import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
-from ..utils.helper import create_file_if_not_exists, load_file, save_file
+from ..utils.helper import (
+    _RACY_WINDOW_NS,
+    FSYNC_NONE,
+    FSYNC_POLICIES,
+    create_file_if_not_exists,
+    fingerprint_bytes,
+    get_codec,
+    read_file_data,
+    serialize_file_data,
+    write_file_atomic,
+)
+from ..utils.sections import JSONSections
+from ..utils.snapshot import SNAPSHOT_SUFFIX, Snapshot, SnapshotError, encode_snapshot
 from .base import StorageBackend, StorageError
+from .watch import FileWatcher
+
+
+class _ParsedSections:
+    """Sections of already parsed data, for data that a snapshot cannot hold."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def keys(self) -> List[str]:
+        return list(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def load(self, key: str) -> Any:
+        return self._data[key]
+
+    def close(self) -> None:
+        pass
 
 
 class FileStorageBackend(StorageBackend):
     """Storage backend that persists configuration to a file.
 
-    Supports YAML, JSON, and TOML file formats.
+    Supports YAML, JSON, and TOML file formats. Saves replace the file atomically,
+    so a crash during a write leaves either the old or the new configuration.
+
+    With ``watch=True`` the file is watched for changes made by other processes,
+    which are pushed to the sync handler (NekoConf replaces its configuration with
+    them). The watch handler runs in a background thread, so combine it with
+    ``NekoConf(thread_safe=True)`` when the configuration is also used elsewhere.
+
+    Large JSON files can be loaded partially. With ``sections`` only the listed
+    top-level sections are parsed; with ``lazy=True`` none are, and NekoConf parses
+    each section when it is first accessed. Either way, saving writes sections that
+    were never loaded back unchanged, without parsing them.
+
+    With ``snapshot=True`` a binary snapshot of the data is kept next to the file
+    (``config.yaml.nks``) and used instead of parsing the file while it is up to
+    date. Opening a snapshot takes constant time, so lazy loading from a snapshot
+    starts in milliseconds whatever the size or format of the file.
     """
 
-    def __init__(self, config_path: Union[str, Path], logger=None):
+    def __init__(
+        self,
+        config_path: Union[str, Path],
+        logger=None,
+        fsync: str = FSYNC_NONE,
+        watch: bool = False,
+        watch_debounce: float = 0.1,
+        watch_poll_interval: float = 1.0,
+        sections: Optional[Iterable[str]] = None,
+        lazy: bool = False,
+        snapshot: bool = False,
+    ):
         """Initialize the file storage backend.
 
         Args:
             config_path: Path to the configuration file
             logger: Optional logger for logging messages
+            fsync: Durability of saves (default: "none"):
+                   "none" leaves flushing to the OS,
+                   "file" flushes the new content before it replaces the old file,
+                   "file+dir" also flushes the directory so the replacement survives power loss
+            watch: Reload the file when it changes on disk (default: False)
+            watch_debounce: Seconds a burst of writes must settle before reloading
+                            (default: 0.1)
+            watch_poll_interval: Seconds between checks where inotify is unavailable
+                                 (default: 1.0)
+            sections: Top-level sections to load, the others are left out
+                      (default: None, load all)
+            lazy: Load top-level sections on first access (default: False)
+            snapshot: Keep a binary snapshot next to the file for fast loading
+                      (default: False)
+
+        Raises:
+            ValueError: If the fsync policy is unknown, or partial loading is requested
+                        for a file that is neither JSON nor snapshotted
         """
         super().__init__(logger=logger)
         self.config_path = Path(config_path)
 
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync!r}, expected one of {FSYNC_POLICIES}")
+        self.fsync = fsync
+
+        self._is_json = self.config_path.suffix.lower() == ".json"
+        if (sections is not None or lazy) and not (self._is_json or snapshot):
+            raise ValueError(
+                "Loading sections on demand is only supported for JSON files, "
+                "or with snapshot=True"
+            )
+        self.sections = None if sections is None else list(sections)
+        self.lazy = lazy
+        self.snapshot_path: Optional[Path] = (
+            self.config_path.with_name(self.config_path.name + SNAPSHOT_SUFFIX)
+            if snapshot
+            else None
+        )
+
+        # Index of the file loaded partially, and the sections handed out from it
+        self._document: Optional[Union[JSONSections, Snapshot, _ParsedSections]] = None
+        self._loaded_sections: Set[str] = set()
+
+        # Fingerprint of the file content last loaded or saved, and the file's stat at
+        # that time, so unchanged saves are skipped without reading the file back
+        self._fingerprint: Optional[bytes] = None
+        self._file_signature: Optional[Tuple[int, int, int]] = None
+        # Fingerprint of the loaded data as a save serializes it. Hand-written content
+        # is formatted differently, so saving that data unchanged must not rewrite it.
+        self._serialized_fingerprint: Optional[bytes] = None
+
+        # Serializes saves with the watcher, so our own writes are never mistaken for
+        # external changes
+        self._lock = threading.RLock()
+        self.watch_debounce = watch_debounce
+        self.watch_poll_interval = watch_poll_interval
+        self._watcher: Optional[FileWatcher] = None
+
         # Create file if it doesn't exist
         create_file_if_not_exists(self.config_path)
 
+        if watch:
+            self.start_watching()
+
     def __str__(self):
         return f"{self.__class__.__name__}(config_path={self.config_path})"
 
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Return the (mtime_ns, size, inode) of the configuration file, if it exists."""
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _remember(self, fingerprint: bytes, serialized: Optional[bytes] = None) -> None:
+        """Record the fingerprint of the content now on disk.
+
+        Args:
+            fingerprint: Fingerprint of the file content
+            serialized: Fingerprint of the content's data as a save serializes it,
+                        if known
+        """
+        self._fingerprint = fingerprint
+        self._serialized_fingerprint = serialized
+        self._file_signature = self._stat_signature()
+
+    def _remember_loaded(self, fingerprint: bytes, data: Dict[str, Any]) -> None:
+        """Record the fingerprint of content read from the file, and of its data."""
+        serialized = None
+        if fingerprint == self._fingerprint:
+            # Reloading the same content, e.g. what we saved last
+            serialized = self._serialized_fingerprint
+        if serialized is None:
+            try:
+                serialized = fingerprint_bytes(serialize_file_data(self.config_path, data))
+            except Exception:
+                serialized = None
+        self._remember(fingerprint, serialized)
+
     def load(self) -> Dict[str, Any]:
         """Load configuration data from file.
 
@@ -40,10 +192,30 @@ class FileStorageBackend(StorageBackend):
         Raises:
             StorageError: If file loading fails
         """
+        if self.sections is not None or self.lazy:
+            return self._load_partial()
+
+        # Parsing JSON is faster than decoding a whole snapshot
+        if self.snapshot_path and not self._is_json:
+            snapshot = self._open_snapshot()
+            if snapshot is not None:
+                try:
+                    data = snapshot.to_python()
+                finally:
+                    snapshot.close()
+                self._remember_loaded(snapshot.source_fingerprint, data)
+                self.logger.debug(f"Loaded configuration from snapshot: {self.snapshot_path}")
+                return data
+
         try:
             if self.config_path.exists():
-                data = load_file(self.config_path) or {}
+                # Served from the parse cache while the file is unchanged
+                data, fingerprint = read_file_data(self.config_path)
+                data = data or {}
+                self._remember_loaded(fingerprint, data)
                 self.logger.debug(f"Loaded configuration from file: {self.config_path}")
+                if self.snapshot_path:
+                    self._write_snapshot(data, fingerprint)
                 return data
             else:
                 self.logger.warning(f"Configuration file not found: {self.config_path}")
@@ -54,6 +226,163 @@ class FileStorageBackend(StorageBackend):
             self.logger.error(error_msg)
             raise StorageError(error_msg) from e
 
+    def _load_partial(self) -> Dict[str, Any]:
+        """Index the file and load only the requested sections."""
+        with self._lock:
+            if self._document is not None:
+                self._document.close()
+                self._document = None
+
+            if not self.config_path.exists():
+                self.logger.warning(f"Configuration file not found: {self.config_path}")
+                return {}
+
+            try:
+                document = self._open_snapshot() if self.snapshot_path else None
+                if document is not None:
+                    fingerprint = document.source_fingerprint
+                    # Decoding all sections to serialize them would defeat lazy loading
+                    known = (
+                        self._serialized_fingerprint if fingerprint == self._fingerprint else None
+                    )
+                    self._remember(fingerprint, known)
+                elif self._is_json:
+                    document = JSONSections(self.config_path)
+                    # Fingerprinting would read the whole file, so the next save writes
+                    self._fingerprint = None
+                    self._serialized_fingerprint = None
+                    self._file_signature = None
+                else:
+                    # Parse once, then serve the sections from a new snapshot
+                    full_data, fingerprint = read_file_data(self.config_path, use_cache=False)
+                    full_data = full_data or {}
+                    self._remember_loaded(fingerprint, full_data)
+                    content = self._write_snapshot(full_data, fingerprint)
+                    document = _ParsedSections(full_data) if content is None else Snapshot(content)
+
+                data = {}
+                for key in self.sections or ():
+                    if key in document:
+                        data[key] = document.load(key)
+            except Exception as e:
+                error_msg = f"Error loading configuration file {self.config_path}: {e}"
+                self.logger.error(error_msg)
+                raise StorageError(error_msg) from e
+
+            self._document = document
+            self._loaded_sections = set(data)
+            self.logger.debug(f"Indexed configuration file: {self.config_path}")
+            return data
+
+    def _open_snapshot(self) -> Optional[Snapshot]:
+        """Open the snapshot, if it exists and matches the current file."""
+        try:
+            stat = os.stat(self.config_path)
+            snapshot_mtime = os.stat(self.snapshot_path).st_mtime_ns
+            snapshot = Snapshot.open(self.snapshot_path)
+        except (OSError, SnapshotError) as e:
+            self.logger.debug(f"No usable snapshot {self.snapshot_path}: {e}")
+            return None
+
+        fresh = snapshot.source_stat == (stat.st_size, stat.st_mtime_ns)
+        # A file modified within timestamp granularity of the snapshot being written
+        # could have changed without its mtime changing, so check its content
+        if fresh and snapshot_mtime - stat.st_mtime_ns < _RACY_WINDOW_NS:
+            content = self.config_path.read_bytes()
+            fresh = fingerprint_bytes(content) == snapshot.source_fingerprint
+
+        if not fresh:
+            snapshot.close()
+            self.logger.debug(f"Snapshot is out of date: {self.snapshot_path}")
+            return None
+        return snapshot
+
+    def _write_snapshot(self, data: Dict[str, Any], fingerprint: bytes) -> Optional[bytes]:
+        """Write the snapshot of data, as now stored in the file.
+
+        Returns:
+            The snapshot content, or None if the data cannot be snapshotted
+        """
+        try:
+            stat = os.stat(self.config_path)
+            content = encode_snapshot(data, (stat.st_size, stat.st_mtime_ns), fingerprint)
+            write_file_atomic(self.snapshot_path, content)
+        except (OSError, SnapshotError) as e:
+            self.logger.warning(f"Could not write snapshot {self.snapshot_path}: {e}")
+            return None
+        self.logger.debug(f"Wrote snapshot {self.snapshot_path}")
+        return content
+
+    def load_section(self, key: str) -> Any:
+        """Load a top-level section left out by a lazy load.
+
+        Args:
+            key: The section key
+
+        Returns:
+            The section data
+
+        Raises:
+            KeyError: If the file has no such section, or it was already loaded
+            StorageError: If the section cannot be parsed
+        """
+        with self._lock:
+            if not self.lazy or self._document is None or key in self._loaded_sections:
+                raise KeyError(key)
+            try:
+                value = self._document.load(key)
+            except KeyError:
+                raise
+            except Exception as e:
+                raise StorageError(f"Error loading section {key!r} of {self.config_path}: {e}")
+            self._loaded_sections.add(key)
+            return value
+
+    def pending_sections(self) -> List[str]:
+        """Get the top-level sections a lazy load has not loaded yet."""
+        with self._lock:
+            if not self.lazy or self._document is None:
+                return []
+            return [key for key in self._document.keys() if key not in self._loaded_sections]
+
+    def _merge_partial(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the sections that were never loaded to data, in stored order."""
+        document = self._document
+        merged = {}
+        for key in document.keys():
+            if key in data:
+                merged[key] = data[key]
+            elif key not in self._loaded_sections:
+                merged[key] = document.load(key)
+        for key, value in data.items():
+            merged.setdefault(key, value)
+        return merged
+
+    def _serialize_partial(self, data: Dict[str, Any]) -> bytes:
+        """Serialize data, copying the JSON sections that were never loaded from the file."""
+        codec = get_codec("json")
+        document = self._document
+        entries = []
+
+        def entry(key: str, value: Any) -> bytes:
+            # Serialize as a one-key document and take its body, keeping the layout
+            content = codec.dumps({key: value}).strip()
+            return content[1:-1].strip(b"\r\n")
+
+        for key in document.keys():
+            if key in data:
+                entries.append(entry(key, data[key]))
+            elif key not in self._loaded_sections:
+                raw_key = codec.dumps(key).strip()
+                entries.append(b"  " + raw_key + b": " + document.raw(key))
+        for key, value in data.items():
+            if key not in document:
+                entries.append(entry(key, value))
+
+        if not entries:
+            return b"{}"
+        return b"{\n" + b",\n".join(entries) + b"\n}"
+
     def save(self, data: Dict[str, Any]) -> bool:
         """Save configuration data to file.
 
@@ -64,13 +393,30 @@ class FileStorageBackend(StorageBackend):
             True if save was successful, False otherwise
         """
         try:
-            # Check if data has actually changed to avoid unnecessary writes
-            existing_data = load_file(self.config_path) or {}
-            if existing_data == data:
-                self.logger.debug("No changes detected, not saving configuration")
-                return True
+            with self._lock:
+                full_data = data
+                if isinstance(self._document, JSONSections):
+                    content = self._serialize_partial(data)
+                    full_data = None
+                else:
+                    if self._document is not None:
+                        full_data = self._merge_partial(data)
+                    content = serialize_file_data(self.config_path, full_data)
+                fingerprint = fingerprint_bytes(content)
+
+                # Skip the write if the file still holds exactly this content, or the
+                # loaded content of this data, which may differ in formatting and comments
+                if self._stat_signature() == self._file_signature and fingerprint in (
+                    self._fingerprint,
+                    self._serialized_fingerprint,
+                ):
+                    self.logger.debug("No changes detected, not saving configuration")
+                    return True
 
-            save_file(self.config_path, data)
+                write_file_atomic(self.config_path, content, fsync=self.fsync)
+                self._remember(fingerprint, fingerprint)
+                if self.snapshot_path and full_data is not None:
+                    self._write_snapshot(full_data, fingerprint)
             self.logger.debug(f"Saved configuration to {self.config_path}")
 
             if self._sync_handler:
@@ -80,3 +426,77 @@ class FileStorageBackend(StorageBackend):
         except Exception as e:
             self.logger.error(f"Error saving configuration: {e}")
             return False
+
+    @property
+    def watching(self) -> bool:
+        """Whether the file is being watched for changes."""
+        return self._watcher is not None and self._watcher.running
+
+    def start_watching(self, use_inotify: bool = True) -> None:
+        """Start reloading the file when it changes on disk.
+
+        Args:
+            use_inotify: Use inotify where available (default: True), otherwise poll
+        """
+        if self.watching:
+            return
+
+        # Establish the baseline, so the first change is compared to current content
+        if self._fingerprint is None and self.config_path.exists():
+            try:
+                self._remember(fingerprint_bytes(self.config_path.read_bytes()))
+            except OSError:
+                pass
+
+        self._watcher = FileWatcher(
+            self.config_path,
+            self._on_file_changed,
+            debounce=self.watch_debounce,
+            poll_interval=self.watch_poll_interval,
+            use_inotify=use_inotify,
+            logger=self.logger,
+        )
+        self._watcher.start()
+        self.logger.info(f"Watching {self.config_path} using {self._watcher.method}")
+
+    def stop_watching(self) -> None:
+        """Stop watching the file."""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _on_file_changed(self) -> None:
+        """Reload the file after the watcher saw it change.
+
+        Content identical to what was last loaded or saved, such as a touch or one of
+        our own saves, is ignored. So is content that does not parse, which usually
+        means a writer has not finished yet.
+        """
+        with self._lock:
+            if not self.config_path.exists():
+                self.logger.warning(f"Watched configuration file removed: {self.config_path}")
+                return
+
+            try:
+                data, fingerprint = read_file_data(self.config_path)
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable change to {self.config_path}: {e}")
+                return
+
+            if fingerprint == self._fingerprint:
+                self._file_signature = self._stat_signature()
+                self.logger.debug(f"Content of {self.config_path} unchanged, not reloading")
+                return
+
+            self._remember_loaded(fingerprint, data or {})
+
+        self.logger.info(f"Configuration file changed, reloading: {self.config_path}")
+        self.sync(data or {})
+
+    def cleanup(self) -> None:
+        """Stop watching the file and release a partially loaded file."""
+        self.stop_watching()
+        with self._lock:
+            if self._document is not None:
+                self._document.close()
+                self._document = None
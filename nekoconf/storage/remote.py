@@ -1,12 +1,16 @@
 """Remote storage backend for NekoConf orchestrator."""
 
+import gzip
 import json
 import threading
 import time
 from typing import Any, Dict, Optional
+from urllib.parse import quote
 
 import requests
 import websocket
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .base import StorageBackend, StorageError
 
@@ -16,6 +20,15 @@ class RemoteStorageBackend(StorageBackend):
 
     This backend connects to a specific app on a remote NekoConf orchestrator
     via REST API and WebSocket for real-time updates.
+
+    Requests go through a pooled HTTP session, so connections are kept alive and
+    reused across loads and saves. Failed connections and 502/503/504 responses are
+    retried with jittered exponential backoff, and request bodies of at least
+    ``compress_min_size`` bytes are sent gzip-compressed.
+
+    The last configuration loaded is cached with its ETag. Later loads revalidate
+    it with ``If-None-Match``, and WebSocket reconnects announce the version the
+    client holds, so nothing is downloaded again when the configuration is unchanged.
     """
 
     def __init__(
@@ -26,6 +39,14 @@ class RemoteStorageBackend(StorageBackend):
         reconnect_attempts: int = 0,
         reconnect_delay: float = 5.0,
         connect_timeout: float = 5.0,
+        request_timeout: float = 10.0,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        max_retries: int = 3,
+        backoff_factor: float = 0.1,
+        backoff_jitter: float = 0.1,
+        compress: bool = True,
+        compress_min_size: int = 1024,
         **kwargs,
     ):
         """Initialize the remote storage backend.
@@ -37,6 +58,18 @@ class RemoteStorageBackend(StorageBackend):
             reconnect_attempts: Number of reconnection attempts on failure
             reconnect_delay: Delay between reconnection attempts
             connect_timeout: Timeout for initial connection
+            request_timeout: Timeout for saving and creating the app (default: 10.0)
+            pool_size: Maximum number of pooled connections to the orchestrator
+                       (default: 10)
+            keep_alive: Keep connections open for reuse (default: True)
+            max_retries: Number of retries for failed connections and 502/503/504
+                         responses (default: 3)
+            backoff_factor: Base delay in seconds for exponential backoff between
+                            retries (default: 0.1)
+            backoff_jitter: Maximum random delay in seconds added to each backoff
+                            (default: 0.1)
+            compress: Gzip-compress request bodies (default: True)
+            compress_min_size: Minimum body size in bytes to compress (default: 1024)
             **kwargs: Additional arguments passed to parent class
         """
         super().__init__(**kwargs)
@@ -47,17 +80,34 @@ class RemoteStorageBackend(StorageBackend):
         self.reconnect_attempts = reconnect_attempts
         self.reconnect_delay = reconnect_delay
         self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.compress = compress
+        self.compress_min_size = compress_min_size
+
+        # Pooled session shared by all requests of this backend
+        self._session = self._create_session(
+            pool_size, keep_alive, max_retries, backoff_factor, backoff_jitter
+        )
 
         # Connection state
         self._connected = False
 
         # API and WebSocket URLs for the specific app
-        self._ws_url = f"{self.remote_url.replace('http://', 'ws://').replace('https://', 'wss://')}/ws/{self.app_name}"
+        self._ws_url = f"{self.remote_url.replace('http://', 'ws://').replace('https://', 'wss://')}/ws/{self.app_name}?protocol=delta"
         self._api_url = f"{self.remote_url}/api/apps/{self.app_name}/config"
         self._ws = None
         self._ws_thread = None
         self._running = False
 
+        # Configuration version received over the WebSocket, None until a full update
+        self._version: Optional[int] = None
+
+        # Last loaded response body and its ETag, revalidated by the next load
+        self._etag: Optional[str] = None
+        self._cached_body: Optional[bytes] = None
+        # ETag of the configuration last handed to the owner, from either channel
+        self._synced_etag: Optional[str] = None
+
         # Auto-connect on initialization
         self._connect()
 
@@ -77,11 +127,23 @@ class RemoteStorageBackend(StorageBackend):
             raise StorageError("Failed to connect to remote orchestrator")
 
         try:
-            headers = self._set_auth_headers()
-            response = requests.get(self._api_url, headers=headers, timeout=self.connect_timeout)
+            etag, cached_body = self._etag, self._cached_body
+            headers = {"If-None-Match": etag} if etag and cached_body is not None else None
+            response = self._session.get(
+                self._api_url, headers=headers, timeout=self.connect_timeout
+            )
 
-            if response.status_code == 200:
+            if response.status_code == 304 and headers:
+                # Decoded again, as the owner may modify the returned data
+                config_data = json.loads(cached_body)
+                self._synced_etag = etag
+                self.logger.debug(f"Configuration for app '{self.app_name}' is unchanged")
+                return config_data
+            elif response.status_code == 200:
                 config_data = response.json()
+                self._etag = response.headers.get("ETag")
+                self._cached_body = response.content if self._etag else None
+                self._synced_etag = self._etag
                 self.logger.debug(
                     f"Loaded configuration for app '{self.app_name}' from remote orchestrator"
                 )
@@ -89,6 +151,7 @@ class RemoteStorageBackend(StorageBackend):
             elif response.status_code == 404:
                 # App doesn't exist, return empty config
                 self.logger.warning(f"App '{self.app_name}' not found on remote orchestrator")
+                self._etag = self._cached_body = self._synced_etag = None
                 return {}
             else:
                 error_msg = f"Failed to load config for app '{self.app_name}': {response.status_code} - {response.text}"
@@ -112,13 +175,14 @@ class RemoteStorageBackend(StorageBackend):
             return False
 
         try:
-            headers = self._set_auth_headers()
-            response = requests.put(self._api_url, json={"data": data}, headers=headers, timeout=10)
+            payload = {"data": json.dumps(data), "format": "json"}
+            response = self._send("PUT", self._api_url, payload)
 
             if response.status_code == 200:
                 self.logger.debug(
                     f"Saved configuration for app '{self.app_name}' to remote orchestrator"
                 )
+                self._synced_etag = None  # The new version is only known from the server
                 return True
             elif response.status_code == 404:
                 # App doesn't exist, try to create it first
@@ -150,6 +214,7 @@ class RemoteStorageBackend(StorageBackend):
     def cleanup(self) -> None:
         """Clean up resources used by the remote storage backend."""
         self._running = False
+        self._session.close()
         if self._ws:
             self._ws.close()
             self._ws = None
@@ -172,14 +237,13 @@ class RemoteStorageBackend(StorageBackend):
 
             payload = {
                 "name": self.app_name,
-                "data": initial_data,
+                "data": json.dumps(initial_data),
+                "format": "json",
             }
 
-            headers = self._set_auth_headers()
-            app_create_url = f"{self.remote_url}/api/apps/{self.app_name}"
-            response = requests.post(app_create_url, json=payload, headers=headers, timeout=10)
+            response = self._send("POST", f"{self.remote_url}/api/apps", payload)
 
-            if response.status_code == 200:
+            if response.status_code in (200, 201):
                 self.logger.info(
                     f"Successfully created app '{self.app_name}' on remote orchestrator"
                 )
@@ -217,6 +281,80 @@ class RemoteStorageBackend(StorageBackend):
             )
             return False
 
+    def _create_session(
+        self,
+        pool_size: int,
+        keep_alive: bool,
+        max_retries: int,
+        backoff_factor: float,
+        backoff_jitter: float,
+    ) -> requests.Session:
+        """Create the pooled HTTP session used for all requests.
+
+        Returns:
+            A session with retrying connection pools and the authentication headers set
+        """
+        retry_options = dict(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        try:
+            retry = Retry(backoff_jitter=backoff_jitter, **retry_options)
+        except TypeError:  # urllib3 < 2 has no jitter
+            retry = Retry(**retry_options)
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        session.headers.update(self._set_auth_headers())
+        del session.headers["Content-Type"]
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def _send(self, method: str, url: str, payload: Dict[str, Any]) -> requests.Response:
+        """Send a JSON request body, gzip-compressed if it is large enough.
+
+        Servers that reject compressed bodies are retried uncompressed, and compression
+        is then turned off for this backend.
+
+        Returns:
+            The response
+        """
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+
+        if self.compress and len(body) >= self.compress_min_size:
+            compressed_headers = {**headers, "Content-Encoding": "gzip"}
+            response = self._session.request(
+                method,
+                url,
+                data=gzip.compress(body, compresslevel=5, mtime=0),
+                headers=compressed_headers,
+                timeout=self.request_timeout,
+            )
+            if response.status_code not in (400, 415, 422):
+                return response
+
+            response = self._session.request(
+                method, url, data=body, headers=headers, timeout=self.request_timeout
+            )
+            if response.status_code < 400:
+                self.logger.info(
+                    "Remote orchestrator does not accept compressed requests, disabling compression"
+                )
+                self.compress = False
+            return response
+
+        return self._session.request(
+            method, url, data=body, headers=headers, timeout=self.request_timeout
+        )
+
     def _set_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers for API requests."""
         headers = {"Content-Type": "application/json"}
@@ -242,8 +380,11 @@ class RemoteStorageBackend(StorageBackend):
         while self._running:
             try:
                 headers = self._set_auth_headers()
+                url = self._ws_url
+                if self._synced_etag:
+                    url += f"&since={quote(self._synced_etag)}"
                 self._ws = websocket.WebSocketApp(
-                    self._ws_url,
+                    url,
                     header=headers,
                     on_open=self._on_ws_open,
                     on_message=self._on_ws_message,
@@ -251,9 +392,7 @@ class RemoteStorageBackend(StorageBackend):
                     on_close=self._on_ws_close,
                 )
 
-                self.logger.debug(
-                    f"Connecting to WebSocket for app '{self.app_name}': {self._ws_url}"
-                )
+                self.logger.debug(f"Connecting to WebSocket for app '{self.app_name}': {url}")
                 self._ws.run_forever()
 
                 if not self._running:
@@ -281,25 +420,59 @@ class RemoteStorageBackend(StorageBackend):
         self.logger.debug(f"WebSocket connection established for app '{self.app_name}'")
 
     def _on_ws_message(self, ws, message):
-        """WebSocket message event handler."""
+        """WebSocket message event handler.
+
+        Full updates replace the configuration. Patches apply to the version they are
+        based on; a patch for any other version means updates were missed, and the
+        full configuration is requested instead. On connections announcing the
+        client's version, the server confirms an unchanged configuration instead of
+        sending it.
+        """
         try:
             data: dict = json.loads(message)
-            self.logger.debug(f"Received WebSocket message for app '{self.app_name}': {data}")
-            if data.get("type") == "update" and "data" in data:
-                config_data = data["data"]
+            message_type = data.get("type")
 
+            if message_type in ("initial_config", "update") and "data" in data:
                 self.logger.debug(
                     f"Received config update for app '{self.app_name}' from WebSocket"
                 )
+                self._version = data.get("version")
 
                 # Sync the changes back to the NekoConf instance
-                self.sync(config_data)
+                self.sync(data["data"])
+                self._synced_etag = data.get("etag")
+
+            elif message_type == "unchanged":
+                self._version = data.get("version")
+
+            elif message_type == "patch":
+                self._on_ws_patch(ws, data)
 
         except (json.JSONDecodeError, Exception) as e:
             self.logger.warning(
                 f"Error processing WebSocket message for app '{self.app_name}': {e}"
             )
 
+    def _on_ws_patch(self, ws, data: Dict[str, Any]) -> None:
+        """Apply a patch message, or request a resync if it does not follow our version."""
+        if self._version is None or data["version"] <= self._version:
+            return  # Waiting for a full update, or already included in it
+
+        if data["base"] == self._version and self.patch(data["ops"]):
+            self.logger.debug(
+                f"Applied config patch {data['version']} for app '{self.app_name}' from WebSocket"
+            )
+            self._version = data["version"]
+            self._synced_etag = data.get("etag")
+            return
+
+        self.logger.info(
+            f"Config patch {data['version']} for app '{self.app_name}' does not apply to "
+            f"version {self._version}, requesting full configuration"
+        )
+        self._version = self._synced_etag = None
+        ws.send(json.dumps({"type": "resync"}))
+
     def _on_ws_error(self, ws, error):
         """WebSocket error event handler."""
         self.logger.error(f"WebSocket error for app '{self.app_name}': {error}")
@@ -0,0 +1,422 @@
+"""
+Shared memory storage backend.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..utils.snapshot import Snapshot, SnapshotError, encode_snapshot
+from .base import StorageBackend, StorageError
+
+try:
+    import _posixshmem
+except ImportError:  # Windows
+    _posixshmem = None
+
+# magic, reserved, publisher token, sequence (odd while being written), generation,
+# snapshot length
+_CONTROL = struct.Struct("<4sI8sQQQ")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 16
+_MAGIC = b"NKSM"
+
+
+def _attach(name: str, length: int) -> mmap.mmap:
+    """Map a shared memory segment read-only.
+
+    Raises:
+        FileNotFoundError: If the segment does not exist
+    """
+    if _posixshmem is None:
+        # Opening by tag name would create a missing mapping, so check it exists first
+        shared_memory.SharedMemory(name).close()
+        return mmap.mmap(-1, length, tagname=name, access=mmap.ACCESS_READ)
+
+    fd = _posixshmem.shm_open("/" + name, os.O_RDONLY, mode=0o600)
+    try:
+        return mmap.mmap(fd, length, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+
+def _read_control(name: str) -> Optional[Tuple[bytes, int, int]]:
+    """Read a consistent (token, generation, length) from a control segment.
+
+    Returns:
+        The published state, or None if nothing is published under the name
+    """
+    try:
+        control = _attach(name, _CONTROL.size)
+    except FileNotFoundError:
+        return None
+
+    try:
+        while True:
+            magic, _, token, sequence, generation, length = _CONTROL.unpack_from(control, 0)
+            if magic != _MAGIC:
+                return None
+            # An odd or changed sequence means a publish was in progress
+            if (
+                sequence % 2 == 0
+                and _SEQUENCE.unpack_from(control, _SEQUENCE_OFFSET)[0] == sequence
+            ):
+                return (token, generation, length) if generation else None
+            time.sleep(0)
+    finally:
+        control.close()
+
+
+class SharedMemoryBackend(StorageBackend):
+    """Storage backend sharing one configuration between processes on a host.
+
+    One process publishes: it wraps the backend the configuration is stored in
+    and, on every load, save and sync of that backend, writes the data to shared
+    memory as a snapshot (see ``nekoconf.utils.snapshot``) and bumps a generation
+    counter. Other processes subscribe by name without a backend: they map the
+    snapshot read-only and refresh when the generation changes, so a reload costs
+    one parse per host rather than one per process.
+
+    Subscribers decode the whole snapshot by default. With ``lazy=True`` they decode
+    top-level sections on first access instead, so each process only holds the
+    sections it uses and the rest of the configuration exists once per host.
+
+    Each snapshot lives in its own segment, so subscribers still reading a previous
+    generation are unaffected by a publish. There must be a single publisher per name.
+
+    Example:
+        # In the master process, before forking workers
+        NekoConf(SharedMemoryBackend("myapp", FileStorageBackend("config.yaml", watch=True)))
+
+        # In each worker
+        config = NekoConf(SharedMemoryBackend("myapp", lazy=True), read_only=True)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: Optional[StorageBackend] = None,
+        lazy: bool = False,
+        watch: bool = True,
+        poll_interval: float = 1.0,
+        logger=None,
+    ):
+        """Initialize the shared memory backend.
+
+        Args:
+            name: Name of the shared configuration, the same in all processes
+            backend: The storage backend to publish from, or None to subscribe
+            lazy: Decode top-level sections on first access (subscribers only)
+            watch: Refresh in a background thread when a new generation is published
+                   (subscribers only, default: True)
+            poll_interval: Seconds between generation checks (default: 1.0)
+            logger: Optional logger for logging messages
+
+        Raises:
+            ValueError: If the name is invalid, or lazy is combined with a backend
+        """
+        super().__init__(logger=logger or (backend.logger if backend else None))
+
+        if not name or "/" in name:
+            raise ValueError(f"Invalid shared memory name: {name!r}")
+        if backend is not None and (lazy or backend.lazy):
+            raise ValueError("A publisher needs the complete configuration, lazy is not supported")
+
+        self.name = name
+        self.backend = backend
+        self.lazy = lazy
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = 0
+
+        # Publisher state
+        self._control: Optional[shared_memory.SharedMemory] = None
+        self._segment: Optional[shared_memory.SharedMemory] = None
+        self._token = b""
+
+        # Subscriber state
+        self._snapshot: Optional[Snapshot] = None
+        self._published: Optional[Tuple[bytes, int]] = None
+        self._loaded: Set[str] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if backend is not None:
+            backend._sync_handler = self._publish_sync
+        elif watch:
+            self.start_watching()
+
+    def __str__(self):
+        role = f"backend={self.backend}" if self.publisher else f"lazy={self.lazy}"
+        return f"{self.__class__.__name__}(name={self.name!r}, {role})"
+
+    @property
+    def publisher(self) -> bool:
+        """Whether this process publishes the configuration."""
+        return self.backend is not None
+
+    @property
+    def generation(self) -> int:
+        """The generation last published or attached, 0 if there is none yet."""
+        return self._generation
+
+    # Publishing
+
+    def _publish_sync(self, data: Dict[str, Any]) -> None:
+        """Publish changes the wrapped backend picked up, then pass them on."""
+        self.publish(data)
+        self.sync(data)
+
+    def publish(self, data: Dict[str, Any]) -> bool:
+        """Write data to shared memory as the next generation.
+
+        Args:
+            data: Configuration data to publish
+
+        Returns:
+            True if the data was published, False otherwise
+        """
+        if not self.publisher:
+            raise StorageError("Only the publishing process can publish configuration")
+
+        try:
+            content = encode_snapshot(data)
+        except SnapshotError as e:
+            self.logger.error(f"Cannot publish configuration to shared memory: {e}")
+            return False
+
+        with self._lock:
+            try:
+                if self._control is None:
+                    self._create_control()
+                generation = self._generation + 1
+                segment = self._create_segment(f"{self.name}_{generation}", len(content))
+            except OSError as e:
+                self.logger.error(f"Error publishing configuration to shared memory: {e}")
+                return False
+            segment.buf[: len(content)] = content
+
+            buffer = self._control.buf
+            (sequence,) = _SEQUENCE.unpack_from(buffer, _SEQUENCE_OFFSET)
+            _SEQUENCE.pack_into(buffer, _SEQUENCE_OFFSET, sequence + 1)
+            _CONTROL.pack_into(
+                buffer, 0, _MAGIC, 0, self._token, sequence + 1, generation, len(content)
+            )
+            _SEQUENCE.pack_into(buffer, _SEQUENCE_OFFSET, sequence + 2)
+
+            previous, self._segment = self._segment, segment
+            self._generation = generation
+            if previous is not None:
+                self._release(previous)
+
+        self.logger.debug(f"Published configuration generation {generation} to {self.name}")
+        return True
+
+    def _create_control(self) -> None:
+        try:
+            self._control = shared_memory.SharedMemory(self.name, create=True, size=_CONTROL.size)
+        except FileExistsError:
+            # Left behind by a publisher that did not clean up
+            self.logger.warning(f"Taking over existing shared configuration {self.name}")
+            self._control = shared_memory.SharedMemory(self.name)
+            self._generation = _CONTROL.unpack_from(self._control.buf, 0)[4]
+        # Subscribers tell restarted publishers apart by this token
+        self._token = os.urandom(8)
+
+    @staticmethod
+    def _create_segment(name: str, size: int) -> shared_memory.SharedMemory:
+        try:
+            return shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            shared_memory.SharedMemory(name).unlink()
+            return shared_memory.SharedMemory(name, create=True, size=size)
+
+    @staticmethod
+    def _release(segment: shared_memory.SharedMemory) -> None:
+        """Close and remove a segment; processes that still map it keep their mapping."""
+        segment.close()
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+    # Subscribing
+
+    def refresh(self) -> bool:
+        """Attach the latest published generation, if it is not attached yet.
+
+        Returns:
+            True if a new generation was attached, False otherwise
+        """
+        with self._refresh_lock:
+            state = _read_control(self.name)
+            if state is None:
+                return False
+            token, generation, length = state
+            if (token, generation) == self._published:
+                return False
+
+            try:
+                snapshot = Snapshot(_attach(f"{self.name}_{generation}", length))
+            except FileNotFoundError:
+                return False  # Superseded while reading, the next check attaches the newer one
+            except (OSError, SnapshotError) as e:
+                self.logger.error(f"Error attaching shared configuration {self.name}: {e}")
+                return False
+
+            self._swap(snapshot, token, generation)
+        self.logger.debug(f"Attached configuration generation {generation} from {self.name}")
+        return True
+
+    def _swap(self, snapshot: Snapshot, token: bytes, generation: int) -> None:
+        with self._lock:
+            previous, self._snapshot = self._snapshot, snapshot
+            self._published = (token, generation)
+            self._generation = generation
+        if previous is not None:
+            previous.close()
+
+    def _sync_refresh(self) -> None:
+        """Pass a newly attached generation on to the sync handler."""
+        with self._lock:
+            snapshot = self._snapshot
+            if not self.lazy:
+                data = snapshot.to_python()
+            else:
+                # Only sections already handed out are replaced, others load on access
+                data = {key: snapshot.load(key) for key in self._loaded if key in snapshot}
+                self._loaded = set(data)
+
+        self._local.syncing = True
+        try:
+            self.sync(data if isinstance(data, dict) else {})
+        finally:
+            self._local.syncing = False
+
+    @property
+    def watching(self) -> bool:
+        """Whether new generations are picked up in the background."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start_watching(self) -> None:
+        """Check for new generations every poll_interval seconds in a background thread."""
+        if self.publisher:
+            raise StorageError("Only subscribers can watch for published configuration")
+        if self.watching:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name=f"nekoconf-shm-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop_watching(self) -> None:
+        """Stop checking for new generations."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                if self.refresh():
+                    self._sync_refresh()
+            except Exception as e:
+                self.logger.error(f"Error refreshing shared configuration {self.name}: {e}")
+
+    # StorageBackend interface
+
+    def load(self) -> Dict[str, Any]:
+        """Load the configuration.
+
+        Publishers load from the wrapped backend and publish the result. Subscribers
+        attach the latest generation; lazy subscribers return no sections yet.
+
+        Returns:
+            Dictionary containing the configuration data
+
+        Raises:
+            StorageError: If loading fails, or nothing has been published yet
+        """
+        if self.publisher:
+            data = self.backend.load()
+            self.publish(data)
+            return data
+
+        self.refresh()
+        with self._lock:
+            if self._snapshot is None:
+                raise StorageError(f"No configuration published to shared memory as {self.name}")
+            self._loaded = set()
+            if self.lazy:
+                return {}
+            data = self._snapshot.to_python()
+        return data if isinstance(data, dict) else {}
+
+    def load_section(self, key: str) -> Any:
+        if not self.lazy:
+            raise KeyError(key)
+        with self._lock:
+            if self._snapshot is None or key in self._loaded:
+                raise KeyError(key)
+            value = self._snapshot.load(key)
+            self._loaded.add(key)
+            return value
+
+    def pending_sections(self) -> List[str]:
+        # Sections left out of a refresh stay unloaded rather than being decoded by it
+        if not self.lazy or getattr(self._local, "syncing", False):
+            return []
+        with self._lock:
+            if self._snapshot is None:
+                return []
+            return [key for key in self._snapshot.keys() if key not in self._loaded]
+
+    def save(self, data: Dict[str, Any]) -> bool:
+        """Save to the wrapped backend and publish the data.
+
+        Args:
+            data: Configuration data to save
+
+        Returns:
+            True if the data was saved and published, False otherwise. Subscribers
+            cannot save and always return False.
+        """
+        if not self.publisher:
+            self.logger.warning(f"Cannot save to shared configuration {self.name} as a subscriber")
+            return False
+        if not self.backend.save(data):
+            return False
+        return self.publish(data)
+
+    def cleanup(self) -> None:
+        """Release the shared memory.
+
+        Publishers remove the published configuration and clean up the wrapped
+        backend; subscribers that are attached keep their current generation.
+        """
+        if self.publisher:
+            with self._lock:
+                if self._segment is not None:
+                    self._release(self._segment)
+                    self._segment = None
+                if self._control is not None:
+                    self._release(self._control)
+                    self._control = None
+            self.backend.cleanup()
+            return
+
+        self.stop_watching()
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+            self._published = None
@@ -0,0 +1,253 @@
+"""
+File change watcher for storage backends.
+
+Uses inotify on Linux and falls back to polling the file's stat elsewhere.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Union
+
+# inotify constants, see <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Load the inotify functions from libc, or return None where unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class _InotifySource:
+    """Waits for inotify events about one file in its parent directory.
+
+    The directory is watched rather than the file, so atomic replacements, which
+    swap in a new inode, keep being noticed.
+    """
+
+    name = "inotify"
+
+    def __init__(self, libc, path: Path):
+        self._name = os.fsencode(path.name)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        if libc.inotify_add_watch(self._fd, os.fsencode(path.parent), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path.parent}")
+
+        # Self-pipe used to interrupt a blocking wait
+        self._wake_read, self._wake_write = os.pipe()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Wait for a change to the file.
+
+        Returns:
+            True if the file changed, False on timeout or when closed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd, self._wake_read], [], [], remaining)
+            if not readable or self._wake_read in readable:
+                return False
+            if self._read_events():
+                return True
+
+    def _read_events(self) -> bool:
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        relevant = False
+        offset = 0
+        while offset < len(buffer):
+            _, _, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if name == self._name:
+                relevant = True
+        return relevant
+
+    def close(self) -> None:
+        os.write(self._wake_write, b"\0")
+
+    def release(self) -> None:
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            os.close(fd)
+
+
+class _PollingSource:
+    """Detects changes to a file by polling its stat."""
+
+    name = "polling"
+
+    def __init__(self, path: Path, interval: float):
+        self._path = path
+        self._interval = interval
+        self._closed = threading.Event()
+        self._signature = self._stat()
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Wait for a change to the file.
+
+        Returns:
+            True if the file changed, False on timeout or when closed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self._interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            if self._closed.wait(delay):
+                return False
+
+            signature = self._stat()
+            if signature != self._signature:
+                self._signature = signature
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self) -> None:
+        self._closed.set()
+
+    def release(self) -> None:
+        pass
+
+
+class FileWatcher:
+    """Watch a file and call back once a burst of changes has settled.
+
+    Editors often write a file in several steps (truncate, write, rename). The
+    watcher waits until no change was seen for ``debounce`` seconds before calling
+    back, so a burst results in a single callback. The callback runs in the
+    watcher's thread.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        callback: Callable[[], None],
+        debounce: float = 0.1,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            path: The file to watch
+            callback: Called without arguments after the file changed
+            debounce: Seconds without further changes before calling back (default: 0.1)
+            poll_interval: Seconds between stat checks when polling (default: 1.0)
+            use_inotify: Use inotify if available (default: True), otherwise poll
+            logger: Optional logger for logging messages
+        """
+        self.path = Path(path).absolute()
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._source = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def method(self) -> Optional[str]:
+        """How changes are detected ("inotify" or "polling"), None if not running."""
+        return self._source.name if self._source else None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _create_source(self):
+        libc = _load_inotify() if self.use_inotify else None
+        if libc is not None:
+            try:
+                return _InotifySource(libc, self.path)
+            except OSError as e:
+                self.logger.warning(f"inotify unavailable ({e}), polling {self.path} instead")
+        return _PollingSource(self.path, self.poll_interval)
+
+    def start(self) -> None:
+        """Start watching in a background thread."""
+        if self.running:
+            return
+
+        self._stopped.clear()
+        self._source = self._create_source()
+        self._thread = threading.Thread(
+            target=self._run, name=f"nekoconf-watch-{self.path.name}", daemon=True
+        )
+        self._thread.start()
+        self.logger.debug(f"Watching {self.path} using {self._source.name}")
+
+    def stop(self) -> None:
+        """Stop watching and wait for the background thread to finish."""
+        if self._source is None:
+            return
+
+        self._stopped.set()
+        self._source.close()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._source.release()
+        self._source = None
+        self._thread = None
+
+    def _run(self) -> None:
+        source = self._source
+        while not self._stopped.is_set():
+            if not source.wait(None):
+                continue
+
+            # Debounce: wait until the file has been quiet for a while
+            while source.wait(self.debounce):
+                pass
+
+            if self._stopped.is_set():
+                break
+
+            try:
+                self.callback()
+            except Exception as e:
+                self.logger.error(f"Error handling change of {self.path}: {e}")
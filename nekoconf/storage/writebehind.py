@@ -0,0 +1,284 @@
+"""
+Write-behind storage backend.
+"""
+
+import atexit
+import copy
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+from .base import StorageBackend
+
+
+class WriteBehindBackend(StorageBackend):
+    """Storage backend wrapper that coalesces saves.
+
+    Saves are acknowledged immediately and only the latest data is written to the
+    wrapped backend, once the flush interval has passed since the first unsaved
+    change or once ``max_pending`` saves have accumulated. A burst of saves thus
+    costs a single serialization and write.
+
+    Pending data is flushed before loading, on ``flush()``, on ``cleanup()`` and at
+    interpreter exit. As it is written later from a background thread, ``save()``
+    queues a copy of the data, so the caller may keep changing its own.
+    """
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        flush_interval: float = 1.0,
+        max_pending: int = 100,
+        logger=None,
+    ):
+        """Initialize the write-behind backend.
+
+        Args:
+            backend: The storage backend that data is eventually written to
+            flush_interval: Seconds to wait after the first unsaved change before
+                            flushing (default: 1.0)
+            max_pending: Number of coalesced saves that triggers an immediate flush
+                         (default: 100)
+            logger: Optional logger for logging messages
+
+        Raises:
+            ValueError: If flush_interval is negative or max_pending is below 1
+        """
+        super().__init__(logger=logger or backend.logger)
+
+        if flush_interval < 0:
+            raise ValueError("flush_interval must not be negative")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        # _lock guards the pending state, _flush_lock keeps flushes in order without
+        # blocking new saves while the wrapped backend is writing
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._pending_data: Optional[Dict[str, Any]] = None
+        self._pending_count = 0
+        self._first_pending_at: Optional[float] = None
+        self._local = threading.local()
+
+        # Metrics
+        self._saves = 0
+        self._coalesced = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._last_flush_latency = 0.0
+        self._max_flush_latency = 0.0
+        self._total_flush_latency = 0.0
+        self._max_staleness = 0.0
+
+        # Flush at interpreter exit without keeping the backend alive
+        self._exit_hook = _make_exit_hook(weakref.ref(self))
+        atexit.register(self._exit_hook)
+
+    def __str__(self):
+        return (
+            f"{self.__class__.__name__}(backend={self.backend}, "
+            f"flush_interval={self.flush_interval}, max_pending={self.max_pending})"
+        )
+
+    @property
+    def _sync_handler(self) -> Optional[Callable[[Dict[str, Any]], None]]:
+        return self.__dict__.get("_handler")
+
+    @_sync_handler.setter
+    def _sync_handler(self, handler: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+        self.__dict__["_handler"] = handler
+        if "backend" in self.__dict__:
+            self.backend._sync_handler = self._forward_sync if handler else None
+
+    @property
+    def _patch_handler(self) -> Optional[Callable[[List[Dict[str, Any]]], bool]]:
+        return self.__dict__.get("_patcher")
+
+    @_patch_handler.setter
+    def _patch_handler(self, handler: Optional[Callable[[List[Dict[str, Any]]], bool]]) -> None:
+        self.__dict__["_patcher"] = handler
+        if "backend" in self.__dict__:
+            self.backend._patch_handler = self._forward_patch if handler else None
+
+    def _forward_patch(self, ops: List[Dict[str, Any]]) -> bool:
+        """Pass patches from the wrapped backend on, except echoes of our own flushes."""
+        if getattr(self._local, "flushing", False):
+            return True
+        return self.patch(ops)
+
+    def _forward_sync(self, data: Dict[str, Any]) -> None:
+        """Pass syncs from the wrapped backend on, except echoes of our own flushes.
+
+        A flush may write data older than the caller's current state, so handing it
+        back to the caller would undo newer changes.
+        """
+        if getattr(self._local, "flushing", False):
+            return
+        handler = self._sync_handler
+        if handler:
+            handler(data)
+
+    def load(self) -> Dict[str, Any]:
+        """Flush pending data, then load from the wrapped backend.
+
+        Returns:
+            Dictionary containing the configuration data
+
+        Raises:
+            StorageError: If loading fails
+        """
+        self.flush()
+        return self.backend.load()
+
+    def reload(self) -> Dict[str, Any]:
+        self.flush()
+        return self.backend.reload()
+
+    @property
+    def lazy(self) -> bool:
+        return self.backend.lazy
+
+    def load_section(self, key: str) -> Any:
+        return self.backend.load_section(key)
+
+    def pending_sections(self) -> List[str]:
+        return self.backend.pending_sections()
+
+    def save(self, data: Dict[str, Any]) -> bool:
+        """Queue configuration data to be saved.
+
+        Args:
+            data: Configuration data to save
+
+        Returns:
+            True once the data is queued, or the result of the flush if this save
+            reached max_pending
+        """
+        # Copying is much cheaper than serializing, and keeps the flush from seeing
+        # the caller's later changes
+        data = copy.deepcopy(data)
+
+        with self._lock:
+            self._saves += 1
+            if self._pending_count:
+                self._coalesced += 1
+            else:
+                self._first_pending_at = time.monotonic()
+            self._pending_data = data
+            self._pending_count += 1
+
+            flush_now = self._pending_count >= self.max_pending
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush_now:
+            return self.flush()
+        return True
+
+    def flush(self) -> bool:
+        """Write the pending data to the wrapped backend now.
+
+        Returns:
+            True if there was nothing to flush or the write succeeded, False otherwise
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+                if self._pending_count == 0:
+                    return True
+
+                data = self._pending_data
+                first_pending_at = self._first_pending_at
+                self._pending_data = None
+                self._pending_count = 0
+                self._first_pending_at = None
+
+            start = time.monotonic()
+            self._local.flushing = True
+            try:
+                success = self.backend.save(data)
+            except Exception as e:
+                self.logger.error(f"Error flushing configuration: {e}")
+                success = False
+            finally:
+                self._local.flushing = False
+            end = time.monotonic()
+
+            with self._lock:
+                latency = end - start
+                self._flushes += 1
+                self._last_flush_latency = latency
+                self._max_flush_latency = max(self._max_flush_latency, latency)
+                self._total_flush_latency += latency
+                self._max_staleness = max(self._max_staleness, end - first_pending_at)
+
+                if not success:
+                    self._failed_flushes += 1
+                    self._requeue(data, first_pending_at)
+            return success
+
+    def _requeue(self, data: Dict[str, Any], first_pending_at: float) -> None:
+        """Keep failed data pending, unless newer data was queued in the meantime.
+
+        The data is retried on the next save or explicit flush.
+        """
+        if self._pending_count == 0:
+            self._pending_data = data
+            self._pending_count = 1
+            self._first_pending_at = first_pending_at
+
+    @property
+    def pending(self) -> int:
+        """Number of saves waiting to be flushed."""
+        return self._pending_count
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get save coalescing and flush latency metrics.
+
+        Returns:
+            Dictionary with the number of saves, saves superseded by a later one before
+            being written, saves still pending, flushes and failed flushes, and flush
+            latencies and the maximum time data stayed unsaved, in seconds
+        """
+        with self._lock:
+            return {
+                "saves": self._saves,
+                "coalesced_saves": self._coalesced,
+                "pending_saves": self._pending_count,
+                "flushes": self._flushes,
+                "failed_flushes": self._failed_flushes,
+                "last_flush_latency": self._last_flush_latency,
+                "max_flush_latency": self._max_flush_latency,
+                "avg_flush_latency": (
+                    self._total_flush_latency / self._flushes if self._flushes else 0.0
+                ),
+                "max_staleness": self._max_staleness,
+            }
+
+    def cleanup(self) -> None:
+        """Flush pending data and clean up the wrapped backend."""
+        self.flush()
+        atexit.unregister(self._exit_hook)
+        self.backend.cleanup()
+
+
+def _make_exit_hook(backend_ref: "weakref.ref[WriteBehindBackend]") -> Callable[[], None]:
+    """Create an atexit hook flushing the backend if it is still alive."""
+
+    def flush_at_exit() -> None:
+        backend = backend_ref()
+        if backend is not None:
+            backend.flush()
+
+    return flush_at_exit
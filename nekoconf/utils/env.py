@@ -2,13 +2,97 @@
 
 This module provides functionality to override configuration values with
 environment variables using various strategies and patterns.
+
+Matching environment variables are resolved once into an override plan of
+compiled paths and parsed values. The plan is reused by every load until the
+process environment or the handler's settings change.
 """
 
+import copy
 import logging
 import os
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from .helper import (
+    CompiledPath,
+    compile_path,
+    get_nested_value,
+    getLogger,
+    parse_value,
+    set_nested_value,
+)
+
+# Parsed values of these types are immutable and can be shared between loads
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _environ_data() -> Mapping:
+    """Get the live mapping behind ``os.environ``.
+
+    Where available this is the undecoded mapping, which is much cheaper to
+    compare than decoding every variable.
+    """
+    data = getattr(os.environ, "_data", None)
+    return data if isinstance(data, dict) else os.environ
+
+
+def _build_path_trie(paths: List[str]) -> Dict[str, Any]:
+    """Build a trie of dot-separated paths, a None key marking the end of a path."""
+    trie: Dict[str, Any] = {}
+    for path in paths:
+        node = trie
+        for key in path.split("."):
+            if None in node:
+                break  # A shorter path already covers this one
+            node = node.setdefault(key, {})
+        else:
+            node.clear()
+            node[None] = None
+    return trie
+
+
+def _trie_covers(trie: Dict[str, Any], keys: List[str]) -> bool:
+    """Check whether a trie holds a path equal to, or a parent of, the given keys."""
+    node = trie
+    for key in keys:
+        if None in node:
+            return True
+        node = node.get(key)
+        if node is None:
+            return False
+    return None in node
+
 
-from .helper import get_nested_value, getLogger, parse_value, set_nested_value
+class EnvOverride:
+    """An environment variable resolved to a configuration path and value."""
+
+    __slots__ = ("env_name", "raw_value", "key", "path", "value", "error")
+
+    def __init__(
+        self,
+        env_name: str,
+        raw_value: str,
+        key: str,
+        path: Optional[CompiledPath] = None,
+        value: Any = None,
+        error: Optional[Exception] = None,
+    ):
+        """Initialize an override.
+
+        Args:
+            env_name: The environment variable name
+            raw_value: The environment variable value
+            key: The configuration key path
+            path: The compiled configuration key path
+            value: The parsed value
+            error: The error raised while resolving the variable, if any
+        """
+        self.env_name = env_name
+        self.raw_value = raw_value
+        self.key = key
+        self.path = path
+        self.value = value
+        self.error = error
 
 
 class EnvOverrideHandler:
@@ -42,21 +126,24 @@ class EnvOverrideHandler:
             strict_parsing: If True, raises exceptions when parsing fails rather than logging a warning
             create_missing_keys: If True, allows creation of new config keys. If False, only updates existing keys.
         """
-        self.prefix = prefix.rstrip("_") if prefix else ""
-        self.nested_delimiter = nested_delimiter
-        self.include_paths = include_paths or []
-        self.exclude_paths = exclude_paths or []
+        self._prefix = prefix.rstrip("_") if prefix else ""
+        self._nested_delimiter = nested_delimiter
+        self._include_paths = include_paths or []
+        self._exclude_paths = exclude_paths or []
         self.logger = logger or getLogger(__name__)
-        self.preserve_case = preserve_case
+        self._preserve_case = preserve_case
         self.strict_parsing = strict_parsing
         self.create_missing_keys = create_missing_keys
 
-        # Cache the prefix pattern for better performance
-        self.prefix_pattern = f"{self.prefix}{self.nested_delimiter}" if self.prefix else ""
-
         # System environment variables to skip when no prefix is used
         self.system_vars = ("_", "PATH", "HOME", "USER", "SHELL", "TERM")
 
+        # Override plan, rebuilt when the environment differs from its snapshot
+        # or when one of the settings it is resolved with is assigned
+        self._plan: Optional[List[EnvOverride]] = None
+        self._plan_environ: Optional[Dict] = None
+        self.invalidate()
+
         # Warn if no prefix is used
         if not self.prefix:
             self.logger.warning(
@@ -64,6 +151,67 @@ class EnvOverrideHandler:
                 "This may lead to conflicts with system variables."
             )
 
+    @property
+    def prefix(self) -> str:
+        """Prefix of the environment variables, without trailing underscores."""
+        return self._prefix
+
+    @prefix.setter
+    def prefix(self, value: str) -> None:
+        self._prefix = value.rstrip("_") if value else ""
+        self.invalidate()
+
+    @property
+    def nested_delimiter(self) -> str:
+        """Delimiter used in environment variable names for nested keys."""
+        return self._nested_delimiter
+
+    @nested_delimiter.setter
+    def nested_delimiter(self, value: str) -> None:
+        self._nested_delimiter = value
+        self.invalidate()
+
+    @property
+    def prefix_pattern(self) -> str:
+        """Start of the names of matching environment variables."""
+        return f"{self._prefix}{self._nested_delimiter}" if self._prefix else ""
+
+    @property
+    def include_paths(self) -> List[str]:
+        """Dot-separated paths to include in overrides, all paths if empty.
+
+        Call ``invalidate`` after changing the list in place.
+        """
+        return self._include_paths
+
+    @include_paths.setter
+    def include_paths(self, value: Optional[List[str]]) -> None:
+        self._include_paths = value or []
+        self.invalidate()
+
+    @property
+    def exclude_paths(self) -> List[str]:
+        """Dot-separated paths to exclude from overrides.
+
+        Call ``invalidate`` after changing the list in place.
+        """
+        return self._exclude_paths
+
+    @exclude_paths.setter
+    def exclude_paths(self, value: Optional[List[str]]) -> None:
+        self._exclude_paths = value or []
+        self.invalidate()
+
+    @property
+    def preserve_case(self) -> bool:
+        """Whether keys keep the case of the environment variable names."""
+        return self._preserve_case
+
+    @preserve_case.setter
+    def preserve_case(self, value: bool) -> None:
+        self._preserve_case = value
+        self.invalidate()
+
     def apply_overrides(
         self, config_data: Dict[str, Any], in_place: bool = False
     ) -> Dict[str, Any]:
@@ -86,19 +234,37 @@ class EnvOverrideHandler:
         if applied:
             error_msg = f" with {errors} errors" if errors else ""
             self.logger.debug(f"Applied {applied} environment overrides{error_msg}")
-            
+
         return effective_data
 
-    def _apply_matching_env_vars(self, data: Dict[str, Any]) -> Tuple[int, int]:
-        """Find matching environment variables and apply them to the config.
+    def get_plan(self) -> List[EnvOverride]:
+        """Get the overrides of the matching environment variables, in environment order.
 
-        Args:
-            data: The configuration data to modify
+        The plan is built on first use and rebuilt only when the process environment
+        or the handler's settings changed since, so repeated loads skip matching and
+        parsing the variables.
 
         Returns:
-            Tuple of (applied_count, error_count)
+            The resolved overrides
         """
-        applied, errors = 0, 0
+        environ = _environ_data()
+        if self._plan is None or environ != self._plan_environ:
+            self._plan_environ = dict(environ)
+            self._plan = self._build_plan()
+        return self._plan
+
+    def invalidate(self) -> None:
+        """Discard the override plan, e.g. after changing the include or exclude paths in place.
+
+        Assigning the prefix, delimiter, paths or case setting discards it as well.
+        """
+        self._include_trie = _build_path_trie(self._include_paths)
+        self._exclude_trie = _build_path_trie(self._exclude_paths)
+        self._plan = None
+
+    def _build_plan(self) -> List[EnvOverride]:
+        """Resolve the matching environment variables into overrides."""
+        plan = []
 
         for env_name, value in os.environ.items():
             # Skip variables that don't match our criteria
@@ -108,26 +274,51 @@ class EnvOverrideHandler:
             # Extract and convert the key part
             try:
                 config_key = self._env_var_to_config_key(env_name)
+            except ValueError as e:
+                self.logger.debug(f"Skipping env var '{env_name}': {e}")
+                continue
 
-                # Check if this key should be overridden based on include/exclude rules
-                if not self._should_override(config_key):
-                    continue
+            # Check if this key should be overridden based on include/exclude rules
+            if not self._should_override(config_key):
+                continue
 
-                # Check if we should create new keys or only update existing ones
-                if not self.create_missing_keys and not self._key_exists(data, config_key):
-                    self.logger.debug(
-                        f"Skipping new key '{config_key}' (create_missing_keys=False)"
-                    )
-                    continue
+            override = EnvOverride(env_name, value, config_key)
+            try:
+                override.path = compile_path(config_key)
+                override.value = parse_value(value)
+            except Exception as e:
+                override.error = e
+            plan.append(override)
 
-                # Apply the override
-                if self._set_config_value(data, config_key, env_name, value):
-                    applied += 1
-                else:
-                    errors += 1
+        self.logger.debug(f"Built environment override plan with {len(plan)} overrides")
+        return plan
 
-            except ValueError as e:
-                self.logger.debug(f"Skipping env var '{env_name}': {e}")
+    def _apply_matching_env_vars(self, data: Dict[str, Any]) -> Tuple[int, int]:
+        """Find matching environment variables and apply them to the config.
+
+        Args:
+            data: The configuration data to modify
+
+        Returns:
+            Tuple of (applied_count, error_count)
+        """
+        applied, errors = 0, 0
+
+        for override in self.get_plan():
+            # Check if we should create new keys or only update existing ones
+            if (
+                not self.create_missing_keys
+                and override.path is not None
+                and not self._key_exists(data, override.path)
+            ):
+                self.logger.debug(f"Skipping new key '{override.key}' (create_missing_keys=False)")
+                continue
+
+            # Apply the override
+            if self._set_config_value(data, override):
+                applied += 1
+            else:
+                errors += 1
 
         return applied, errors
 
@@ -186,7 +377,7 @@ class EnvOverrideHandler:
 
         return config_key
 
-    def _key_exists(self, data: Dict[str, Any], key: str) -> bool:
+    def _key_exists(self, data: Dict[str, Any], key: Union[str, CompiledPath]) -> bool:
         """Check if a configuration key already exists in the data.
 
         Args:
@@ -209,48 +400,49 @@ class EnvOverrideHandler:
         Returns:
             True if the key should be overridden
         """
+        keys = config_key.split(".")
+
         # Check exclusions first (higher precedence)
-        if any(
-            config_key == pattern or config_key.startswith(f"{pattern}.")
-            for pattern in self.exclude_paths
-        ):
+        if self._exclude_trie and _trie_covers(self._exclude_trie, keys):
             return False
 
         # If includes specified, check if key matches any include pattern
-        if self.include_paths:
-            return any(
-                config_key == pattern or config_key.startswith(f"{pattern}.")
-                for pattern in self.include_paths
-            )
+        if self._include_trie:
+            return _trie_covers(self._include_trie, keys)
 
         # By default, include everything if no specific includes are defined
         return True
 
-    def _set_config_value(self, data: Dict[str, Any], key: str, env_name: str, value: str) -> bool:
-        """Set a configuration value from an environment variable.
+    def _set_config_value(self, data: Dict[str, Any], override: EnvOverride) -> bool:
+        """Set a configuration value from an environment variable override.
 
         Args:
             data: The configuration data to modify
-            key: The configuration key path
-            env_name: The environment variable name (for logging)
-            value: The environment variable value
+            override: The resolved override
 
         Returns:
             True if successful, False if error occurred
         """
         try:
-            # Parse the value string to appropriate type
-            parsed_value = parse_value(value)
+            if override.error is not None:
+                raise override.error
+
+            # Containers are copied, the plan's value is shared by every load
+            value = override.value
+            if not isinstance(value, _IMMUTABLE_TYPES):
+                value = copy.deepcopy(value)
 
             # Set the value in the configuration
-            set_nested_value(data, key, parsed_value)
+            set_nested_value(data, override.path, value)
 
             # Log the override
-            self.logger.debug(f"Applied override: {env_name}='{value}' -> {key}")
+            self.logger.debug(
+                f"Applied override: {override.env_name}='{override.raw_value}' -> {override.key}"
+            )
             return True
 
         except Exception as e:
-            error_msg = f"Failed to set '{key}' from env var '{env_name}': {e}"
+            error_msg = f"Failed to set '{override.key}' from env var '{override.env_name}': {e}"
 
             if self.strict_parsing:
                 raise ValueError(error_msg)
@@ -5,13 +5,19 @@ This module provides common utility functions used across the NekoConf package.
 
 import ast
 import copy
+import functools
+import hashlib
 import inspect
 import json
 import logging
 import os
 import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 try:
     import colorlog
@@ -23,6 +29,16 @@ try:
 except ImportError:
     yaml = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 try:
     import tomllib  # Python >= 3.11
 except ImportError:
@@ -31,18 +47,43 @@ except ImportError:
     except ImportError:
         tomllib = None  # TOML support will be disabled
 
+# fsync policies for write_file_atomic
+FSYNC_NONE = "none"  # rely on the OS to flush the data
+FSYNC_FILE = "file"  # flush the file contents before it is renamed into place
+FSYNC_FILE_DIR = "file+dir"  # also flush the directory so the rename itself survives a crash
+FSYNC_POLICIES = (FSYNC_NONE, FSYNC_FILE, FSYNC_FILE_DIR)
+
 
 __all__ = [
     "getLogger",
     "create_file_if_not_exists",
     "save_file",
+    "serialize_file_data",
+    "Codec",
+    "register_codec",
+    "get_codec",
+    "codec_info",
+    "JSON_BACKENDS",
+    "use_json_backend",
+    "write_file_atomic",
+    "FSYNC_POLICIES",
     "load_file",
+    "read_file_data",
+    "parse_file_data",
+    "fingerprint_bytes",
+    "parse_cache_info",
+    "clear_parse_cache",
+    "configure_parse_cache",
     "parse_value",
     "deep_merge",
     "get_nested_value",
     "set_nested_value",
     "delete_nested_value",
     "parse_path",
+    "compile_path",
+    "CompiledPath",
+    "path_cache_info",
+    "clear_path_cache",
     "is_async_callable",
 ]
 
@@ -132,12 +173,298 @@ def create_file_if_not_exists(file_path: Union[str, Path]) -> None:
         raise IOError(f"Failed to create file: {e}") from e
 
 
-def save_file(path: Union[str, Path], data: Any, logger: Optional[logging.Logger] = None) -> bool:
+class Codec:
+    """Converts configuration data to and from file content."""
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[bytes], Any],
+        dumps: Callable[[Any], bytes],
+    ):
+        """Initialize the codec.
+
+        Args:
+            name: Name of the implementation, e.g. "yaml-libyaml" or "json-orjson"
+            loads: Parses file content into data
+            dumps: Serializes data into file content
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+def _json_dumps(data: Any) -> bytes:
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _stdlib_json_codec() -> Codec:
+    return Codec("json", json.loads, _json_dumps)
+
+
+def _orjson_codec() -> Codec:
+    options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+    def loads(content: bytes) -> Any:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Also raises the usual error for content that is really invalid
+            return json.loads(content)  # NaN and Infinity, which orjson rejects
+
+    def dumps(data: Any) -> bytes:
+        try:
+            return orjson.dumps(data, option=options)
+        except TypeError:
+            return _json_dumps(data)  # Integers beyond 64 bits, unsupported types
+
+    return Codec("json-orjson", loads, dumps)
+
+
+def _ujson_codec() -> Codec:
+    def dumps(data: Any) -> bytes:
+        try:
+            text = ujson.dumps(data, indent=2, ensure_ascii=False, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return _json_dumps(data)
+        return text.encode("utf-8")
+
+    return Codec("json-ujson", ujson.loads, dumps)
+
+
+# JSON implementations by preference
+JSON_BACKENDS = {
+    "orjson": _orjson_codec if orjson else None,
+    "ujson": _ujson_codec if ujson else None,
+    "json": _stdlib_json_codec,
+}
+
+
+def _yaml_codec() -> Codec:
+    # The libyaml bindings are several times faster than the pure Python ones
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+    def loads(content: bytes) -> Any:
+        return yaml.load(content, Loader=loader) or {}
+
+    def dumps(data: Any) -> bytes:
+        text = yaml.dump(data, Dumper=dumper, default_flow_style=False, sort_keys=False, indent=2)
+        return text.encode("utf-8")
+
+    return Codec("yaml-libyaml" if loader is not yaml.SafeLoader else "yaml", loads, dumps)
+
+
+def _toml_codec() -> Codec:
+    def loads(content: bytes) -> Any:
+        if not tomllib:
+            raise ImportError(
+                "TOML format requested but tomllib/tomli package not available. "
+                "Install with: pip install tomli"
+            )
+        return tomllib.loads(content.decode("utf-8")) or {}
+
+    def dumps(data: Any) -> bytes:
+        try:
+            import tomli_w
+        except ImportError as e:
+            raise ImportError(
+                "TOML format requested but tomli_w package not available. "
+                "Install with: pip install tomli_w"
+            ) from e
+        return tomli_w.dumps(data).encode("utf-8")
+
+    return Codec("toml", loads, dumps)
+
+
+_CODECS: Dict[str, Codec] = {}
+_SUFFIX_FORMATS: Dict[str, str] = {}
+DEFAULT_FORMAT = "yaml"  # Also used for unknown file extensions
+
+
+def register_codec(format: str, codec: Codec, suffixes: Iterable[str] = ()) -> None:
+    """Register the codec used for a format, replacing any previous one.
+
+    Args:
+        format: Name of the format, e.g. "yaml"
+        codec: The codec to use
+        suffixes: File extensions of the format, e.g. [".yaml", ".yml"]
+    """
+    _CODECS[format] = codec
+    for suffix in suffixes:
+        _SUFFIX_FORMATS[suffix.lower()] = format
+
+
+def get_codec(path_or_format: Union[str, Path]) -> Codec:
+    """Get the codec for a file path (by its extension) or a format name.
+
+    Args:
+        path_or_format: A file path, or a registered format name such as "json"
+
+    Returns:
+        The codec, the YAML codec for unknown extensions, or JSON if YAML is unavailable
+    """
+    if isinstance(path_or_format, str) and path_or_format in _CODECS:
+        return _CODECS[path_or_format]
+
+    format = _SUFFIX_FORMATS.get(Path(path_or_format).suffix.lower(), DEFAULT_FORMAT)
+    return _CODECS.get(format) or _CODECS["json"]
+
+
+def codec_info() -> Dict[str, str]:
+    """Get the implementation used for each format.
+
+    Returns:
+        Dictionary mapping format names to codec names
+    """
+    return {format: codec.name for format, codec in _CODECS.items()}
+
+
+def use_json_backend(backend: Optional[str] = None) -> Codec:
+    """Select the JSON implementation.
+
+    The standard library is used unless another backend is selected. orjson and
+    ujson are faster, but optional: they are not installed with NekoConf. They fall
+    back to the standard library for data they cannot handle, such as NaN in a
+    document or integers beyond 64 bits. Note that orjson writes NaN and Infinity
+    as null, so saving such data with it changes the data.
+
+    Args:
+        backend: "orjson", "ujson" or "json", or None for the fastest installed one:
+                 orjson, then ujson, then the standard library
+
+    Returns:
+        The JSON codec now in use
+
+    Raises:
+        ValueError: If the backend is unknown
+        ImportError: If the backend is not installed
+    """
+    if backend is None:
+        factory = next(factory for factory in JSON_BACKENDS.values() if factory)
+    elif backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend {backend!r}, expected one of {list(JSON_BACKENDS)}")
+    else:
+        factory = JSON_BACKENDS[backend]
+        if factory is None:
+            raise ImportError(
+                f"JSON backend {backend!r} requested but not available. "
+                f"Install with: pip install {backend}"
+            )
+
+    codec = factory()
+    register_codec("json", codec, [".json"])
+    return codec
+
+
+use_json_backend("json")
+register_codec("toml", _toml_codec(), [".toml"])
+if yaml:
+    register_codec("yaml", _yaml_codec(), [".yaml", ".yml"])
+
+
+def serialize_file_data(path: Union[str, Path], data: Any) -> bytes:
+    """Serialize data to YAML, JSON, or TOML based on file extension.
+
+    Args:
+        path: Path of the file the data is meant for
+        data: Data to serialize
+
+    Returns:
+        The file content
+
+    Raises:
+        ImportError: If TOML is requested but tomli_w is not available
+    """
+    return get_codec(path).dumps(data)
+
+
+def _create_temp_file(path: Path, mode: int) -> Tuple[int, str]:
+    """Create a new temporary file next to a path, the umask applied to its mode.
+
+    Returns:
+        Tuple of (file descriptor, temporary file path)
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        temp_path = str(path.parent / f".{path.name}.{secrets.token_hex(6)}.tmp")
+        try:
+            return os.open(temp_path, flags, mode), temp_path
+        except FileExistsError:
+            continue
+
+
+def write_file_atomic(path: Union[str, Path], content: bytes, fsync: str = FSYNC_NONE) -> None:
+    """Replace a file's content atomically.
+
+    The content is written to a temporary file in the same directory, which is then
+    renamed over the target. Readers see either the old or the new file, and a crash
+    in the middle of a write never leaves a truncated file behind.
+
+    Args:
+        path: Path to the file (symlinks are followed)
+        content: The new file content
+        fsync: One of "none", "file" (flush the data before the rename) or
+               "file+dir" (also flush the directory entry after the rename)
+
+    Raises:
+        ValueError: If the fsync policy is unknown
+        OSError: If the file cannot be written
+    """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Unknown fsync policy {fsync!r}, expected one of {FSYNC_POLICIES}")
+
+    path = Path(os.path.realpath(path))
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Replacements keep the file's mode, new files get the current umask applied
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+
+    fd, temp_path = _create_temp_file(path, 0o600 if mode is not None else 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if mode is not None:
+                os.chmod(temp_path, mode)
+            f.write(content)
+            if fsync != FSYNC_NONE:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync == FSYNC_FILE_DIR and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def save_file(
+    path: Union[str, Path],
+    data: Any,
+    logger: Optional[logging.Logger] = None,
+    fsync: str = FSYNC_NONE,
+) -> bool:
     """Save data to a YAML, JSON, or TOML file based on file extension.
 
+    The file is replaced atomically, see write_file_atomic.
+
     Args:
         path: Path to the file
         data: Data to save
+        fsync: fsync policy, one of "none", "file" or "file+dir"
 
     Returns:
         True if successful, False otherwise
@@ -145,42 +472,7 @@ def save_file(path: Union[str, Path], data: Any, logger: Optional[logging.Logger
     path = Path(path)
     logger = logger or getLogger(__name__)
     try:
-        # Create parent directory if it doesn't exist
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Determine file format
-        if path.suffix.lower() == ".yaml" or path.suffix.lower() == ".yml":
-            # Save as YAML
-            with open(path, "w") as f:
-                if yaml:
-                    yaml.dump(data, f, default_flow_style=False, sort_keys=False, indent=2)
-                else:
-                    json.dump(data, f, indent=2, ensure_ascii=False)  # Fallback to JSON
-        elif path.suffix.lower() == ".json":
-            # Save as JSON
-            with open(path, "w") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        elif path.suffix.lower() == ".toml":
-            # Save as TOML
-            try:
-                import tomli_w
-
-                with open(path, "wb") as f:
-                    tomli_w.dump(data, f)
-            except ImportError:
-                logger.error(
-                    "TOML format requested but tomli_w package not available. "
-                    "Install with: pip install tomli_w"
-                )
-                return False
-        else:
-            # Default to YAML for unknown extensions
-            with open(path, "w") as f:
-                if yaml:
-                    yaml.dump(data, f, default_flow_style=False, sort_keys=False, indent=2)
-                else:
-                    json.dump(data, f, indent=2, ensure_ascii=False)  # Fallback to JSON
-
+        write_file_atomic(path, serialize_file_data(path, data), fsync=fsync)
         return True
     except Exception as e:
         logger.error(f"Error saving file {path}: {e}")
@@ -200,20 +492,217 @@ def load_string(data: str, format: str = "json") -> Any:
     if not data.strip():
         return {}
 
-    if format == "yaml":
-        return yaml.safe_load(data) or {}
-    elif format == "toml":
-        return tomllib.loads(data) or {}
-    else:
-        return json.loads(data)  # Fallback to JSON
+    if format not in ("yaml", "toml"):
+        format = "json"  # Fallback to JSON
+    return get_codec(format).loads(data.encode("utf-8"))
+
 
+def parse_file_data(path: Union[str, Path], content: bytes) -> Any:
+    """Parse YAML, JSON, or TOML file content based on file extension.
 
-def load_file(path: Union[str, Path], logger: Optional[logging.Logger] = None) -> Any:
+    Args:
+        path: Path of the file the content was read from
+        content: The raw file content
+
+    Returns:
+        The parsed data (empty dict for empty YAML and TOML documents)
+
+    Raises:
+        ImportError: If TOML is requested but tomllib/tomli is not available
+        Exception: If the content cannot be parsed
+    """
+    return get_codec(path).loads(content)
+
+
+def fingerprint_bytes(content: bytes) -> bytes:
+    """Hash file content, to detect unchanged files without comparing their data.
+
+    Args:
+        content: The raw content
+
+    Returns:
+        A 16 byte digest
+    """
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+def _clone_data(value: Any) -> Any:
+    """Copy the containers of parsed data, sharing the immutable leaves."""
+    if type(value) is dict:
+        return {key: _clone_data(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_clone_data(item) for item in value]
+    if isinstance(value, (dict, list, set)):
+        return copy.deepcopy(value)
+    return value
+
+
+# Bounds of the process-wide parse cache
+PARSE_CACHE_MAX_ENTRIES = 64
+PARSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Files modified this recently are not cached: file systems update mtime with a coarse
+# clock, so a second write of the same size could otherwise keep the same key
+_RACY_WINDOW_NS = 2_000_000_000
+
+# (absolute path, device, inode, size, mtime_ns) of a file version
+_FileKey = Tuple[str, int, int, int, int]
+
+
+class _ParseCache:
+    """
+    LRU cache of parsed files, keyed by the identity of the file version.
+
+    A rewrite changes the file's mtime or size, and an atomic replacement its
+    inode, so a hit costs a stat instead of a parse. Entries are never handed out
+    directly: callers get a copy of the containers, which they may mutate freely.
+    Memory is bounded by the number of entries and by the total size of the files.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[_FileKey, Tuple[Any, bytes, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def read(self, path: Union[str, Path]) -> Tuple[Any, bytes]:
+        path = Path(path)
+        with open(path, "rb") as f:
+            # fstat the open file, so the key always describes the content read below
+            stat = os.fstat(f.fileno())
+            key = (os.path.abspath(path), stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+            if entry is None:
+                content = f.read()
+                entry = (parse_file_data(path, content), fingerprint_bytes(content), len(content))
+                racy = time.time_ns() - stat.st_mtime_ns <= _RACY_WINDOW_NS
+                if racy or not self._store(key, entry):
+                    # Nobody else holds this data, no copy needed
+                    return entry[0], entry[1]
+
+        data, fingerprint, _ = entry
+        return _clone_data(data), fingerprint
+
+    def _store(self, key: _FileKey, entry: Tuple[Any, bytes, int]) -> bool:
+        size = entry[2]
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return False
+
+        with self._lock:
+            # Older versions of the same file can never be hit again
+            for stale in [k for k in self._entries if k[0] == key[0] and k != key]:
+                self._discard(stale)
+
+            if key not in self._entries:
+                self._entries[key] = entry
+                self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def _discard(self, key: _FileKey) -> None:
+        self._bytes -= self._entries.pop(key)[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_parse_cache = _ParseCache(PARSE_CACHE_MAX_ENTRIES, PARSE_CACHE_MAX_BYTES)
+
+
+def read_file_data(path: Union[str, Path], use_cache: bool = True) -> Tuple[Any, bytes]:
+    """Read and parse a YAML, JSON, or TOML file through the parse cache.
+
+    Args:
+        path: Path to the file
+        use_cache: If False, always parse the file and bypass the cache
+
+    Returns:
+        Tuple of (parsed data, fingerprint of the file content). The data is a
+        private copy the caller may mutate.
+
+    Raises:
+        OSError: If the file cannot be read
+        Exception: If the content cannot be parsed
+    """
+    if use_cache:
+        return _parse_cache.read(path)
+
+    with open(path, "rb") as f:
+        content = f.read()
+    return parse_file_data(path, content), fingerprint_bytes(content)
+
+
+def parse_cache_info() -> Dict[str, int]:
+    """Get statistics for the parse cache.
+
+    Returns:
+        Dictionary with hits, misses, evictions, entries, bytes and the bounds
+    """
+    return _parse_cache.info()
+
+
+def clear_parse_cache() -> None:
+    """Remove all entries from the parse cache and reset its counters."""
+    _parse_cache.clear()
+
+
+def configure_parse_cache(
+    max_entries: Optional[int] = None, max_bytes: Optional[int] = None
+) -> None:
+    """Change the bounds of the parse cache.
+
+    Args:
+        max_entries: Maximum number of cached files, 0 disables the cache
+        max_bytes: Maximum total size of the cached files; larger files are not cached
+    """
+    if max_entries is not None:
+        _parse_cache.max_entries = max_entries
+    if max_bytes is not None:
+        _parse_cache.max_bytes = max_bytes
+    _parse_cache.clear()
+
+
+def load_file(
+    path: Union[str, Path], logger: Optional[logging.Logger] = None, use_cache: bool = True
+) -> Any:
     """Load data from a YAML, JSON, or TOML file based on file extension.
 
+    Unchanged files are served from the parse cache.
+
     Args:
         path: Path to the file
         logger: Optional logger to use for warnings/errors
+        use_cache: If False, always parse the file and bypass the cache
 
     Returns:
         Loaded data, or empty dict if loading failed or file not found
@@ -226,40 +715,7 @@ def load_file(path: Union[str, Path], logger: Optional[logging.Logger] = None) -
         return {}  # Return empty dict instead of None
 
     try:
-        # Determine file format
-        if path.suffix.lower() == ".yaml" or path.suffix.lower() == ".yml":
-            # Load YAML
-            with open(path, "r") as f:
-                if yaml:
-                    return yaml.safe_load(f) or {}
-                else:
-                    return json.load(f)  # Fallback to JSON
-        elif path.suffix.lower() == ".json":
-            # Load JSON
-            with open(path, "r") as f:
-                return json.load(f)
-        elif path.suffix.lower() == ".toml":
-            # Load TOML
-            try:
-                if tomllib:
-                    with open(path, "rb") as f:
-                        return tomllib.load(f) or {}
-                else:
-                    logger.error(
-                        "TOML format requested but tomllib/tomli package not available. "
-                        "Install with: pip install tomli"
-                    )
-                    return {}
-            except Exception as e:
-                logger.error(f"Error parsing TOML file {path}: {e}")
-                return {}
-        else:
-            # Default to YAML for unknown extensions
-            with open(path, "r") as f:
-                if yaml:
-                    return yaml.safe_load(f) or {}
-                else:
-                    return json.load(f)  # Fallback to JSON
+        return read_file_data(path, use_cache=use_cache)[0]
     except Exception as e:
         logger.error(f"Error loading file {path}: {e}")
         return {}  # Return empty dict instead of None
@@ -329,6 +785,60 @@ def deep_merge(
     return result
 
 
+_PATH_SEGMENT_PATTERN = re.compile(r"^([^[\]]+)\[([^\]]+)\]$")
+
+# Maximum number of distinct compiled paths kept in the path cache
+PATH_CACHE_SIZE = 4096
+
+
+class CompiledPath:
+    """A pre-parsed configuration path.
+
+    Holds the path split into keys once, so repeated lookups of the same path
+    skip string splitting and regex matching. Instances are interned by
+    ``compile_path`` and are immutable.
+
+    Attributes:
+        path: The original dot notation path
+        keys: The path keys as strings, as returned by ``parse_path``
+        segments: The path keys with list indices already converted to ints
+    """
+
+    __slots__ = ("path", "keys", "segments")
+
+    def __init__(self, path: str):
+        """Compile a dot notation path.
+
+        Args:
+            path: The path to compile (enhanced dot notation)
+        """
+        keys = []
+        if path:
+            for segment in path.split("."):
+                keys.extend(_parse_path_segment(segment))
+
+        self.path = path
+        self.keys = tuple(keys)
+        self.segments = tuple(int(key) if key.isdecimal() else key for key in keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __str__(self) -> str:
+        return self.path
+
+    def __repr__(self) -> str:
+        return f"CompiledPath({self.path!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CompiledPath):
+            return self.path == other.path
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+
 def _parse_path_segment(segment: str) -> List[str]:
     """Parse a single path segment, handling array notation.
 
@@ -337,14 +847,52 @@ def _parse_path_segment(segment: str) -> List[str]:
         "key[0]" -> ["key", "0"]
         "key[*]" -> ["key", "*"]
     """
-    match = re.match(r"^([^[\]]+)\[([^\]]+)\]$", segment)
+    if "[" not in segment:
+        return [segment]
+
+    match = _PATH_SEGMENT_PATTERN.match(segment)
     if match:
         key, index = match.groups()
         return [key, index]
     return [segment]
 
 
-def parse_path(path: str) -> List[str]:
+@functools.lru_cache(maxsize=PATH_CACHE_SIZE)
+def _compile_path_cached(path: str) -> CompiledPath:
+    return CompiledPath(path)
+
+
+def compile_path(path: Union[str, CompiledPath]) -> CompiledPath:
+    """Get the interned compiled form of a dot notation path.
+
+    Compiled paths are kept in a bounded LRU cache, so the same string always
+    yields the same CompiledPath object while it stays cached.
+
+    Examples:
+        compile_path("servers[0].host").segments -> ("servers", 0, "host")
+    """
+    if type(path) is str:
+        return _compile_path_cached(path)
+    if isinstance(path, CompiledPath):
+        return path
+    return _compile_path_cached(path or "")
+
+
+def path_cache_info():
+    """Get statistics for the compiled path cache.
+
+    Returns:
+        Named tuple with hits, misses, maxsize and currsize
+    """
+    return _compile_path_cached.cache_info()
+
+
+def clear_path_cache() -> None:
+    """Remove all entries from the compiled path cache and reset its counters."""
+    _compile_path_cached.cache_clear()
+
+
+def parse_path(path: Union[str, CompiledPath]) -> List[str]:
     """Parse dot notation path into flat list of keys and indices.
 
     Examples:
@@ -355,14 +903,12 @@ def parse_path(path: str) -> List[str]:
     if not path:
         return []
 
-    result = []
-    for segment in path.split("."):
-        result.extend(_parse_path_segment(segment))
-
-    return result
+    return list(compile_path(path).keys)
 
 
-def get_nested_value(data: Dict[str, Any], path: str, default: Any = None) -> Any:
+def get_nested_value(
+    data: Dict[str, Any], path: Union[str, CompiledPath], default: Any = None
+) -> Any:
     """Get a value from a nested dictionary using dot notation.
 
     Examples:
@@ -374,17 +920,14 @@ def get_nested_value(data: Dict[str, Any], path: str, default: Any = None) -> An
 
     try:
         current = data
-        for key in parse_path(path):
-            if key.isdigit():
-                current = current[int(key)]
-            else:
-                current = current[key]
+        for key in compile_path(path).segments:
+            current = current[key]
         return current
     except (KeyError, IndexError, TypeError):
         return default
 
 
-def set_nested_value(data: Dict[str, Any], path: str, value: Any) -> bool:
+def set_nested_value(data: Dict[str, Any], path: Union[str, CompiledPath], value: Any) -> bool:
     """Set a value in a nested dictionary using dot notation.
 
     Examples:
@@ -394,28 +937,27 @@ def set_nested_value(data: Dict[str, Any], path: str, value: Any) -> bool:
     if not path:
         return False
 
-    # Check if current value is the same to avoid unnecessary changes
-    sentinel = object()
-    if get_nested_value(data, path, sentinel) == value:
+    compiled = compile_path(path)
+    if not compiled:
         return False
 
-    keys = parse_path(path)
-    if not keys:
+    # Check if current value is the same to avoid unnecessary changes
+    sentinel = object()
+    if get_nested_value(data, compiled, sentinel) == value:
         return False
 
     current = data
 
     # Navigate to the parent, creating structure as needed
-    for key in keys[:-1]:
-        if key.isdigit():
+    for key in compiled.segments[:-1]:
+        if isinstance(key, int):
             # This is an array index (came from [index] notation)
-            index = int(key)
             if not isinstance(current, list):
                 return False
             # Extend list if necessary
-            while len(current) <= index:
+            while len(current) <= key:
                 current.append({})
-            current = current[index]
+            current = current[key]
         else:
             # This is a regular key - always create as dict
             if key not in current:
@@ -423,23 +965,22 @@ def set_nested_value(data: Dict[str, Any], path: str, value: Any) -> bool:
             current = current[key]
 
     # Set the final value
-    final_key = keys[-1]
+    final_key = compiled.segments[-1]
     try:
-        if final_key.isdigit() and isinstance(current, list):
+        if isinstance(final_key, int) and isinstance(current, list):
             # Setting array element
-            index = int(final_key)
-            while len(current) <= index:
+            while len(current) <= final_key:
                 current.append(None)
-            current[index] = value
+            current[final_key] = value
         else:
             # Setting dict key (even if key looks like number)
-            current[final_key] = value
+            current[compiled.keys[-1]] = value
         return True
     except (KeyError, IndexError, TypeError):
         return False
 
 
-def delete_nested_value(data: Dict[str, Any], path: str) -> tuple[bool, Any]:
+def delete_nested_value(data: Dict[str, Any], path: Union[str, CompiledPath]) -> tuple[bool, Any]:
     """Delete a value from a nested dictionary using dot notation.
 
     Returns:
@@ -448,36 +989,32 @@ def delete_nested_value(data: Dict[str, Any], path: str) -> tuple[bool, Any]:
     if not path:
         return False, None
 
+    compiled = compile_path(path)
+    if not compiled:
+        return False, None
+
     # Check if key exists and get old value
     sentinel = object()
-    old_value = get_nested_value(data, path, sentinel)
+    old_value = get_nested_value(data, compiled, sentinel)
     if old_value is sentinel:
         return False, None
 
-    keys = parse_path(path)
-    if not keys:
-        return False, None
-
     current = data
 
     # Navigate to the parent
     try:
-        for key in keys[:-1]:
-            if key.isdigit():
-                current = current[int(key)]
-            else:
-                current = current[key]
+        for key in compiled.segments[:-1]:
+            current = current[key]
     except (KeyError, IndexError, TypeError):
         return False, None
 
     # Delete the final key/index
-    final_key = keys[-1]
+    final_key = compiled.segments[-1]
     try:
-        if final_key.isdigit():
-            index = int(final_key)
+        if isinstance(final_key, int):
             if not isinstance(current, list):
                 return False, None
-            del current[index]
+            del current[final_key]
         else:
             del current[final_key]
         return True, old_value
@@ -0,0 +1,185 @@
+"""Incremental access to the top-level sections of large JSON documents.
+
+The document is memory-mapped and scanned only as far as needed to locate a
+section. Sections are parsed one at a time, so memory use and time to the first
+read depend on the sections used rather than on the size of the file.
+"""
+
+import mmap
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .helper import get_codec
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+# Everything up to the next bracket outside a string, matched in a single call
+_FLAT = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.S)
+_SCALAR = re.compile(rb"[^,}\]\s]+")
+
+_OPENING = (ord("{"), ord("["))
+
+
+class JSONSections:
+    """Lazily indexed view of the top-level object of a JSON file.
+
+    The file is mapped when the view is created, so it keeps reading the same
+    content when the file is replaced on disk, as NekoConf's own saves do. Writers
+    that truncate and rewrite the file in place are not supported while it is
+    mapped. Use ``close()`` to release it.
+    """
+
+    def __init__(self, path: Union[str, Path], loads: Optional[Callable[[bytes], Any]] = None):
+        """Open a JSON file for section access.
+
+        Args:
+            path: Path to the JSON file
+            loads: Parser for section content (default: the registered JSON codec)
+
+        Raises:
+            OSError: If the file cannot be opened
+            ValueError: If the document is not a JSON object
+        """
+        self.path = Path(path)
+        self._loads = loads or get_codec("json").loads
+        self._lock = threading.Lock()
+        self._spans: Dict[str, Tuple[int, int]] = {}
+
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._buffer = b""
+
+        start = _WHITESPACE.match(self._buffer).end()
+        self._complete = start == len(self._buffer)  # An empty file is an empty object
+        if not self._complete and self._buffer[start] != ord("{"):
+            raise self._error(start, "expected a JSON object")
+        self._pos = start + 1
+        self._first = True
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({str(self.path)!r})"
+
+    def _error(self, pos: int, message: str) -> ValueError:
+        return ValueError(f"Invalid JSON in {self.path} at byte {pos}: {message}")
+
+    def _skip_value(self, pos: int) -> int:
+        """Return the position just after the JSON value starting at pos."""
+        buffer = self._buffer
+        if pos >= len(buffer):
+            raise self._error(pos, "expected a value")
+
+        char = buffer[pos]
+        if char == ord('"'):
+            match = _STRING.match(buffer, pos)
+            if not match:
+                raise self._error(pos, "unterminated string")
+            return match.end()
+
+        if char not in _OPENING:
+            match = _SCALAR.match(buffer, pos)
+            if not match:
+                raise self._error(pos, "expected a value")
+            return match.end()
+
+        # Only brackets are handled here, all else is skipped by the regex
+        flat = _FLAT.match
+        size = len(buffer)
+        depth = 0
+        while True:
+            pos = flat(buffer, pos).end()
+            if pos >= size:
+                raise self._error(pos, "unexpected end of document")
+            char = buffer[pos]
+            pos += 1
+            if char == 123 or char == 91:  # { [
+                depth += 1
+            elif char == 125 or char == 93:  # } ]
+                depth -= 1
+                if depth == 0:
+                    return pos
+            else:
+                raise self._error(pos - 1, "unterminated string")
+
+    def _scan_next(self) -> Optional[str]:
+        """Index the next section of the document.
+
+        Returns:
+            The key of the section, or None once the end of the object is reached
+        """
+        buffer = self._buffer
+        pos = _WHITESPACE.match(buffer, self._pos).end()
+
+        if pos < len(buffer) and buffer[pos] == ord("}"):
+            self._complete = True
+            return None
+
+        if not self._first:
+            if pos >= len(buffer) or buffer[pos] != ord(","):
+                raise self._error(pos, "expected ',' or '}'")
+            pos = _WHITESPACE.match(buffer, pos + 1).end()
+
+        match = _STRING.match(buffer, pos)
+        if not match:
+            raise self._error(pos, "expected a key")
+        key = self._loads(buffer[match.start() : match.end()])
+
+        pos = _WHITESPACE.match(buffer, match.end()).end()
+        if pos >= len(buffer) or buffer[pos] != ord(":"):
+            raise self._error(pos, "expected ':'")
+        start = _WHITESPACE.match(buffer, pos + 1).end()
+        end = self._skip_value(start)
+
+        self._spans[key] = (start, end)
+        self._pos = end
+        self._first = False
+        return key
+
+    def _find(self, key: str) -> Optional[Tuple[int, int]]:
+        with self._lock:
+            span = self._spans.get(key)
+            while span is None and not self._complete:
+                if self._scan_next() == key:
+                    span = self._spans[key]
+            return span
+
+    def keys(self) -> List[str]:
+        """Get the keys of all sections, in document order."""
+        with self._lock:
+            while not self._complete:
+                self._scan_next()
+            return list(self._spans)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+    def raw(self, key: str) -> bytes:
+        """Get the unparsed JSON text of a section.
+
+        Raises:
+            KeyError: If the section does not exist
+        """
+        span = self._find(key)
+        if span is None:
+            raise KeyError(key)
+        return self._buffer[span[0] : span[1]]
+
+    def load(self, key: str) -> Any:
+        """Parse a section.
+
+        Raises:
+            KeyError: If the section does not exist
+        """
+        return self._loads(self.raw(key))
+
+    def close(self) -> None:
+        """Release the file mapping."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
@@ -0,0 +1,426 @@
+"""Binary snapshot format for configuration data.
+
+A snapshot stores a configuration tree in an offset-indexed layout. It can be
+memory-mapped and navigated by path, decoding only the values that are read, so
+opening even a very large snapshot takes constant time.
+
+Layout (little-endian): a header, then values. Every value starts with a one
+byte tag. Containers refer to their items by offset and are written after them:
+
+    dict:  tag, count (u32), count x (key offset, value offset) in insertion order,
+           count x entry index (u32) sorted by key, for binary search
+    list:  tag, count (u32), count x value offset (u32)
+    str, bytes and big ints: tag, length (u32), data
+    int and float: tag, 8 bytes; None, False and True: tag only
+
+Equal strings and scalars are stored once.
+"""
+
+import datetime
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+from .helper import Codec, CompiledPath, compile_path, register_codec
+
+MAGIC = b"NKS\x01"
+SNAPSHOT_SUFFIX = ".nks"
+
+# magic, reserved, root offset, source size, source mtime (ns), source fingerprint
+_HEADER = struct.Struct("<4sIIqq16s")
+_U32 = struct.Struct("<I")
+_PAIR = struct.Struct("<II")
+_INT64 = struct.Struct("<q")
+_FLOAT64 = struct.Struct("<d")
+_MAX_OFFSET = 2**32 - 1
+
+(
+    _NONE,
+    _FALSE,
+    _TRUE,
+    _INT,
+    _FLOAT,
+    _STR,
+    _BIGINT,
+    _LIST,
+    _DICT,
+    _DATETIME,
+    _DATE,
+    _BYTES,
+) = range(12)
+
+
+class SnapshotError(ValueError):
+    """Raised for data that cannot be stored in, or read as, a snapshot."""
+
+
+class _Encoder:
+    """Writes values bottom-up, so containers can refer to their items by offset."""
+
+    def __init__(self):
+        self.buffer = bytearray(_HEADER.size)
+        # Offsets of already written scalars, by type and value
+        self.scalars = {}
+
+    def _append(self, *parts: bytes) -> int:
+        offset = len(self.buffer)
+        if offset > _MAX_OFFSET:
+            raise SnapshotError("Snapshots are limited to 4 GiB")
+        for part in parts:
+            self.buffer += part
+        return offset
+
+    def _scalar(self, value: Any) -> int:
+        kind = type(value)
+        key = (kind, value)
+        offset = self.scalars.get(key)
+        if offset is not None:
+            return offset
+
+        if value is None:
+            offset = self._append(bytes((_NONE,)))
+        elif kind is bool:
+            offset = self._append(bytes((_TRUE if value else _FALSE,)))
+        elif kind is int:
+            if -(2**63) <= value < 2**63:
+                offset = self._append(bytes((_INT,)), _INT64.pack(value))
+            else:
+                digits = str(value).encode("ascii")
+                offset = self._append(bytes((_BIGINT,)), _U32.pack(len(digits)), digits)
+        elif kind is float:
+            offset = self._append(bytes((_FLOAT,)), _FLOAT64.pack(value))
+        elif kind is str:
+            data = value.encode("utf-8", "surrogatepass")
+            offset = self._append(bytes((_STR,)), _U32.pack(len(data)), data)
+        elif kind is datetime.datetime or kind is datetime.date:
+            data = value.isoformat().encode("ascii")
+            tag = _DATETIME if kind is datetime.datetime else _DATE
+            offset = self._append(bytes((tag,)), _U32.pack(len(data)), data)
+        elif kind is bytes:
+            offset = self._append(bytes((_BYTES,)), _U32.pack(len(value)), value)
+        else:
+            raise SnapshotError(f"Cannot store values of type {kind.__name__} in a snapshot")
+
+        self.scalars[key] = offset
+        return offset
+
+    def encode(self, value: Any) -> int:
+        """Write a value and return its offset."""
+        if isinstance(value, Mapping):
+            entries = []
+            for key, item in value.items():
+                if type(key) is not str:
+                    raise SnapshotError(f"Snapshot keys must be strings, not {type(key).__name__}")
+                entries.append((key.encode("utf-8", "surrogatepass"), self._scalar(key), item))
+            pairs = [(key_offset, self.encode(item)) for _, key_offset, item in entries]
+            order = sorted(range(len(entries)), key=lambda index: entries[index][0])
+            return self._append(
+                bytes((_DICT,)),
+                _U32.pack(len(pairs)),
+                b"".join(_PAIR.pack(*pair) for pair in pairs),
+                struct.pack(f"<{len(order)}I", *order),
+            )
+
+        if isinstance(value, (list, tuple)):
+            offsets = [self.encode(item) for item in value]
+            return self._append(
+                bytes((_LIST,)), _U32.pack(len(offsets)), struct.pack(f"<{len(offsets)}I", *offsets)
+            )
+
+        return self._scalar(value)
+
+
+def encode_snapshot(
+    data: Any, source_stat: Tuple[int, int] = (0, 0), source_fingerprint: bytes = b""
+) -> bytes:
+    """Serialize data to the snapshot format.
+
+    Args:
+        data: The data to store: dicts with string keys, lists, and scalars
+        source_stat: (size, mtime_ns) of the file the data was read from, if any
+        source_fingerprint: Content fingerprint of that file, if any
+
+    Returns:
+        The snapshot content
+
+    Raises:
+        SnapshotError: If the data contains values that cannot be stored
+    """
+    encoder = _Encoder()
+    root = encoder.encode(data)
+    size, mtime_ns = source_stat
+    _HEADER.pack_into(
+        encoder.buffer, 0, MAGIC, 0, root, size, mtime_ns, source_fingerprint.ljust(16, b"\0")
+    )
+    return bytes(encoder.buffer)
+
+
+class Snapshot:
+    """Read-only access to snapshot content, decoding values only when read.
+
+    Containers are returned as read-only views (``SnapshotMap`` and
+    ``SnapshotList``); use ``to_python()`` or ``load()`` for plain dicts and lists.
+    """
+
+    def __init__(self, content: Union[bytes, mmap.mmap]):
+        """Open snapshot content.
+
+        Args:
+            content: The snapshot bytes, or a memory map of a snapshot file
+
+        Raises:
+            SnapshotError: If the content is not a snapshot
+        """
+        if len(content) < _HEADER.size:
+            raise SnapshotError("Snapshot is truncated")
+        magic, _, root, size, mtime_ns, fingerprint = _HEADER.unpack_from(content, 0)
+        if magic != MAGIC:
+            raise SnapshotError("Not a NekoConf snapshot")
+
+        self._buffer = content
+        self._root = root
+        self.source_stat = (size, mtime_ns)
+        self.source_fingerprint = fingerprint
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "Snapshot":
+        """Memory-map a snapshot file.
+
+        Raises:
+            OSError: If the file cannot be opened
+            SnapshotError: If the file is not a snapshot
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise SnapshotError(f"Snapshot is truncated: {path}")
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buffer)
+        except SnapshotError:
+            buffer.close()
+            raise
+
+    def close(self) -> None:
+        """Release the memory map, if any."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def _view(self, offset: int) -> Any:
+        """Decode a scalar, or wrap a container in a view."""
+        tag = self._buffer[offset]
+        if tag == _DICT:
+            return SnapshotMap(self, offset)
+        if tag == _LIST:
+            return SnapshotList(self, offset)
+        return self._decode_scalar(offset)
+
+    def _decode(self, offset: int) -> Any:
+        """Fully decode the value at offset into plain dicts and lists."""
+        buffer = self._buffer
+        unpack_u32 = _U32.unpack_from
+        unpack = struct.unpack_from
+        # Keys and other scalars are stored once and referenced many times
+        scalars = {}
+
+        def scalar(offset: int) -> Any:
+            try:
+                return scalars[offset]
+            except KeyError:
+                value = scalars[offset] = self._decode_scalar(offset)
+                return value
+
+        def decode(offset: int) -> Any:
+            tag = buffer[offset]
+            if tag == _DICT:
+                (count,) = unpack_u32(buffer, offset + 1)
+                flat = unpack(f"<{2 * count}I", buffer, offset + 5)
+                return dict(zip(map(scalar, flat[0::2]), map(decode, flat[1::2])))
+            if tag == _LIST:
+                (count,) = unpack_u32(buffer, offset + 1)
+                return list(map(decode, unpack(f"<{count}I", buffer, offset + 5)))
+            return scalar(offset)
+
+        return decode(offset)
+
+    def _decode_scalar(self, offset: int) -> Any:
+        """Decode the scalar at offset."""
+        buffer = self._buffer
+        tag = buffer[offset]
+
+        if tag == _STR:
+            (length,) = _U32.unpack_from(buffer, offset + 1)
+            return str(buffer[offset + 5 : offset + 5 + length], "utf-8", "surrogatepass")
+        if tag == _INT:
+            return _INT64.unpack_from(buffer, offset + 1)[0]
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _NONE:
+            return None
+        if tag == _FLOAT:
+            return _FLOAT64.unpack_from(buffer, offset + 1)[0]
+
+        (length,) = _U32.unpack_from(buffer, offset + 1)
+        data = bytes(buffer[offset + 5 : offset + 5 + length])
+        if tag == _BIGINT:
+            return int(data)
+        if tag == _DATETIME:
+            return datetime.datetime.fromisoformat(data.decode("ascii"))
+        if tag == _DATE:
+            return datetime.date.fromisoformat(data.decode("ascii"))
+        if tag == _BYTES:
+            return data
+        raise SnapshotError(f"Corrupt snapshot: unknown tag {tag} at offset {offset}")
+
+    def _lookup(self, offset: int, key: str) -> Optional[int]:
+        """Binary search a dict for a key, returning the offset of its value."""
+        buffer = self._buffer
+        (count,) = _U32.unpack_from(buffer, offset + 1)
+        pairs = offset + 5
+        order = pairs + _PAIR.size * count
+        target = key.encode("utf-8", "surrogatepass")
+
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            (index,) = _U32.unpack_from(buffer, order + 4 * middle)
+            key_offset, value_offset = _PAIR.unpack_from(buffer, pairs + _PAIR.size * index)
+            (length,) = _U32.unpack_from(buffer, key_offset + 1)
+            candidate = buffer[key_offset + 5 : key_offset + 5 + length]
+            if candidate == target:
+                return value_offset
+            if candidate < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    @property
+    def root(self) -> Any:
+        """The stored value, as a view if it is a container."""
+        return self._view(self._root)
+
+    def to_python(self) -> Any:
+        """Decode the whole snapshot into plain dicts and lists."""
+        return self._decode(self._root)
+
+    def get(self, path: Union[str, CompiledPath], default: Any = None) -> Any:
+        """Get a value by dot notation path, decoding only along the path.
+
+        Returns:
+            The value, as a view if it is a container, or default if not found
+        """
+        offset = self._root
+        buffer = self._buffer
+        for segment in compile_path(path).segments:
+            tag = buffer[offset]
+            if tag == _DICT:
+                offset = self._lookup(offset, str(segment))
+            elif tag == _LIST and type(segment) is int:
+                (count,) = _U32.unpack_from(buffer, offset + 1)
+                if segment >= count:
+                    return default
+                (offset,) = _U32.unpack_from(buffer, offset + 5 + 4 * segment)
+            else:
+                return default
+            if offset is None:
+                return default
+        return self._view(offset)
+
+    # Top-level sections, the protocol shared with JSONSections for lazy loading
+
+    def keys(self) -> List[str]:
+        """Get the top-level keys in insertion order."""
+        root = self.root
+        return list(root) if isinstance(root, SnapshotMap) else []
+
+    def __contains__(self, key: str) -> bool:
+        return self._buffer[self._root] == _DICT and self._lookup(self._root, key) is not None
+
+    def load(self, key: str) -> Any:
+        """Decode a top-level section.
+
+        Raises:
+            KeyError: If the section does not exist
+        """
+        offset = self._lookup(self._root, key) if self._buffer[self._root] == _DICT else None
+        if offset is None:
+            raise KeyError(key)
+        return self._decode(offset)
+
+
+class SnapshotMap(Mapping):
+    """Read-only mapping view of a dict in a snapshot."""
+
+    __slots__ = ("_snapshot", "_offset")
+
+    def __init__(self, snapshot: Snapshot, offset: int):
+        self._snapshot = snapshot
+        self._offset = offset
+
+    def __getitem__(self, key: str) -> Any:
+        if type(key) is not str:
+            raise KeyError(key)
+        offset = self._snapshot._lookup(self._offset, key)
+        if offset is None:
+            raise KeyError(key)
+        return self._snapshot._view(offset)
+
+    def __len__(self) -> int:
+        return _U32.unpack_from(self._snapshot._buffer, self._offset + 1)[0]
+
+    def __iter__(self) -> Iterator[str]:
+        snapshot = self._snapshot
+        for index in range(len(self)):
+            (key_offset, _) = _PAIR.unpack_from(
+                snapshot._buffer, self._offset + 5 + _PAIR.size * index
+            )
+            yield snapshot._decode_scalar(key_offset)
+
+    def to_dict(self) -> dict:
+        """Decode into a plain dict."""
+        return self._snapshot._decode(self._offset)
+
+
+class SnapshotList(Sequence):
+    """Read-only sequence view of a list in a snapshot."""
+
+    __slots__ = ("_snapshot", "_offset")
+
+    def __init__(self, snapshot: Snapshot, offset: int):
+        self._snapshot = snapshot
+        self._offset = offset
+
+    def __len__(self) -> int:
+        return _U32.unpack_from(self._snapshot._buffer, self._offset + 1)[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("snapshot list index out of range")
+        (offset,) = _U32.unpack_from(self._snapshot._buffer, self._offset + 5 + 4 * index)
+        return self._snapshot._view(offset)
+
+    def to_list(self) -> list:
+        """Decode into a plain list."""
+        return self._snapshot._decode(self._offset)
+
+
+def decode_snapshot(content: bytes) -> Any:
+    """Decode snapshot content into plain dicts and lists."""
+    return Snapshot(content).to_python()
+
+
+register_codec(
+    "snapshot",
+    Codec("snapshot", decode_snapshot, encode_snapshot),
+    [SNAPSHOT_SUFFIX],
+)
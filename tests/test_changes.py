@@ -1,8 +1,11 @@
 """Test cases for change detection and tracking."""
 
+import copy
+
 import pytest
 
-from nekoconf.event.changes import ChangeTracker, ChangeType, ConfigChange
+from nekoconf.event.changes import ChangeTracker, ChangeType, ConfigChange, MutationRecord
+from nekoconf.utils.helper import deep_merge, delete_nested_value, set_nested_value
 
 
 class TestConfigChange:
@@ -200,3 +203,156 @@ class TestChangeTracker:
         # Should detect changes in b.c (deleted) and b.d (created)
         assert any(path == "b.c" for path, _ in changes)
         assert any(path == "b.d" for path, _ in changes)
+
+
+def _change_set(changes):
+    """Convert a change list into a comparable set, excluding the global change."""
+    return {
+        (c.change_type, c.path, repr(c.old_value), repr(c.new_value))
+        for c in changes
+        if c.path != "*"
+    }
+
+
+class TestMutationRecord:
+    """Test cases for incremental change tracking with MutationRecord."""
+
+    @pytest.fixture
+    def data(self):
+        return {
+            "database": {"host": "localhost", "port": 5432, "options": {"ssl": True}},
+            "servers": [{"host": "a", "port": 1}, {"host": "b", "port": 2}],
+            "debug": False,
+        }
+
+    @pytest.mark.parametrize(
+        "path, value",
+        [
+            ("database.host", "db.example.com"),
+            ("database.options.ssl", False),
+            ("database.options.timeout", 30),
+            ("cache.redis.host", "redis"),
+            ("database", {"host": "remote", "user": "admin"}),
+            ("debug", {"level": 2}),
+            ("servers[1].port", 8080),
+            ("servers[3].host", "d"),
+        ],
+    )
+    def test_set_matches_full_diff(self, data, path, value):
+        """Test that recorded set changes match a full tree diff."""
+        expected_old = copy.deepcopy(data)
+
+        record = MutationRecord.for_path(data, path)
+        assert set_nested_value(data, path, value)
+
+        changes = record.detect_changes(data)
+        expected = ChangeTracker.detect_changes(expected_old, data)
+
+        assert _change_set(changes) == _change_set(expected)
+        assert changes[0].change_type == ChangeType.CHANGE
+        assert changes[0].path == "*"
+        assert changes[0].old_value == expected_old
+        assert changes[0].new_value is data
+
+    def test_merge_matches_full_diff(self, data):
+        """Test that recorded merge changes match a full tree diff."""
+        expected_old = copy.deepcopy(data)
+        update = {"database": {"port": 6543, "options": {"retries": 3}}, "new_key": [1, 2]}
+
+        record = MutationRecord.for_merge(data, update)
+        deep_merge(source=update, destination=data, in_place=True)
+
+        changes = record.detect_changes(data)
+        assert _change_set(changes) == _change_set(ChangeTracker.detect_changes(expected_old, data))
+        assert changes[0].old_value == expected_old
+
+    def test_delete_preserves_old_state(self, data):
+        """Test that the recorded old state survives an in-place delete."""
+        expected_old = copy.deepcopy(data)
+
+        record = MutationRecord.for_path(data, "servers[0]")
+        delete_nested_value(data, "servers[0]")
+
+        assert record.old_data == expected_old
+        assert len(data["servers"]) == 1
+
+    def test_untouched_subtrees_are_shared(self, data):
+        """Test that only containers along the path are copied."""
+        record = MutationRecord.for_path(data, "database.options.ssl")
+
+        assert record.old_data is not data
+        assert record.old_data["database"] is not data["database"]
+        assert record.old_data["servers"] is data["servers"]
+
+    def test_no_changes(self, data):
+        """Test that an unchanged merge produces no changes."""
+        record = MutationRecord.for_merge(data, {"database": {"port": 5432}})
+        deep_merge(source={"database": {"port": 5432}}, destination=data, in_place=True)
+
+        assert record.detect_changes(data) == []
+
+
+class TestLazyChangeTracking:
+    """Test cases for lazy change iteration."""
+
+    def test_iter_changes_is_lazy(self):
+        """Test that changes are produced on demand and can stop early."""
+        old_config = {f"key{i}": i for i in range(100)}
+        new_config = {f"key{i}": i + 1 for i in range(100)}
+
+        changes = ChangeTracker.iter_changes(old_config, new_config)
+        first = next(changes)
+
+        assert first.change_type == ChangeType.UPDATE
+        assert first.path == "key0"
+        assert ChangeTracker.has_changes(old_config, new_config) is True
+        assert ChangeTracker.has_changes(old_config, dict(old_config)) is False
+
+    def test_shared_subtrees_are_skipped(self):
+        """Test that identical subtrees are skipped by identity."""
+
+        class Unequal(dict):
+            """A dict that never compares equal, to detect comparisons."""
+
+            def __eq__(self, other):
+                raise AssertionError("shared subtree was compared")
+
+            __hash__ = None
+
+        shared = Unequal(value=1)
+        old_config = {"shared": shared, "leaf": 1}
+        new_config = {"shared": shared, "leaf": 2}
+
+        changes = list(ChangeTracker.iter_changes(old_config, new_config))
+
+        assert [(c.path, c.new_value) for c in changes] == [("leaf", 2)]
+
+    def test_iter_changes_with_prefixes(self):
+        """Test limiting the diff to watched prefixes."""
+        old_config = {
+            "database": {"host": "localhost", "port": 5432},
+            "cache": {"ttl": 60},
+            "logging": {"level": "INFO"},
+        }
+        new_config = {
+            "database": {"host": "db.example.com", "port": 5432},
+            "cache": "disabled",
+            "logging": {"level": "DEBUG"},
+        }
+
+        changes = ChangeTracker.iter_changes(
+            old_config, new_config, prefixes=["database", "cache.ttl"]
+        )
+        paths = sorted(change.path for change in changes)
+
+        # A change above a watched path (cache replaced) is reported too
+        assert paths == ["cache", "database.host"]
+
+    def test_equal_values_of_different_types(self):
+        """Test that type changes are reported even if the values compare equal."""
+        changes = ChangeTracker.detect_changes({"a": 1, "b": True}, {"a": 1.0, "b": 1})
+        assert [(c.path, c.change_type) for c in changes[1:]] == [
+            ("a", ChangeType.UPDATE),
+            ("b", ChangeType.UPDATE),
+        ]
+        assert ChangeTracker.has_changes({"a": 1}, {"a": True})
@@ -3,7 +3,9 @@
 
 import logging
 import os
+from unittest.mock import patch
 
+from nekoconf.utils import env
 from nekoconf.utils.env import EnvOverrideHandler
 
 # Set up logging
@@ -610,6 +612,103 @@ def test_include_exact_match():
     print("✓ Include exact match test passed\n")
 
 
+def test_override_plan_reuse():
+    """Test that the override plan is reused until the environment changes."""
+    print("=== Testing Override Plan Reuse ===")
+
+    os.environ["NEKOCONF_PLAN_PORT"] = "8080"
+    handler = EnvOverrideHandler()
+
+    with patch.object(env, "parse_value", wraps=env.parse_value) as parse_value:
+        assert handler.apply_overrides({})["plan"]["port"] == 8080
+        parsed = parse_value.call_count
+        assert handler.apply_overrides({})["plan"]["port"] == 8080
+        assert parse_value.call_count == parsed  # Parsed only when the plan was built
+
+        os.environ["NEKOCONF_PLAN_PORT"] = "9090"
+        assert handler.apply_overrides({})["plan"]["port"] == 9090
+        assert parse_value.call_count > parsed
+
+        del os.environ["NEKOCONF_PLAN_PORT"]
+        assert "plan" not in handler.apply_overrides({})
+
+    print("✓ Override plan reuse test passed\n")
+
+
+def test_override_plan_values_not_shared():
+    """Test that loads do not share mutable override values."""
+    print("=== Testing Override Plan Values ===")
+
+    os.environ["NEKOCONF_PLAN_HOSTS"] = '["a", "b"]'
+    handler = EnvOverrideHandler()
+
+    first = handler.apply_overrides({})
+    first["plan"]["hosts"].append("c")
+    second = handler.apply_overrides({})
+
+    assert second["plan"]["hosts"] == ["a", "b"]
+
+    print("✓ Override plan values test passed\n")
+
+
+def test_nested_include_exclude_paths():
+    """Test include/exclude rules with nested and overlapping paths."""
+    print("=== Testing Nested Include/Exclude Paths ===")
+
+    os.environ["NEKOCONF_PLAN_DB_HOST"] = "db-host"
+    os.environ["NEKOCONF_PLAN_DB_SECRET_KEY"] = "hidden"
+    os.environ["NEKOCONF_PLAN_DBX"] = "sibling"
+    os.environ["NEKOCONF_PLAN_CACHE"] = "on"
+
+    handler = EnvOverrideHandler(
+        include_paths=["plan.db.host", "plan.db", "plan.cache"],
+        exclude_paths=["plan.db.secret"],
+    )
+    result = handler.apply_overrides({})
+
+    assert result["plan"]["db"] == {"host": "db-host"}
+    assert "dbx" not in result["plan"]
+    assert result["plan"]["cache"] is True
+
+    handler.exclude_paths.append("plan.cache")
+    handler.invalidate()
+    assert "cache" not in handler.apply_overrides({})["plan"]
+
+    print("✓ Nested include/exclude paths test passed\n")
+
+
+def test_override_plan_follows_settings():
+    """Test that assigning a setting rebuilds the override plan."""
+    print("=== Testing Override Plan Settings ===")
+
+    os.environ["NEKOCONF_SETTINGS_DB_HOST"] = "db-host"
+    os.environ["NEKOCONF_SETTINGS_CACHE"] = "on"
+    os.environ["APP__SETTINGS__MODE"] = "fast"
+    handler = EnvOverrideHandler()
+    assert handler.apply_overrides({})["settings"]["db"] == {"host": "db-host"}
+
+    handler.exclude_paths = ["settings.db"]
+    assert "db" not in handler.apply_overrides({})["settings"]
+
+    handler.include_paths = ["settings.cache"]
+    assert handler.apply_overrides({})["settings"] == {"cache": True}
+
+    handler.exclude_paths = None
+    handler.include_paths = None
+    handler.preserve_case = True
+    assert handler.apply_overrides({})["SETTINGS"]["CACHE"] is True
+
+    handler.prefix = "APP_"
+    handler.nested_delimiter = "__"
+    assert handler.prefix_pattern == "APP__"
+    assert handler.apply_overrides({}) == {"SETTINGS": {"MODE": "fast"}}
+
+    for name in ("NEKOCONF_SETTINGS_DB_HOST", "NEKOCONF_SETTINGS_CACHE", "APP__SETTINGS__MODE"):
+        del os.environ[name]
+
+    print("✓ Override plan settings test passed\n")
+
+
 def run_all_tests():
     """Run all test functions."""
     print("Starting comprehensive EnvOverrideHandler tests...\n")
@@ -639,6 +738,10 @@ def run_all_tests():
         test_empty_prefix_warning()
         test_complex_json_parsing()
         test_include_exact_match()
+        test_override_plan_reuse()
+        test_override_plan_values_not_shared()
+        test_nested_include_exclude_paths()
+        test_override_plan_follows_settings()
 
         print("🎉 All tests passed successfully!")
 
@@ -707,6 +810,12 @@ def cleanup_env_vars():
         "NEKOCONF_COMPLEX_DATA",
         "NEKOCONF_API_VERSION",
         "NEKOCONF_API_VERSION_DETAIL",
+        "NEKOCONF_PLAN_PORT",
+        "NEKOCONF_PLAN_HOSTS",
+        "NEKOCONF_PLAN_DB_HOST",
+        "NEKOCONF_PLAN_DB_SECRET_KEY",
+        "NEKOCONF_PLAN_DBX",
+        "NEKOCONF_PLAN_CACHE",
     ]
 
     for var in test_vars:
@@ -8,12 +8,17 @@ and integration with the configuration management system.
 import asyncio
 import os
 import tempfile
-from unittest.mock import Mock
+import threading
+import time
+from unittest.mock import Mock, patch
 
 import pytest
 
 from nekoconf.core.config import NekoConf
+from nekoconf.event.changes import ChangeTracker
+from nekoconf.event.loop import EventLoopThread, get_loop_thread
 from nekoconf.event.pipeline import (
+    AsyncEventPipeline,
     EventContext,
     EventHandler,
     EventPipeline,
@@ -223,6 +228,22 @@ class TestEventPipeline:
         assert len(events_received) == 1
         assert events_received[0] == ("server.host", "0.0.0.0")
 
+    def test_async_handler_runs_on_shared_loop_thread(self):
+        """Test that sync emits run async handlers on one long-lived loop thread."""
+        threads = []
+
+        async def async_handler(**kwargs):
+            threads.append(threading.current_thread())
+
+        self.pipeline.register_handler(async_handler, EventType.CHANGE)
+
+        with patch("asyncio.run") as run:
+            self.pipeline.emit(EventType.CHANGE, path="a", new_value=1)
+            self.pipeline.emit(EventType.CHANGE, path="b", new_value=2)
+
+        run.assert_not_called()
+        assert threads == [get_loop_thread().thread] * 2
+
     def test_priority_ordering(self):
         """Test that handlers are executed in priority order.
 
@@ -600,3 +621,544 @@ class TestEventPipeline:
         assert len(reload_events) == 1
         assert reload_events[0][0] == dict  # Old value is a dict
         assert reload_events[0][1] == dict  # New value is a dict
+
+
+class TestBatchHandlers:
+    """Test cases for batch mode event handlers."""
+
+    def test_batch_handler_called_once_per_commit(self):
+        """Test that a batch handler receives all matching changes in one call."""
+        config = NekoConf(
+            {"database": {"host": "localhost", "port": 5432}}, event_emission_enabled=True
+        )
+        batches = []
+        per_event = []
+
+        @config.on_change("database.*", batch=True)
+        def handle_batch(changes, config_data, **kwargs):
+            batches.append(sorted(change.path for change in changes))
+
+        @config.on_change("database.*")
+        def handle_event(path, **kwargs):
+            per_event.append(path)
+
+        config.update({"database": {"host": "db.example.com", "port": 6543, "name": "app"}})
+
+        assert batches == [["database.host", "database.name", "database.port"]]
+        # Per-event handlers are unaffected by batch handlers
+        assert sorted(per_event) == ["database.host", "database.name", "database.port"]
+
+    def test_batch_handler_filters_by_event_type(self):
+        """Test that batch handlers only receive changes of their event types."""
+        config = NekoConf({"a": 1, "b": 2}, event_emission_enabled=True)
+        received = []
+        created = []
+
+        @config.on_event([EventType.CREATE, EventType.CHANGE], "*", batch=True)
+        def handle_all(changes, **kwargs):
+            received.append([(change.change_type.value, change.path) for change in changes])
+
+        @config.on_event(EventType.CREATE, batch=True)
+        def handle_creates(changes, **kwargs):
+            created.append([change.path for change in changes])
+
+        with config.transaction() as txn:
+            txn.set("a", 10)
+            txn.set("c", 3)
+
+        # Each change is delivered once, even when it matches two event types
+        assert len(received) == 1
+        assert sorted(received[0]) == [("change", "*"), ("create", "c"), ("update", "a")]
+        assert created == [["c"]]
+
+    def test_batch_handler_not_called_without_matches(self):
+        """Test that batch handlers are skipped when no change matches."""
+        config = NekoConf({"a": 1}, event_emission_enabled=True)
+        calls = []
+
+        @config.on_change("database.*", batch=True)
+        def handle_batch(changes, **kwargs):
+            calls.append(changes)
+
+        config.set("a", 2)
+
+        assert calls == []
+        assert config.event_pipeline.emit(EventType.CHANGE, "database.host") == 0
+
+
+class TestAsyncEventPipeline:
+    """Test cases for async handlers run on long-lived event loops."""
+
+    def test_sync_emit_uses_loop_thread(self):
+        """Test that sync callers run async handlers on one shared loop thread."""
+        pipeline = AsyncEventPipeline()
+        loops = []
+
+        async def handler(**kwargs):
+            await asyncio.sleep(0)
+            loops.append((asyncio.get_running_loop(), threading.current_thread().name))
+
+        pipeline.register_handler(handler, EventType.CHANGE)
+        pipeline.emit(EventType.CHANGE, "a")
+        pipeline.emit(EventType.CHANGE, "b")
+
+        # Sync callers wait for the handlers, which share one loop
+        assert len(loops) == 2
+        assert loops[0] == loops[1]
+        assert loops[0][1] == "NekoConf-EventLoop"
+
+    def test_handlers_of_an_emit_are_gathered(self):
+        """Test that the async handlers of one emit run concurrently."""
+        pipeline = AsyncEventPipeline()
+        order = []
+
+        for name in ("first", "second", "third"):
+
+            async def handler(name=name, **kwargs):
+                order.append(f"start {name}")
+                await asyncio.sleep(0.05)
+
+            pipeline.register_handler(handler, EventType.CHANGE)
+
+        start = time.perf_counter()
+        assert pipeline.emit(EventType.CHANGE, "a") == 3
+
+        assert time.perf_counter() - start < 0.14
+        assert order == ["start first", "start second", "start third"]
+
+    def test_max_concurrency(self):
+        """Test that the number of concurrently running handlers is limited."""
+        pipeline = AsyncEventPipeline(max_concurrency=2)
+        running = []
+        peak = []
+
+        async def handler(**kwargs):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+        for _ in range(5):
+            pipeline.register_handler(handler, EventType.CHANGE)
+        pipeline.emit(EventType.CHANGE, "a")
+
+        assert len(peak) == 5
+        assert max(peak) == 2
+        with pytest.raises(ValueError):
+            AsyncEventPipeline(max_concurrency=0)
+
+    def test_emit_without_waiting(self):
+        """Test that sync emits can return before their async handlers finish."""
+        pipeline = AsyncEventPipeline(wait=False)
+        release = threading.Event()
+        done = []
+
+        async def handler(**kwargs):
+            await asyncio.get_running_loop().run_in_executor(None, release.wait)
+            done.append(True)
+
+        pipeline.register_handler(handler, EventType.CHANGE)
+        pipeline.emit(EventType.CHANGE, "a")
+
+        assert done == []
+        assert pipeline.pending == 1
+        assert not pipeline.join(timeout=0.01)
+        release.set()
+        assert pipeline.join(timeout=1)
+        assert done == [True]
+
+    def test_handler_errors_are_isolated(self):
+        """Test that failing handlers do not affect the others."""
+        pipeline = AsyncEventPipeline()
+        calls = []
+
+        async def failing(**kwargs):
+            raise RuntimeError("boom")
+
+        def failing_sync(**kwargs):
+            raise RuntimeError("boom")
+
+        async def working(path, **kwargs):
+            calls.append(path)
+
+        pipeline.register_handler(failing, EventType.CHANGE, priority=1)
+        pipeline.register_handler(failing_sync, EventType.CHANGE, priority=2)
+        pipeline.register_handler(working, EventType.CHANGE, priority=3)
+
+        pipeline.emit(EventType.CHANGE, "a")
+
+        assert calls == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_emit_async(self):
+        """Test emitting on the caller's event loop."""
+        pipeline = AsyncEventPipeline()
+        calls = []
+
+        async def handler(path, **kwargs):
+            await asyncio.sleep(0.01)
+            calls.append((path, asyncio.get_running_loop()))
+
+        def sync_handler(path, **kwargs):
+            calls.append((path, None))
+
+        pipeline.register_handler(handler, EventType.CHANGE)
+        pipeline.register_handler(sync_handler, EventType.CHANGE)
+
+        assert await pipeline.emit_async(EventType.CHANGE, "a") == 2
+        assert calls == [("a", None), ("a", asyncio.get_running_loop())]
+
+        await pipeline.emit_async(EventType.CHANGE, "b", wait=False)
+        assert pipeline.pending == 1
+        await pipeline.join_async()
+        assert pipeline.pending == 0
+        assert calls[-1] == ("b", asyncio.get_running_loop())
+
+    @pytest.mark.asyncio
+    async def test_sync_emit_inside_event_loop(self):
+        """Test that sync emits inside a running loop track their handler tasks."""
+        config = NekoConf({"a": 1}, event_emission_enabled=True)
+        calls = []
+
+        @config.on_change("a")
+        async def handler(new_value, **kwargs):
+            await asyncio.sleep(0.01)
+            calls.append(new_value)
+
+        config.set("a", 2)
+
+        assert calls == []
+        assert config.event_pipeline.pending == 1
+        await config.event_pipeline.join_async()
+        assert calls == [2]
+
+    @pytest.mark.asyncio
+    async def test_emit_batch_async(self):
+        """Test delivering batches on the caller's event loop."""
+        config = NekoConf({"a": 1, "b": 2}, event_emission_enabled=True)
+        batches = []
+
+        @config.on_change("*", batch=True)
+        async def handler(changes, **kwargs):
+            batches.append(sorted(change.path for change in changes))
+
+        changes = ChangeTracker.detect_changes({"a": 1, "b": 2}, {"a": 3, "b": 4})
+        await config.event_pipeline.emit_batch_async(changes)
+
+        assert batches == [["*", "a", "b"]]
+
+    def test_thread_safe_writers_do_not_wait(self):
+        """Test that async handlers may write to a thread safe configuration."""
+        config = NekoConf({"a": 1, "b": 0}, event_emission_enabled=True, thread_safe=True)
+
+        @config.on_change("a")
+        async def handler(new_value, **kwargs):
+            config.set("b", new_value)
+
+        config.set("a", 2)
+
+        assert config.event_pipeline.join(timeout=1)
+        assert config.get("b") == 2
+
+    def test_loop_thread_restarts(self):
+        """Test that a stopped loop thread is started again on use."""
+        loop_thread = EventLoopThread(name="test-loop")
+        pipeline = AsyncEventPipeline(loop_thread=loop_thread)
+        calls = []
+
+        async def handler(**kwargs):
+            calls.append(threading.current_thread().name)
+
+        pipeline.register_handler(handler, EventType.CHANGE)
+        pipeline.emit(EventType.CHANGE, "a")
+        loop_thread.stop()
+        assert not loop_thread.running
+        pipeline.emit(EventType.CHANGE, "a")
+
+        assert calls == ["test-loop", "test-loop"]
+        loop_thread.stop()
+
+
+class TestExecutionPolicies:
+    """Test cases for handlers running off the emitting thread."""
+
+    def test_writer_does_not_wait_for_pool_handler(self):
+        """Test that a slow pool handler does not block the writer."""
+        config = NekoConf({"a": 1}, event_emission_enabled=True)
+        release = threading.Event()
+        calls = []
+
+        @config.on_change("a", execution="pool")
+        def handler(new_value, **kwargs):
+            release.wait(5)
+            calls.append((new_value, threading.current_thread().name))
+
+        config.set("a", 2)
+        assert calls == []
+        assert not config.flush(timeout=0.01)
+
+        release.set()
+        assert config.flush(timeout=5)
+        assert calls[0][0] == 2
+        assert calls[0][1].startswith("NekoConf-Handler")
+
+    def test_pool_handler_ordered_per_path(self):
+        """Test that pool calls for one path run in order, one at a time."""
+        pipeline = EventPipeline(max_workers=4)
+        calls = {"a": [], "b": []}
+        running = set()
+        overlaps = []
+
+        def handler(path, new_value, **kwargs):
+            if path in running:
+                overlaps.append(path)
+            running.add(path)
+            time.sleep(0.001)
+            calls[path].append(new_value)
+            running.discard(path)
+
+        pipeline.register_handler(handler, EventType.CHANGE, execution="pool")
+        for i in range(20):
+            pipeline.emit(EventType.CHANGE, "a", new_value=i)
+            pipeline.emit(EventType.CHANGE, "b", new_value=i)
+
+        assert pipeline.flush(timeout=5)
+        assert calls == {"a": list(range(20)), "b": list(range(20))}
+        assert overlaps == []
+
+    def test_serial_handler(self):
+        """Test that a serial handler runs on its own thread in emission order."""
+        pipeline = EventPipeline()
+        calls = []
+
+        def handler(path, **kwargs):
+            calls.append((path, threading.current_thread().name))
+
+        pipeline.register_handler(handler, EventType.CHANGE, execution="serial")
+        for path in ["a", "b", "c", "a"]:
+            assert pipeline.emit(EventType.CHANGE, path) == 1
+
+        assert pipeline.flush(timeout=5)
+        assert [path for path, _ in calls] == ["a", "b", "c", "a"]
+        assert len({name for _, name in calls}) == 1
+        assert calls[0][1].startswith("NekoConf-Handler-handler")
+        pipeline.close()
+
+    def test_max_pending(self):
+        """Test that emitters wait once a handler has too many pending calls."""
+        pipeline = EventPipeline()
+        release = threading.Event()
+        emitted = []
+
+        pipeline.register_handler(
+            lambda **kwargs: release.wait(5), EventType.CHANGE, execution="serial", max_pending=2
+        )
+
+        def emit():
+            for i in range(3):
+                pipeline.emit(EventType.CHANGE, "a")
+                emitted.append(i)
+
+        emitter = threading.Thread(target=emit)
+        emitter.start()
+        time.sleep(0.05)
+        assert emitted == [0, 1]  # Waiting for the first call to complete
+
+        release.set()
+        emitter.join(5)
+        assert emitted == [0, 1, 2]
+        assert pipeline.flush(timeout=5)
+
+    def test_offloaded_batch_handler(self):
+        """Test that batch handlers can run off the emitting thread."""
+        config = NekoConf({"a": 1, "b": 1}, event_emission_enabled=True)
+        batches = []
+
+        @config.on_change("*", batch=True, execution="serial")
+        def handler(changes, **kwargs):
+            batches.append(sorted(change.path for change in changes))
+
+        config.update({"a": 2, "b": 2})
+
+        assert config.flush(timeout=5)
+        assert len(batches) == 1
+        assert {"a", "b"} <= set(batches[0])
+
+    def test_handler_errors_are_isolated(self):
+        """Test that errors in offloaded handlers do not affect other calls."""
+        pipeline = EventPipeline()
+        calls = []
+
+        def handler(new_value, **kwargs):
+            if new_value == 1:
+                raise RuntimeError("boom")
+            calls.append(new_value)
+
+        pipeline.register_handler(handler, EventType.CHANGE, execution="pool")
+        for i in range(3):
+            pipeline.emit(EventType.CHANGE, "a", new_value=i)
+
+        assert pipeline.flush(timeout=5)
+        assert calls == [0, 2]
+
+    def test_invalid_policies(self):
+        """Test that invalid execution options are rejected."""
+        pipeline = EventPipeline()
+
+        async def async_handler(**kwargs):
+            pass
+
+        with pytest.raises(ValueError):
+            pipeline.register_handler(async_handler, EventType.CHANGE, execution="pool")
+        with pytest.raises(ValueError):
+            pipeline.register_handler(lambda **kwargs: None, EventType.CHANGE, execution="fork")
+        with pytest.raises(ValueError):
+            pipeline.register_handler(
+                lambda **kwargs: None, EventType.CHANGE, execution="pool", max_pending=0
+            )
+
+
+class TestCoalescing:
+    """Test cases for handlers receiving bursts of events as one."""
+
+    def test_burst_is_delivered_once(self):
+        """Test that a burst of changes reaches the handler once the window passes."""
+        config = NekoConf({"a": 0}, event_emission_enabled=True)
+        calls = []
+        delivered = threading.Event()
+
+        @config.on_change("a", coalesce=0.05)
+        def handler(old_value, new_value, **kwargs):
+            calls.append((old_value, new_value))
+            delivered.set()
+
+        for i in range(1, 101):
+            config.set("a", i)
+        assert calls == []
+
+        assert delivered.wait(5)
+        assert calls == [(0, 100)]
+
+    def test_paths_are_coalesced_separately(self):
+        """Test that events are collected per path until flushed."""
+        pipeline = EventPipeline()
+        calls = []
+
+        pipeline.register_handler(
+            lambda path, old_value, new_value, **kwargs: calls.append((path, old_value, new_value)),
+            EventType.CHANGE,
+            coalesce=True,
+        )
+        for i in range(3):
+            assert pipeline.emit(EventType.CHANGE, "a", i, i + 1) == 0
+            pipeline.emit(EventType.CHANGE, "b", i * 10, (i + 1) * 10)
+        assert pipeline.coalescer.pending == 2
+
+        assert pipeline.flush()
+        assert sorted(calls) == [("a", 0, 3), ("b", 0, 30)]
+        assert pipeline.coalescer.received == 6
+        assert pipeline.coalescer.delivered == 2
+
+    def test_batch_handler_gets_net_changes(self):
+        """Test that coalesced commits reach batch handlers as one net change per path."""
+        config = NekoConf({"db": {"host": "a"}}, event_emission_enabled=True)
+        batches = []
+
+        @config.on_change("db.*", batch=True, coalesce=True)
+        def handler(changes, **kwargs):
+            batches.append(
+                {change.path: (change.change_type.value, change.new_value) for change in changes}
+            )
+
+        config.set("db.host", "b")
+        config.set("db.port", 1)
+        config.set("db.port", 2)
+        config.set("db.user", "x")
+        config.delete("db.user")
+        config.set("db.host", "c")
+        assert batches == []
+
+        config.flush()
+        assert batches == [{"db.host": ("update", "c"), "db.port": ("create", 2)}]
+
+    def test_coalesced_async_handler(self):
+        """Test that coalesced events reach async handlers."""
+        pipeline = AsyncEventPipeline()
+        calls = []
+
+        async def handler(new_value, **kwargs):
+            calls.append(new_value)
+
+        pipeline.register_handler(handler, EventType.CHANGE, coalesce=True)
+        for i in range(5):
+            pipeline.emit(EventType.CHANGE, "a", new_value=i)
+
+        assert pipeline.flush(timeout=5)
+        assert calls == [4]
+
+    def test_coalesced_pool_handler(self):
+        """Test that coalesced events of offloaded handlers run on the executor."""
+        pipeline = EventPipeline()
+        threads = []
+
+        pipeline.register_handler(
+            lambda **kwargs: threads.append(threading.current_thread().name),
+            EventType.CHANGE,
+            execution="pool",
+            coalesce=True,
+        )
+        pipeline.emit(EventType.CHANGE, "a", 0, 1)
+        pipeline.emit(EventType.CHANGE, "a", 1, 2)
+
+        assert pipeline.flush(timeout=5)
+        assert len(threads) == 1
+        assert threads[0].startswith("NekoConf-Handler")
+
+    def test_invalid_window(self):
+        """Test that non-positive coalescing windows are rejected."""
+        pipeline = EventPipeline()
+        with pytest.raises(ValueError):
+            pipeline.register_handler(lambda **kwargs: None, EventType.CHANGE, coalesce=0)
+
+    def test_event_types_keep_their_order(self):
+        """Test that the last event delivered for a path is the last one emitted."""
+        config = NekoConf({}, event_emission_enabled=True)
+        events = []
+
+        @config.on_event([EventType.CREATE, EventType.DELETE], "x", coalesce=True)
+        def handler(event_type, old_value, new_value, **kwargs):
+            events.append((event_type, old_value, new_value))
+
+        config.set("x", 1)
+        config.delete("x")
+        config.set("x", 2)
+        config.flush()
+
+        assert events == [(EventType.DELETE, 1, None), (EventType.CREATE, None, 2)]
+        assert config.get("x") == 2
+
+    def test_values_changed_back_are_dropped(self):
+        """Test that a path ending with the value it started with is not delivered."""
+        config = NekoConf({"cfg": {"a": 1, "b": 1}}, event_emission_enabled=True)
+        events = []
+        batches = []
+
+        @config.on_change("cfg.*", coalesce=True)
+        def handler(path, old_value, new_value, **kwargs):
+            events.append((path, old_value, new_value))
+
+        @config.on_change("cfg.*", batch=True, coalesce=True)
+        def batch_handler(changes, **kwargs):
+            batches.append(
+                [(change.path, change.old_value, change.new_value) for change in changes]
+            )
+
+        config.set("cfg.a", 2)
+        config.set("cfg.a", 1)
+        config.set("cfg.b", 2)
+        config.set("cfg.b", True)
+        config.flush()
+
+        assert events == [("cfg.b", 1, True)]
+        assert batches == [[("cfg.b", 1, True)]]
+        assert config.event_pipeline.coalescer.delivered == 2
@@ -145,8 +145,7 @@ class TestEventHandler:
 
         assert handler.is_async is True, "Handler should be async based on the callback type"
 
-    @pytest.mark.asyncio
-    async def test_handler_handle_event_async(self):
+    def test_handler_handle_event_async(self):
         """Test handling events with an async callback."""
 
         # Use a real async function instead of AsyncMock for better compatibility
@@ -172,8 +171,8 @@ class TestEventHandler:
             config_data={"database": {"host": "db.example.com"}},
         )
 
-        # Test async handling
-        await handler.handle_async(context)
+        # Runs on the event loop thread, the call waits for it
+        handler.handle_event(context)
 
         # Callback should be called with the right parameters
         assert mock_async_callback.call_count == 1
@@ -182,8 +181,7 @@ class TestEventHandler:
         assert args["path"] == "database.host"
         assert args["custom_param"] == "test"
 
-    @pytest.mark.asyncio
-    async def test_handler_asyncmock_compatibility(self):
+    def test_handler_asyncmock_compatibility(self):
         """Test AsyncMock compatibility across Python versions."""
         import sys
 
@@ -204,8 +202,8 @@ class TestEventHandler:
                 config_data={"database": {"host": "db.example.com"}},
             )
 
-            # Test async handling
-            await handler.handle_async(context)
+            # Runs on the event loop thread, the call waits for it
+            handler.handle_event(context)
 
             # Callback should be called with the right parameters
             mock_callback.assert_called_once()
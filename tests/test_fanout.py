@@ -0,0 +1,195 @@
+"""Test cases for the bounded WebSocket fan-out."""
+
+import asyncio
+import json
+
+import pytest
+
+from nekoconf.core.config import NekoConf
+from nekoconf.server.app import ConfigApp, WebSocketManager
+from nekoconf.server.fanout import CLOSE_TRY_AGAIN_LATER, Fanout, SlowConsumerPolicy
+
+
+class FakeWebSocket:
+    """WebSocket recording sent messages, optionally held until released."""
+
+    def __init__(self, blocked=False):
+        self.sent = []
+        self.closed = None
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        await self.gate.wait()
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.closed = code
+
+
+def publish(fanout, websockets, message, snapshot=None):
+    fanout.publish(websockets, lambda websocket: message, snapshot)
+
+
+@pytest.mark.asyncio
+class TestFanout:
+    """Test cases for per-connection queues and slow-consumer policies."""
+
+    async def test_slow_client_does_not_delay_others(self):
+        """Test that messages reach fast clients while a slow one is stuck."""
+        fanout = Fanout()
+        slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+        fanout.add(slow)
+        fanout.add(fast)
+
+        for i in range(3):
+            publish(fanout, [slow, fast], f"m{i}")
+        await asyncio.wait_for(fanout._channels[fast].wait_idle(), 1)
+
+        assert fast.sent == ["m0", "m1", "m2"]
+        assert slow.sent == []
+        assert fanout.stats.broadcasts == 0  # Still pending for the slow client
+
+        slow.gate.set()
+        await fanout.join()
+
+        assert slow.sent == ["m0", "m1", "m2"]
+        stats = fanout.stats.to_dict()
+        assert stats["broadcasts"] == 3
+        assert stats["messages_sent"] == 6
+        assert stats["max_latency_ms"] >= stats["avg_latency_ms"] > 0
+
+    async def test_drop_policy(self):
+        """Test that messages for a full queue are dropped."""
+        fanout = Fanout(queue_size=2, policy="drop")
+        client = FakeWebSocket(blocked=True)
+        fanout.add(client)
+
+        for i in range(5):
+            publish(fanout, [client], f"m{i}")
+        client.gate.set()
+        await fanout.join()
+
+        assert client.sent == ["m0", "m1"]
+        assert fanout.stats.dropped == 3
+        assert fanout.stats.broadcasts == 5
+
+    async def test_coalesce_policy(self):
+        """Test that a full queue is replaced by the latest snapshot."""
+        fanout = Fanout(queue_size=2, policy=SlowConsumerPolicy.COALESCE)
+        client, other = FakeWebSocket(blocked=True), FakeWebSocket(blocked=True)
+        fanout.add(client)
+        fanout.add(other)
+        snapshots = []
+
+        for i in range(4):
+            publish(fanout, [client, other], f"patch {i}", lambda: snapshots.append(1) or "full")
+        client.gate.set()
+        other.gate.set()
+        await fanout.join()
+
+        assert client.sent == other.sent == ["full", "patch 3"]
+        assert snapshots == [1]  # Shared by all slow clients of a publication
+        assert fanout.stats.coalesced == 4
+
+    async def test_coalesce_without_snapshot(self):
+        """Test that without a snapshot, the new message replaces the queue."""
+        fanout = Fanout(queue_size=1, policy="coalesce")
+        client = FakeWebSocket(blocked=True)
+        fanout.add(client)
+
+        for i in range(3):
+            publish(fanout, [client], f"m{i}")
+        client.gate.set()
+        await fanout.join()
+
+        assert client.sent == ["m2"]
+
+    async def test_disconnect_policy(self):
+        """Test that clients with a full queue are disconnected."""
+        failed = []
+        fanout = Fanout(
+            queue_size=1, policy="disconnect", on_failure=lambda *args: failed.append(args)
+        )
+        client = FakeWebSocket(blocked=True)
+        fanout.add(client)
+
+        publish(fanout, [client], "m0")
+        publish(fanout, [client], "m1")
+        await asyncio.sleep(0.01)
+
+        assert client.closed == CLOSE_TRY_AGAIN_LATER
+        assert [websocket for websocket, _ in failed] == [client]
+        assert fanout.stats.disconnected == 1
+        assert fanout.stats.broadcasts == 2
+
+    async def test_send_timeout(self):
+        """Test that clients whose sends stall are dropped."""
+        failed = []
+        fanout = Fanout(send_timeout=0.01, on_failure=lambda *args: failed.append(args))
+        client = FakeWebSocket(blocked=True)
+        fanout.add(client)
+
+        publish(fanout, [client], "m0")
+        await asyncio.wait_for(fanout.join(), 1)
+
+        assert len(failed) == 1
+        assert isinstance(failed[0][1], asyncio.TimeoutError)
+        assert client not in fanout._channels
+
+    async def test_direct_messages_are_not_dropped(self):
+        """Test that messages sent to one client bypass the queue bound."""
+        fanout = Fanout(queue_size=1, policy="drop")
+        client = FakeWebSocket(blocked=True)
+        fanout.add(client)
+
+        publish(fanout, [client], "m0")
+        fanout.send(client, "initial")
+        client.gate.set()
+        await fanout.join()
+
+        assert client.sent == ["m0", "initial"]
+
+    async def test_invalid_options(self):
+        """Test that invalid options are rejected."""
+        with pytest.raises(ValueError):
+            Fanout(queue_size=0)
+        with pytest.raises(ValueError):
+            Fanout(policy="block")
+
+
+@pytest.mark.asyncio
+class TestConfigAppFanout:
+    """Test cases for configuration updates through the fan-out."""
+
+    async def test_slow_delta_client_gets_snapshot(self):
+        """Test that coalesced delta clients receive the latest full configuration."""
+        config = NekoConf({"port": 0}, event_emission_enabled=True)
+        app = ConfigApp("test-app", config, ws_options={"queue_size": 2})
+        client = FakeWebSocket(blocked=True)
+        await app.ws_manager.connect(client, delta=True)
+
+        for port in range(1, 6):
+            config.set("port", port)
+            await asyncio.sleep(0)
+        client.gate.set()
+        await app.ws_manager.join()
+
+        messages = [json.loads(message) for message in client.sent]
+        full = max(i for i, message in enumerate(messages) if message["type"] == "update")
+        versions = [message["version"] for message in messages[full:]]
+        assert app.ws_manager.stats["coalesced"] > 0
+        assert versions == list(range(versions[0], 6))  # Patches continue the snapshot
+        assert messages[full]["data"] == {"port": versions[0]}
+
+    async def test_manager_options(self):
+        """Test that manager options reach the fan-out."""
+        manager = WebSocketManager("test-app", queue_size=3, slow_consumer_policy="drop")
+
+        assert manager.fanout.queue_size == 3
+        assert manager.fanout.policy is SlowConsumerPolicy.DROP
+        assert manager.stats["broadcasts"] == 0
@@ -0,0 +1,251 @@
+"""Test cases for the file storage backend."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from nekoconf.core.config import NekoConf
+from nekoconf.storage.file import FileStorageBackend
+from nekoconf.utils.helper import write_file_atomic
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("server:\n  host: localhost\n  port: 8000\n")
+    return path
+
+
+class TestAtomicWrites:
+    """Test cases for write_file_atomic and atomic saves."""
+
+    def test_write_replaces_content_without_leftovers(self, tmp_path):
+        """Test that the temporary file is renamed into place."""
+        path = tmp_path / "config.yaml"
+        path.write_text("old")
+
+        write_file_atomic(path, b"new")
+
+        assert path.read_bytes() == b"new"
+        assert os.listdir(tmp_path) == ["config.yaml"]
+
+    def test_write_preserves_permissions(self, tmp_path):
+        """Test that replacing a file keeps its mode."""
+        path = tmp_path / "config.yaml"
+        path.write_text("old")
+        path.chmod(0o640)
+
+        write_file_atomic(path, b"new")
+
+        assert path.stat().st_mode & 0o777 == 0o640
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+    def test_new_file_uses_current_umask(self, tmp_path):
+        """Test that new files get the umask in effect when they are written."""
+        path = tmp_path / "config.yaml"
+        umask = os.umask(0o027)
+        try:
+            write_file_atomic(path, b"new")
+        finally:
+            os.umask(umask)
+
+        assert path.stat().st_mode & 0o777 == 0o640
+
+    def test_write_follows_symlinks(self, tmp_path):
+        """Test that a symlinked config is updated through the link."""
+        target = tmp_path / "real.yaml"
+        target.write_text("old")
+        link = tmp_path / "config.yaml"
+        link.symlink_to(target)
+
+        write_file_atomic(link, b"new")
+
+        assert link.is_symlink()
+        assert target.read_bytes() == b"new"
+
+    def test_failed_write_keeps_original(self, config_file):
+        """Test that a crash before the rename leaves the old file intact."""
+        original = config_file.read_bytes()
+        backend = FileStorageBackend(config_file)
+
+        with patch("nekoconf.utils.helper.os.replace", side_effect=OSError("crash")):
+            assert not backend.save({"server": {"host": "remote"}})
+
+        assert config_file.read_bytes() == original
+        assert os.listdir(config_file.parent) == ["config.yaml"]
+
+    def test_no_fsync_by_default(self, config_file):
+        """Test that saves leave flushing to the OS unless asked to fsync."""
+        backend = FileStorageBackend(config_file)
+        with patch("nekoconf.utils.helper.os.fsync") as fsync:
+            assert backend.save({"value": 1})
+        fsync.assert_not_called()
+
+    @pytest.mark.parametrize("policy, expected_fsyncs", [("none", 0), ("file", 1), ("file+dir", 2)])
+    def test_fsync_policy(self, config_file, policy, expected_fsyncs):
+        """Test how often each fsync policy flushes to disk."""
+        backend = FileStorageBackend(config_file, fsync=policy)
+
+        with patch("nekoconf.utils.helper.os.fsync") as fsync:
+            assert backend.save({"server": {"port": 9000}})
+
+        assert fsync.call_count == expected_fsyncs
+
+    def test_unknown_fsync_policy(self, config_file):
+        """Test that an unknown fsync policy is rejected."""
+        with pytest.raises(ValueError):
+            FileStorageBackend(config_file, fsync="always")
+
+
+class TestSaveFingerprint:
+    """Test cases for skipping unchanged saves."""
+
+    def test_unchanged_save_skips_write_and_read_back(self, config_file):
+        """Test that saving the same data twice writes once and never re-parses."""
+        backend = FileStorageBackend(config_file)
+        data = {"server": {"host": "remote"}}
+
+        with patch("nekoconf.storage.file.write_file_atomic", wraps=write_file_atomic) as write:
+            with patch("nekoconf.storage.file.read_file_data") as read:
+                assert backend.save(data)
+                assert backend.save(data)
+
+        assert write.call_count == 1
+        read.assert_not_called()
+        assert yaml.safe_load(config_file.read_text()) == data
+
+    def test_external_change_forces_write(self, config_file):
+        """Test that a file modified by someone else is overwritten on save."""
+        backend = FileStorageBackend(config_file)
+        data = {"server": {"host": "remote"}}
+        backend.save(data)
+
+        config_file.write_text("edited: externally\n")
+        assert backend.save(data)
+
+        assert yaml.safe_load(config_file.read_text()) == data
+
+    def test_load_fingerprint_skips_identical_save(self, config_file):
+        """Test that saving back freshly loaded data written by NekoConf is a no-op."""
+        FileStorageBackend(config_file).save({"server": {"port": 8000}})
+        mtime = config_file.stat().st_mtime_ns
+
+        backend = FileStorageBackend(config_file)
+        with patch("nekoconf.storage.file.write_file_atomic") as write:
+            assert backend.save(backend.load())
+
+        write.assert_not_called()
+        assert config_file.stat().st_mtime_ns == mtime
+
+    def test_unchanged_hand_written_file_keeps_its_bytes(self, config_file):
+        """Test that saving back an unchanged hand-written file keeps its formatting."""
+        content = b"# comment\nserver:   {port: 80}\n"
+        config_file.write_bytes(content)
+        synced = []
+
+        backend = FileStorageBackend(config_file)
+        backend._sync_handler = synced.append
+        data = backend.load()
+        with patch("nekoconf.storage.file.read_file_data") as read_file_data:
+            assert backend.save(data)
+
+        read_file_data.assert_not_called()
+        assert config_file.read_bytes() == content
+        assert synced == []
+
+    def test_transaction_keeps_unchanged_file(self, config_file):
+        """Test that a transaction without changes leaves the file alone."""
+        content = b"# comment\nserver:   {port: 80}\n"
+        config_file.write_bytes(content)
+        config = NekoConf(config_file)
+
+        with config.transaction():
+            pass
+
+        assert config_file.read_bytes() == content
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll until condition() is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def use_inotify(request):
+    return request.param
+
+
+class TestFileWatch:
+    """Test cases for reloading the file when it changes on disk."""
+
+    def watched_backend(self, path, use_inotify):
+        backend = FileStorageBackend(path, watch_debounce=0.05, watch_poll_interval=0.02)
+        backend.start_watching(use_inotify=use_inotify)
+        synced = []
+        backend._sync_handler = synced.append
+        return backend, synced
+
+    def test_external_change_is_synced(self, config_file, use_inotify):
+        """Test that content written by another process reaches the sync handler."""
+        backend, synced = self.watched_backend(config_file, use_inotify)
+        try:
+            write_file_atomic(config_file, b"server:\n  host: remote\n")
+            assert wait_for(lambda: synced)
+            assert synced == [{"server": {"host": "remote"}}]
+        finally:
+            backend.cleanup()
+        assert not backend.watching
+
+    def test_burst_of_writes_is_debounced(self, config_file):
+        """Test that an editor writing in several steps causes a single reload."""
+        backend, synced = self.watched_backend(config_file, True)
+        try:
+            with open(config_file, "w") as f:
+                for i in range(5):
+                    f.write(f"key{i}: {i}\n")
+                    f.flush()
+                    time.sleep(0.01)
+            assert wait_for(lambda: synced)
+            time.sleep(0.2)
+            assert synced == [{f"key{i}": i for i in range(5)}]
+        finally:
+            backend.cleanup()
+
+    def test_touch_and_own_saves_are_ignored(self, config_file, use_inotify):
+        """Test that unchanged content never triggers a reload."""
+        backend, synced = self.watched_backend(config_file, use_inotify)
+        try:
+            os.utime(config_file)
+            config_file.write_bytes(config_file.read_bytes())
+            backend._sync_handler = None
+            backend.save({"server": {"host": "saved"}})
+            backend._sync_handler = synced.append
+            time.sleep(0.3)
+            assert synced == []
+        finally:
+            backend.cleanup()
+
+    def test_config_reloads_on_change(self, config_file):
+        """Test that NekoConf picks up an edited file through replace."""
+        config = NekoConf(
+            FileStorageBackend(config_file, watch=True, watch_debounce=0.05),
+            event_emission_enabled=True,
+        )
+        changes = []
+
+        @config.on_change("server.port")
+        def record(new_value, **kwargs):
+            changes.append(new_value)
+
+        try:
+            config_file.write_text("server:\n  host: localhost\n  port: 9000\n")
+            assert wait_for(lambda: config.get("server.port") == 9000)
+            assert changes == [9000]
+        finally:
+            config.cleanup()
@@ -0,0 +1,114 @@
+"""Test cases for the event handler index."""
+
+import pytest
+
+from nekoconf.event.handler import EventContext, EventHandler
+from nekoconf.event.index import HandlerIndex
+from nekoconf.event.pipeline import EventPipeline
+from nekoconf.event.type import EventType
+
+PATTERNS = [
+    None,
+    "",
+    "*",
+    "@global",
+    "database.host",
+    "database.*",
+    "database.*.enabled",
+    "*.host",
+    "*.*",
+    "servers[*].host",
+    "servers[0].host",
+    "servers[*]",
+    "servers.*",
+    "config.*.options[*]",
+    "database.host.*",
+]
+
+PATHS = [
+    None,
+    "*",
+    "",
+    "database",
+    "database.host",
+    "database.port",
+    "database.primary.enabled",
+    "database.host.extra",
+    "server.host",
+    "servers[0]",
+    "servers[0].host",
+    "servers[3].host",
+    "servers[3].port",
+    "config.section1.options[3]",
+    "logging.level",
+]
+
+
+def _noop(**kwargs):
+    pass
+
+
+class TestHandlerIndex:
+    """Test cases for HandlerIndex lookups."""
+
+    @pytest.fixture
+    def handlers(self):
+        handlers = []
+        for i, pattern in enumerate(PATTERNS):
+            event_types = {EventType.CHANGE} if i % 2 else {EventType.CHANGE, EventType.UPDATE}
+            handlers.append(EventHandler(_noop, event_types, pattern, priority=i % 3))
+        handlers.sort(key=lambda h: h.priority)
+        return handlers
+
+    @pytest.mark.parametrize("event_type", [EventType.CHANGE, EventType.UPDATE, EventType.DELETE])
+    @pytest.mark.parametrize("path", PATHS)
+    def test_lookup_matches_linear_scan(self, handlers, event_type, path):
+        """Test that index lookups equal a linear scan with EventHandler.matches."""
+        index = HandlerIndex(handlers)
+        context = EventContext(event_type, path)
+
+        expected = [handler for handler in handlers if handler.matches(context)]
+        assert index.lookup(event_type, path) == expected
+
+    def test_pipeline_preserves_priority_order(self):
+        """Test that indexed dispatch keeps priority and registration order."""
+        pipeline = EventPipeline()
+        calls = []
+
+        def make_callback(name):
+            def callback(**kwargs):
+                calls.append(name)
+
+            callback.__name__ = name
+            return callback
+
+        pipeline.register_handler(make_callback("prefix"), EventType.CHANGE, "database.*", 100)
+        pipeline.register_handler(make_callback("exact"), EventType.CHANGE, "database.host", 50)
+        pipeline.register_handler(make_callback("all"), EventType.CHANGE, None, 100)
+        pipeline.register_handler(make_callback("wildcard"), EventType.CHANGE, "*.host", 10)
+
+        count = pipeline.emit(EventType.CHANGE, "database.host")
+
+        assert count == 4
+        assert calls == ["wildcard", "exact", "prefix", "all"]
+
+    def test_pipeline_index_tracks_handler_changes(self):
+        """Test that the index is rebuilt when handlers are added or replaced."""
+        pipeline = EventPipeline()
+        calls = []
+
+        def callback(**kwargs):
+            calls.append(kwargs["path"])
+
+        handler = pipeline.register_handler(callback, EventType.CHANGE, "database.*")
+        assert pipeline.emit(EventType.CHANGE, "database.host") == 1
+
+        pipeline.unregister_handler(handler)
+        assert pipeline.emit(EventType.CHANGE, "database.host") == 0
+
+        pipeline.handlers = [handler]
+        assert pipeline.emit(EventType.CHANGE, "database.host") == 1
+
+        pipeline.handlers.clear()
+        assert pipeline.emit(EventType.CHANGE, "database.host") == 0
+        assert calls == ["database.host", "database.host"]
@@ -0,0 +1,141 @@
+"""Test cases for JSON-Patch-like configuration deltas."""
+
+import pytest
+
+from nekoconf.core.config import NekoConf
+from nekoconf.core.persistent import PersistentMap, freeze
+from nekoconf.event.changes import ChangeTracker
+from nekoconf.event.patch import (
+    PatchError,
+    apply_patch,
+    changes_to_patch,
+    decode_pointer,
+    encode_pointer,
+)
+from nekoconf.storage.base import StorageBackend
+
+OLD = {"server": {"host": "localhost", "port": 8000}, "debug": True, "tags": ["a"]}
+NEW = {"server": {"host": "localhost", "port": 9000}, "tags": ["a", "b"], "cache": {"ttl": 60}}
+
+
+class MemoryBackend(StorageBackend):
+    """Backend receiving deltas from outside, like the remote backend."""
+
+    def __init__(self, data):
+        super().__init__()
+        self.data = data
+
+    def load(self):
+        return self.data
+
+    def save(self, data):
+        return True
+
+
+class TestPatch:
+    """Test cases for building and applying patches."""
+
+    def test_pointers(self):
+        """Test JSON Pointer escaping."""
+        keys = ["a/b", "c~d", ""]
+
+        assert encode_pointer(keys) == "/a~1b/c~0d/"
+        assert decode_pointer(encode_pointer(keys)) == keys
+        with pytest.raises(PatchError):
+            decode_pointer("no/slash")
+
+    def test_changes_to_patch(self):
+        """Test that detected changes become add, replace and remove operations."""
+        ops = changes_to_patch(ChangeTracker.detect_changes(OLD, NEW), NEW)
+
+        assert sorted(ops, key=lambda op: op["path"]) == [
+            {"op": "add", "path": "/cache", "value": {"ttl": 60}},
+            {"op": "remove", "path": "/debug"},
+            {"op": "replace", "path": "/server/port", "value": 9000},
+            {"op": "replace", "path": "/tags", "value": ["a", "b"]},
+        ]
+
+    def test_dotted_keys_are_not_patched(self):
+        """Test that ambiguous dotted keys produce no patch."""
+        changes = ChangeTracker.detect_changes({}, {"a.b": 1})
+
+        assert changes_to_patch(changes, {"a.b": 1}) is None
+
+    @pytest.mark.parametrize("persistent", [False, True], ids=["dict", "persistent"])
+    def test_round_trip(self, persistent):
+        """Test that applying the patch of a change reproduces the new state."""
+        ops = changes_to_patch(ChangeTracker.detect_changes(OLD, NEW), NEW)
+        data = freeze(OLD) if persistent else {**OLD, "server": dict(OLD["server"])}
+
+        patched = apply_patch(data, ops)
+
+        assert patched == (freeze(NEW) if persistent else NEW)
+        if persistent:
+            assert isinstance(patched, PersistentMap)
+            assert data == freeze(OLD)
+
+    @pytest.mark.parametrize(
+        "op",
+        [
+            {"op": "remove", "path": "/missing"},
+            {"op": "replace", "path": "/missing", "value": 1},
+            {"op": "add", "path": "/missing/key", "value": 1},
+            {"op": "add", "path": "/debug/key", "value": 1},
+            {"op": "move", "path": "/debug"},
+            {"op": "add", "path": "/debug"},
+        ],
+    )
+    def test_invalid_operations(self, op):
+        """Test that operations that do not apply are rejected."""
+        with pytest.raises(PatchError):
+            apply_patch(dict(OLD), [op])
+        with pytest.raises(PatchError):
+            apply_patch(freeze(OLD), [op])
+
+
+class TestStoragePatch:
+    """Test cases for NekoConf applying patches from its storage backend."""
+
+    @pytest.fixture(params=[False, True], ids=["dict", "persistent"])
+    def config(self, request):
+        backend = MemoryBackend({"server": {"host": "localhost", "port": 8000}, "debug": True})
+        return NekoConf(backend, event_emission_enabled=True, persistent=request.param)
+
+    def test_patch_emits_changes(self, config):
+        """Test that patches update the configuration and emit change events."""
+        changes = []
+
+        @config.on_change("server.*")
+        def record(path, old_value, new_value, **kwargs):
+            changes.append((path, old_value, new_value))
+
+        applied = config.storage_backend.patch(
+            [
+                {"op": "replace", "path": "/server/port", "value": 9000},
+                {"op": "remove", "path": "/debug"},
+            ]
+        )
+
+        assert applied
+        assert config.get_all() == {"server": {"host": "localhost", "port": 9000}}
+        assert changes == [("server.port", 8000, 9000)]
+
+    def test_patch_that_does_not_apply(self, config):
+        """Test that patches for another state are rejected."""
+        assert not config.storage_backend.patch([{"op": "remove", "path": "/missing"}])
+        assert config.get("debug") is True
+
+    def test_patch_keeps_env_overrides(self, monkeypatch):
+        """Test that environment overrides win over patched values."""
+        monkeypatch.setenv("NEKOCONF_SERVER_PORT", "7000")
+        config = NekoConf(MemoryBackend({"server": {"port": 8000}}), env_override_enabled=True)
+
+        assert config.storage_backend.patch(
+            [{"op": "replace", "path": "/server", "value": {"port": 1, "host": "h"}}]
+        )
+
+        assert config.get("server") == {"port": 7000, "host": "h"}
+
+    def test_backend_without_handler(self):
+        """Test that backends without an owner report patches as not applied."""
+        assert not MemoryBackend({}).patch([{"op": "remove", "path": "/a"}])
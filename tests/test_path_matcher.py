@@ -2,7 +2,10 @@
 
 import pytest
 
-from nekoconf.event.match import PathMatcher
+from nekoconf.event.handler import EventHandler
+from nekoconf.event.match import CompiledPattern, PathMatcher
+from nekoconf.event.type import EventType
+from nekoconf.utils.helper import compile_path
 
 
 class TestPathMatcher:
@@ -80,3 +83,56 @@ class TestPathMatcher:
         # These should work with the JMESPath evaluation
         assert PathMatcher.match("servers[*].config", "servers[2].config") is True
         assert PathMatcher.match("users[*].roles[*]", "users[1].roles[3]") is True
+
+
+class TestCompiledPattern:
+    """Test cases for CompiledPattern functionality."""
+
+    @pytest.mark.parametrize(
+        "pattern, kind",
+        [
+            ("", "empty"),
+            ("*", "any"),
+            ("database.host", "exact"),
+            ("servers[0].host", "exact"),
+            ("database.*", "prefix"),
+            ("servers[*].config.*", "prefix"),
+            ("servers[*].host", "wildcard"),
+            ("*.host", "wildcard"),
+        ],
+    )
+    def test_pattern_kind(self, pattern, kind):
+        """Test that patterns are classified for the matching fast paths."""
+        assert CompiledPattern(pattern).kind == kind
+
+    @pytest.mark.parametrize(
+        "pattern",
+        ["", "*", "database.host", "database.*", "*.host", "servers[*].host", "database.host.*"],
+    )
+    @pytest.mark.parametrize(
+        "path",
+        ["", "database", "database.host", "database.port", "servers[0].host", "servers.1.host"],
+    )
+    def test_matches_path_matcher(self, pattern, path):
+        """Test that compiled patterns agree with PathMatcher."""
+        compiled = CompiledPattern(pattern)
+        expected = PathMatcher.match(pattern, path)
+
+        assert compiled.match(path) is expected
+        assert compiled.match(compile_path(path).keys) is expected
+
+    def test_match_split_path(self):
+        """Test matching against already-split path keys."""
+        compiled = CompiledPattern("servers[*].host")
+
+        assert compiled.match(("servers", "0", "host")) is True
+        assert compiled.match(["servers", "0", "port"]) is False
+        assert compiled.match(compile_path("servers[2].host")) is True
+
+    def test_handler_compiles_pattern_once(self):
+        """Test that event handlers compile their pattern at registration."""
+        handler = EventHandler(lambda **kwargs: None, {EventType.CHANGE}, "database.*")
+
+        assert isinstance(handler.compiled_pattern, CompiledPattern)
+        assert handler.compiled_pattern.is_prefix
+        assert EventHandler(lambda **kwargs: None, {EventType.CHANGE}).compiled_pattern is None
@@ -0,0 +1,335 @@
+"""Test cases for the persistent configuration tree."""
+
+import copy
+import random
+
+import pytest
+import yaml
+
+from nekoconf.core.config import NekoConf
+from nekoconf.core.persistent import (
+    MISSING,
+    PersistentMap,
+    delete_in,
+    freeze,
+    merge_in,
+    set_in,
+    thaw,
+)
+from nekoconf.event.changes import ChangeTracker
+from nekoconf.event.pipeline import EventType
+
+
+class _CollidingKey:
+    """Key type with a constant hash to exercise collision nodes."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, _CollidingKey) and other.value == self.value
+
+
+class TestPersistentMap:
+    """Test cases for PersistentMap."""
+
+    def test_mapping_interface(self):
+        """Test that the map behaves like a read-only dict."""
+        pmap = PersistentMap({"b": 1, "a": 2})
+
+        assert pmap["b"] == 1
+        assert pmap.get("missing", "default") == "default"
+        assert "a" in pmap and "c" not in pmap
+        assert len(pmap) == 2
+        assert list(pmap) == ["b", "a"]
+        assert list(pmap.items()) == [("b", 1), ("a", 2)]
+        assert pmap == {"b": 1, "a": 2}
+        with pytest.raises(KeyError):
+            pmap["missing"]
+
+    def test_writes_leave_original_untouched(self):
+        """Test that set and delete return new maps."""
+        original = PersistentMap({"a": 1})
+
+        updated = original.set("b", 2).delete("a")
+
+        assert original == {"a": 1}
+        assert updated == {"b": 2}
+        assert original.set("a", original["a"]) is original
+        assert original.delete("missing") is original
+
+    def test_matches_dict_under_random_operations(self):
+        """Test the map against a dict, including old versions kept as snapshots."""
+        rng = random.Random(7)
+        expected = {}
+        pmap = PersistentMap()
+        snapshots = []
+
+        for step in range(5000):
+            key = rng.randrange(800)
+            if rng.random() < 0.3:
+                expected.pop(key, None)
+                pmap = pmap.delete(key)
+            else:
+                expected[key] = step
+                pmap = pmap.set(key, step)
+            if step % 500 == 0:
+                snapshots.append((dict(expected), pmap))
+
+        assert len(pmap) == len(expected)
+        assert list(pmap.items()) == list(expected.items())
+        for snapshot_dict, snapshot_map in snapshots:
+            assert list(snapshot_map.items()) == list(snapshot_dict.items())
+
+    def test_hash_collisions(self):
+        """Test keys that share the same hash."""
+        keys = [_CollidingKey(i) for i in range(5)]
+        pmap = PersistentMap({key: key.value for key in keys})
+
+        assert [pmap[key] for key in keys] == [0, 1, 2, 3, 4]
+        for key in keys[:4]:
+            pmap = pmap.delete(key)
+        assert len(pmap) == 1
+        assert pmap[keys[4]] == 4
+
+    def test_diff_reports_only_changed_entries(self):
+        """Test that diff yields the differing entries of two versions."""
+        base = PersistentMap({f"key{i}": i for i in range(1000)})
+        changed = base.set("key1", "one").delete("key2").set("new", True)
+
+        diff = {key: (old, new) for key, old, new in base.diff(changed)}
+
+        assert diff == {
+            "key1": (1, "one"),
+            "key2": (2, MISSING),
+            "new": (MISSING, True),
+        }
+        assert list(base.diff(base)) == []
+
+    def test_freeze_and_thaw(self):
+        """Test conversion between plain and persistent values."""
+        data = {"servers": [{"host": "a"}, {"host": "b"}], "debug": True}
+
+        frozen = freeze(data)
+
+        assert isinstance(frozen["servers"], tuple)
+        assert isinstance(frozen["servers"][0], PersistentMap)
+        assert thaw(frozen) == data
+        assert freeze(frozen) is frozen
+
+
+class TestPathCopying:
+    """Test cases for the path-copying helpers."""
+
+    @pytest.fixture
+    def root(self):
+        return freeze({"database": {"host": "localhost"}, "servers": [{"port": 80}]})
+
+    def test_set_in_shares_untouched_subtrees(self, root):
+        """Test that only the nodes along the path are copied."""
+        new_root, changed = set_in(root, "database.port", 5432)
+
+        assert changed
+        assert new_root["servers"] is root["servers"]
+        assert thaw(root)["database"] == {"host": "localhost"}
+        assert thaw(new_root)["database"] == {"host": "localhost", "port": 5432}
+
+    def test_set_in_same_value(self, root):
+        """Test that setting an equal value does not change the tree."""
+        assert set_in(root, "servers", [{"port": 80}]) == (root, False)
+
+    def test_set_in_list_index(self, root):
+        """Test setting values through list indexes, extending the list."""
+        new_root, _ = set_in(root, "servers[2].port", 8080)
+
+        assert thaw(new_root)["servers"] == [{"port": 80}, {}, {"port": 8080}]
+
+    def test_delete_in(self, root):
+        """Test deleting keys and list items."""
+        new_root, success, old_value = delete_in(root, "servers[0]")
+        assert success and old_value == freeze({"port": 80})
+        assert new_root["servers"] == ()
+
+        assert delete_in(root, "missing.key") == (root, False, None)
+
+    def test_merge_in(self, root):
+        """Test deep merging plain data into the tree."""
+        merged = merge_in(root, {"database": {"port": 5432}})
+
+        assert thaw(merged)["database"] == {"host": "localhost", "port": 5432}
+        assert merged["servers"] is root["servers"]
+        assert merge_in(root, {"database": {"host": "localhost"}}) is root
+
+
+class TestPersistentConfig:
+    """Test cases for NekoConf in persistent mode."""
+
+    @pytest.fixture
+    def data(self):
+        return {
+            "database": {"host": "localhost", "port": 5432},
+            "servers": [{"host": "a"}, {"host": "b"}],
+            "debug": False,
+        }
+
+    def test_read_api(self, data):
+        """Test the read API on a persistent tree."""
+        config = NekoConf(data, persistent=True)
+
+        assert isinstance(config.data, PersistentMap)
+        assert config.get("database.port") == 5432
+        assert config.get("servers[1].host") == "b"
+        assert config.get_dict("database") == {"host": "localhost", "port": 5432}
+        assert config.get_list("servers") == [{"host": "a"}, {"host": "b"}]
+        assert config.get_all() == data
+        assert config.to_dict() == data
+
+    def test_snapshot_is_isolated(self, data):
+        """Test that snapshots are O(1) and unaffected by later writes."""
+        config = NekoConf(data, persistent=True)
+
+        snapshot = config.snapshot()
+        config.set("database.port", 6543)
+        config.delete("debug")
+        config.update({"cache": {"ttl": 60}})
+
+        assert snapshot is not config.data
+        assert thaw(snapshot) == data
+        assert config.to_dict() == {
+            "database": {"host": "localhost", "port": 6543},
+            "servers": [{"host": "a"}, {"host": "b"}],
+            "cache": {"ttl": 60},
+        }
+
+    def test_events_match_dict_mode(self, data):
+        """Test that the same writes emit the same events in both data models."""
+
+        def run(persistent):
+            config = NekoConf(
+                copy.deepcopy(data), event_emission_enabled=True, persistent=persistent
+            )
+            events = []
+
+            @config.on_event(list(EventType), "*")
+            def record(event_type, path, **kwargs):
+                events.append((event_type, path))
+
+            config.set("database.port", 6543)
+            config.set("database.port", 6543)
+            config.set("servers[0].host", "c")
+            config.delete("debug")
+            config.update({"database": {"user": "admin"}})
+            config.replace({"database": {"host": "remote"}})
+            return events
+
+        assert run(persistent=True) == run(persistent=False)
+
+    def test_update_keeps_value_types(self):
+        """Test that merging equal values of another type replaces them, as in dict mode."""
+        for persistent in (False, True):
+            config = NekoConf({"x": 0, "a": {"q": 1, "r": [1]}, "y": 1}, persistent=persistent)
+
+            config.update({"x": False, "a": {"q": True, "r": [1.0]}})
+
+            data = config.to_dict()
+            assert data == {"x": False, "a": {"q": True, "r": [1.0]}, "y": 1}
+            assert [type(data["x"]), type(data["a"]["q"]), type(data["a"]["r"][0])] == [
+                bool,
+                bool,
+                float,
+            ]
+
+    def test_random_writes_match_dict_mode(self):
+        """Test that random writes of equal values of different types match dict mode."""
+        values = [0, 1, 0.0, 1.0, True, False, None, [0], [False], {"q": 1}, {"q": True}]
+        paths = ["a", "b", "a.q", "a.r", "b.q"]
+
+        def typed(value):
+            # Tells apart values that compare equal, such as 0, 0.0 and False
+            if isinstance(value, (dict, PersistentMap)):
+                return {key: typed(item) for key, item in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [typed(item) for item in value]
+            return (type(value).__name__, value)
+
+        def run(seed, persistent):
+            rng = random.Random(seed)
+            config = NekoConf(
+                {"a": {"q": 1}, "b": 0}, event_emission_enabled=True, persistent=persistent
+            )
+            results = []
+
+            @config.on_event(list(EventType), "*")
+            def record(event_type, path, old_value, new_value, **kwargs):
+                results.append((event_type, path, typed(old_value), typed(new_value)))
+
+            for _ in range(50):
+                operation = rng.choice(["set", "delete", "update", "replace"])
+                if operation == "set":
+                    args = (rng.choice(paths), copy.deepcopy(rng.choice(values)))
+                elif operation == "delete":
+                    args = (rng.choice(paths),)
+                else:
+                    keys = rng.sample(["a", "b", "c"], rng.randint(1, 3))
+                    args = ({key: copy.deepcopy(rng.choice(values)) for key in keys},)
+                results.append(getattr(config, operation)(*args))
+            results.append(typed(config.to_dict()))
+            return results
+
+        for seed in range(8):
+            assert run(seed, persistent=True) == run(seed, persistent=False)
+
+    def test_getters_return_plain_data(self, data):
+        """Test that the getters return serializable plain dicts and lists."""
+        config = NekoConf(data, persistent=True)
+
+        assert type(config.get_all()) is dict
+        assert type(config.get("servers")) is list
+        assert type(config.get("servers[0]")) is dict
+        assert config.get("missing", ("default",)) == ("default",)
+        assert yaml.safe_load(yaml.safe_dump(config.get_all())) == data
+        assert config.set("database.port", 6543) is None
+        with config.transaction() as txn:
+            assert type(txn.get("servers")) is list
+
+    def test_transaction_does_not_copy(self, data):
+        """Test that transactions start from the committed tree itself."""
+        config = NekoConf(data, event_emission_enabled=True, persistent=True)
+        before = config.data
+
+        with config.transaction() as txn:
+            assert txn.transaction_data is before
+            txn.set("database.host", "remote")
+            txn.delete("servers[1]")
+            assert config.get("database.host") == "localhost"
+
+        assert before["database"]["host"] == "localhost"
+        assert config.get("database.host") == "remote"
+        assert config.get_list("servers") == [{"host": "a"}]
+
+    def test_diff_visits_only_changed_nodes(self):
+        """Test that diffing two versions of a large tree only reports the change."""
+        root = freeze({f"section{i}": {"value": i} for i in range(2000)})
+        new_root, _ = set_in(root, "section7.value", "seven")
+
+        changes = ChangeTracker.detect_changes(root, new_root)
+
+        assert [(change.path, change.new_value) for change in changes[1:]] == [
+            ("section7.value", "seven")
+        ]
+
+    def test_save_writes_plain_data(self, tmp_path, data):
+        """Test that the persistent tree is saved as plain YAML."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.dump(data))
+
+        config = NekoConf(config_path, persistent=True)
+        config.set("database.port", 6543)
+        assert config.save()
+
+        saved = yaml.safe_load(config_path.read_text())
+        assert saved["database"]["port"] == 6543
+        assert saved["servers"] == [{"host": "a"}, {"host": "b"}]
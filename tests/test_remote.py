@@ -0,0 +1,292 @@
+"""Tests for the remote storage backend against a local orchestrator."""
+
+import asyncio
+import gzip
+import json
+import socket
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+import uvicorn
+
+from nekoconf.core.config import NekoConf
+from nekoconf.server.app import NekoConfOrchestrator
+from nekoconf.server.compression import GZipRequestMiddleware
+from nekoconf.storage.remote import RemoteStorageBackend
+
+BIG = {"values": {f"key_{i}": f"value number {i}" for i in range(200)}}
+
+
+@pytest.fixture(scope="module")
+def orchestrator():
+    """Run an orchestrator on a free local port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    instance = NekoConfOrchestrator(
+        apps={"app": NekoConf({"server": {"port": 8000}}, event_emission_enabled=True)}
+    )
+    server = uvicorn.Server(
+        uvicorn.Config(instance.app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        assert time.monotonic() < deadline, "orchestrator did not start"
+        time.sleep(0.01)
+
+    yield instance, f"http://127.0.0.1:{port}"
+
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def backend(orchestrator):
+    _, url = orchestrator
+    backend = RemoteStorageBackend(url, app_name="app", reconnect_delay=0.1)
+    yield backend
+    backend.cleanup()
+
+
+def connections(backend):
+    """Number of TCP connections the backend has opened to the orchestrator."""
+    pools = backend._session.get_adapter(backend.remote_url).poolmanager.pools
+    return sum(pools[key].num_connections for key in pools.keys())
+
+
+class TestRemoteStorageBackend:
+    """Test cases for loading and saving through a pooled session."""
+
+    def test_load_and_save(self, orchestrator, backend):
+        """Test that saves reach the orchestrator and loads read them back."""
+        instance, _ = orchestrator
+
+        assert backend.save({"server": {"port": 9000}})
+
+        assert backend.load() == {"server": {"port": 9000}}
+        assert instance.manager.get_app("app").config.get("server.port") == 9000
+
+    def test_connections_are_reused(self, backend):
+        """Test that repeated requests share one kept-alive connection."""
+        for port in range(20):
+            assert backend.save({"server": {"port": port}})
+            backend.load()
+
+        assert connections(backend) == 1
+
+    def test_compressed_save(self, orchestrator, backend):
+        """Test that large bodies are compressed and accepted."""
+        instance, _ = orchestrator
+        sent = []
+        request = backend._session.request
+        backend._session.request = lambda *args, **kwargs: sent.append(kwargs) or request(
+            *args, **kwargs
+        )
+
+        assert backend.save(BIG)
+
+        assert sent[0]["headers"]["Content-Encoding"] == "gzip"
+        assert instance.manager.get_app("app").config.get("values.key_199") == "value number 199"
+        assert backend.compress
+
+    def test_compression_fallback(self, backend):
+        """Test that compression is turned off for servers that reject it."""
+        statuses = iter([422, 200])
+        backend._session.request = MagicMock(
+            side_effect=lambda *args, **kwargs: MagicMock(status_code=next(statuses))
+        )
+
+        assert backend.save(BIG)
+
+        first, second = backend._session.request.call_args_list
+        assert "Content-Encoding" in first.kwargs["headers"]
+        assert "Content-Encoding" not in second.kwargs["headers"]
+        assert not backend.compress
+
+    def test_save_creates_missing_app(self, orchestrator):
+        """Test that saving to an unknown app creates it."""
+        instance, url = orchestrator
+        backend = RemoteStorageBackend(url, app_name="created", reconnect_delay=0.1)
+
+        assert backend.load() == {}
+        assert backend.save({"new": True})
+
+        assert instance.manager.get_app("created").config.get("new") is True
+        backend.cleanup()
+
+    def test_unchanged_load_is_revalidated(self, orchestrator, backend):
+        """Test that loads of an unchanged configuration reuse the cached body."""
+        instance, _ = orchestrator
+        assert backend.save({"server": {"port": 8100}})
+        statuses = []
+        get = backend._session.get
+        backend._session.get = (
+            lambda *args, **kwargs: statuses.append(get(*args, **kwargs)) or statuses[-1]
+        )
+
+        first = backend.load()
+        first["server"]["port"] = 1
+        second = backend.load()
+        instance.manager.get_app("app").config.set("server.port", 8200)
+        third = backend.load()
+
+        assert [response.status_code for response in statuses] == [200, 304, 200]
+        assert statuses[1].content == b""
+        assert second == {"server": {"port": 8100}}
+        assert third == {"server": {"port": 8200}}
+
+    def test_retries_unavailable_server(self):
+        """Test that connection failures are retried before giving up."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        backend = RemoteStorageBackend(
+            url, reconnect_attempts=1, reconnect_delay=0.1, max_retries=2, backoff_factor=0.01
+        )
+        retry = backend._session.get_adapter(url).max_retries
+
+        assert retry.total == 2
+        assert not backend.save({"a": 1})
+        backend.cleanup()
+
+
+class TestGZipRequestMiddleware:
+    """Test cases for compressed request bodies on the orchestrator."""
+
+    def test_invalid_gzip_body(self, orchestrator):
+        """Test that corrupt compressed bodies are rejected."""
+        _, url = orchestrator
+
+        response = requests.put(
+            f"{url}/api/apps/app/config",
+            data=b"not gzip",
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 400
+
+    def test_oversized_gzip_body(self):
+        """Test that bodies decompressing beyond the limit are rejected while streaming."""
+        calls = []
+
+        async def app(scope, receive, send):
+            calls.append(scope)
+
+        middleware = GZipRequestMiddleware(app, max_size=1024)
+        compressed = gzip.compress(b"0" * 1024 * 1024)
+        chunks = [compressed[i : i + 64] for i in range(0, len(compressed), 64)]
+        received = []
+        sent = []
+
+        async def receive():
+            body = chunks[len(received)]
+            received.append(body)
+            return {"type": "http.request", "body": body, "more_body": len(received) < len(chunks)}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": [(b"content-encoding", b"gzip")]}
+        asyncio.run(middleware(scope, receive, send))
+
+        assert sent[0]["status"] == 413
+        assert calls == []
+        assert len(received) < len(chunks)
+
+    def test_gzip_body(self, orchestrator):
+        """Test that compressed bodies are decompressed before validation."""
+        _, url = orchestrator
+        body = json.dumps({"data": json.dumps({"gz": 1}), "format": "json"}).encode()
+
+        response = requests.put(
+            f"{url}/api/apps/app/config",
+            data=gzip.compress(body),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"] == {"gz": 1}
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestDeltaSync:
+    """Test cases for WebSocket updates sent as patches."""
+
+    @pytest.fixture
+    def synced(self, orchestrator, request):
+        """A server app and a client configuration connected to it."""
+        instance, url = orchestrator
+        name = request.node.name.replace("_", "-")[:60]
+        server = instance.manager.create_app(
+            name, NekoConf({"server": {"port": 8000}, "debug": True}, event_emission_enabled=True)
+        )
+        backend = RemoteStorageBackend(url, app_name=name, reconnect_delay=0.1)
+        client = NekoConf(backend, event_emission_enabled=True)
+        assert wait_for(lambda: backend._version is not None)
+
+        yield server, client
+        client.cleanup()
+        wait_for(lambda: not server.ws_manager.connections)
+        instance.manager.delete_app(name)
+
+    def test_changes_arrive_as_patches(self, synced):
+        """Test that server changes are applied on the client from patches."""
+        server, client = synced
+        backend = client.storage_backend
+        received = []
+        backend.sync = lambda data: received.append(data)
+        changes = []
+        client.on_change("server.port")(lambda new_value, **kwargs: changes.append(new_value))
+
+        server.config.set("server.port", 9000)
+        server.config.delete("debug")
+
+        assert wait_for(lambda: client.get_all() == {"server": {"port": 9000}})
+        assert changes == [9000]
+        assert received == []
+        assert backend._version == server.version
+
+    def test_missed_version_resyncs(self, synced):
+        """Test that a gap in versions is repaired with the full configuration."""
+        server, client = synced
+        backend = client.storage_backend
+        backend._version -= 1
+
+        server.config.set("server.port", 9000)
+
+        assert wait_for(lambda: backend._version == server.version)
+        assert client.get("server.port") == 9000
+
+    def test_reconnect_without_changes(self, synced):
+        """Test that reconnecting clients with a current copy are not sent it again."""
+        server, client = synced
+        backend = client.storage_backend
+        received = []
+        on_message = backend._on_ws_message
+        backend._on_ws_message = lambda ws, message: received.append(
+            json.loads(message)["type"]
+        ) or on_message(ws, message)
+
+        manager = server.ws_manager
+        asyncio.run_coroutine_threadsafe(manager.connections[0].close(), manager.loop).result()
+        assert wait_for(lambda: received)
+        server.config.set("server.port", 9000)
+        assert wait_for(lambda: len(received) == 2)
+
+        assert received == ["unchanged", "patch"]
+        assert backend._version == server.version
+        assert client.get("server.port") == 9000
@@ -0,0 +1,206 @@
+"""Test cases for loading large JSON configuration files section by section."""
+
+import copy
+import json
+
+import pytest
+
+from nekoconf.core.config import NekoConf
+from nekoconf.storage.file import FileStorageBackend
+from nekoconf.utils.sections import JSONSections
+
+DATA = {
+    "server": {"host": "localhost", "port": 8000},
+    "flags": {
+        "new_ui": {"enabled": True, "rules": [{"in": ["US", "DE"]}]},
+        "tricky": 'quotes " and brackets ]} [{ in strings \\',
+    },
+    "routes": [[1, 2], {"a": []}, "x"],
+    "ratio": 0.5,
+    "name": "neko",
+    "empty": {},
+    "unset": None,
+}
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(DATA, indent=2))
+    return path
+
+
+class TestJSONSections:
+    """Test cases for the incremental JSON section index."""
+
+    def test_sections_match_full_parse(self, config_file):
+        """Test that every section parses to the same value as the full document."""
+        document = JSONSections(config_file)
+
+        assert document.keys() == list(DATA)
+        for key, value in DATA.items():
+            assert document.load(key) == value
+        document.close()
+
+    def test_scans_only_as_far_as_needed(self, config_file):
+        """Test that finding an early section does not index the rest."""
+        document = JSONSections(config_file)
+
+        assert document.load("server") == DATA["server"]
+        assert list(document._spans) == ["server"]
+        assert "missing" not in document
+        assert list(document._spans) == list(DATA)
+        document.close()
+
+    def test_raw_section(self, config_file):
+        """Test that raw sections are the unparsed document text."""
+        document = JSONSections(config_file)
+
+        assert json.loads(document.raw("routes")) == DATA["routes"]
+        with pytest.raises(KeyError):
+            document.raw("missing")
+        document.close()
+
+    @pytest.mark.parametrize("content", ["", "  \n", "{}", '{ "a" : 1 , "b":[ ] }'])
+    def test_compact_and_empty_documents(self, tmp_path, content):
+        """Test documents without indentation and empty files."""
+        path = tmp_path / "config.json"
+        path.write_text(content)
+
+        document = JSONSections(path)
+
+        expected = json.loads(content) if content.strip() else {}
+        assert {key: document.load(key) for key in document.keys()} == expected
+        document.close()
+
+    @pytest.mark.parametrize(
+        "content", ["[1, 2]", '{"a": [1, 2}', '{"a": "unterminated}', '{"a" 1}', '{"a": 1 "b": 2}']
+    )
+    def test_invalid_documents(self, tmp_path, content):
+        """Test that malformed documents are reported."""
+        path = tmp_path / "config.json"
+        path.write_text(content)
+
+        with pytest.raises(ValueError):
+            JSONSections(path).keys()
+
+
+class TestPartialFileStorage:
+    """Test cases for FileStorageBackend loading selected sections."""
+
+    def test_load_selected_sections(self, config_file):
+        """Test that only the requested sections are loaded."""
+        backend = FileStorageBackend(config_file, sections=["server", "name", "missing"])
+
+        assert backend.load() == {"server": DATA["server"], "name": "neko"}
+        backend.cleanup()
+
+    def test_save_keeps_unloaded_sections(self, config_file):
+        """Test that sections that were not loaded are written back unchanged."""
+        backend = FileStorageBackend(config_file, sections=["server", "name"])
+        data = backend.load()
+        data["server"]["port"] = 9000
+        del data["name"]
+        data["added"] = [1]
+
+        assert backend.save(data)
+
+        expected = dict(DATA, server={"host": "localhost", "port": 9000}, added=[1])
+        del expected["name"]
+        assert json.loads(config_file.read_text()) == expected
+        backend.cleanup()
+
+    def test_untouched_save_is_identical(self, config_file):
+        """Test that saving what was loaded reproduces the file."""
+        original = config_file.read_bytes()
+        backend = FileStorageBackend(config_file, sections=["flags"])
+
+        assert backend.save(backend.load())
+
+        assert config_file.read_bytes() == original
+        backend.cleanup()
+
+    def test_only_json_is_supported(self, tmp_path):
+        """Test that partial loading of other formats is rejected."""
+        with pytest.raises(ValueError):
+            FileStorageBackend(tmp_path / "config.yaml", lazy=True)
+
+
+class TestLazyConfig:
+    """Test cases for NekoConf with sections loaded on first access."""
+
+    @pytest.fixture(params=[False, True], ids=["dict", "persistent"])
+    def config(self, request, config_file):
+        config = NekoConf(FileStorageBackend(config_file, lazy=True), persistent=request.param)
+        yield config
+        config.cleanup()
+
+    def test_get_loads_one_section(self, config):
+        """Test that reading a value parses only its top-level section."""
+        assert config.get("flags.new_ui.enabled") is True
+        assert config.get("missing.key", "default") == "default"
+
+        assert list(config.data) == ["flags"]
+        assert "server" in config.storage_backend.pending_sections()
+
+    def test_get_all_loads_everything(self, config):
+        """Test that the full configuration is loaded when it is needed."""
+        assert config.to_dict() == DATA
+        assert config.storage_backend.pending_sections() == []
+
+    def test_set_keeps_section_siblings(self, config, config_file):
+        """Test that writing into an unloaded section does not lose its other keys."""
+        config.set("server.port", 9000)
+        assert config.save()
+
+        saved = json.loads(config_file.read_text())
+        assert saved["server"] == {"host": "localhost", "port": 9000}
+        assert saved["flags"] == DATA["flags"]
+        assert list(saved) == list(DATA)
+
+    def test_delete_section(self, config, config_file):
+        """Test that deleting an unloaded section removes it from the file."""
+        assert config.delete("routes")
+        assert config.save()
+
+        saved = json.loads(config_file.read_text())
+        assert "routes" not in saved
+        assert saved["server"] == DATA["server"]
+
+    def test_update_merges_into_sections(self, config):
+        """Test that updates merge with the stored section content."""
+        config.update({"server": {"port": 9000}})
+
+        assert config.get("server.host") == "localhost"
+        assert config.get("server.port") == 9000
+
+    def test_replace_compares_with_stored_sections(self, config):
+        """Test that replace sees the sections that were not loaded yet."""
+        assert config.get("flags.new_ui.enabled") is True
+        assert not config.replace(copy.deepcopy(DATA))
+
+        assert config.replace({"flags": copy.deepcopy(DATA["flags"])})
+        assert config.to_dict() == {"flags": DATA["flags"]}
+
+    def test_events_for_lazy_sections(self, config_file):
+        """Test that change events see the stored values of unloaded sections."""
+        config = NekoConf(FileStorageBackend(config_file, lazy=True), event_emission_enabled=True)
+        changes = []
+
+        @config.on_change("server.port")
+        def record(old_value, new_value, **kwargs):
+            changes.append((old_value, new_value))
+
+        config.set("server.port", 9000)
+
+        assert changes == [(8000, 9000)]
+        config.cleanup()
+
+    def test_env_overrides_apply_to_lazy_sections(self, config_file, monkeypatch):
+        """Test that environment overrides are applied on top of stored sections."""
+        monkeypatch.setenv("NEKOCONF_SERVER_PORT", "9000")
+
+        config = NekoConf(FileStorageBackend(config_file, lazy=True), env_override_enabled=True)
+
+        assert config.get("server") == {"host": "localhost", "port": 9000}
+        config.cleanup()
@@ -0,0 +1,150 @@
+"""Test cases for sharing configuration between processes through shared memory."""
+
+import subprocess
+import sys
+import time
+import uuid
+
+import pytest
+import yaml
+
+from nekoconf.core.config import NekoConf
+from nekoconf.storage import FileStorageBackend, SharedMemoryBackend, StorageError
+
+DATA = {"server": {"host": "localhost", "port": 8000}, "flags": {"new_ui": True}}
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def name():
+    return f"nekoconf-test-{uuid.uuid4().hex[:12]}"
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(DATA, sort_keys=False))
+    return path
+
+
+@pytest.fixture
+def publisher(name, config_file):
+    config = NekoConf(SharedMemoryBackend(name, FileStorageBackend(config_file)))
+    yield config
+    config.cleanup()
+
+
+class TestSharedMemoryBackend:
+    """Test cases for publishing and subscribing."""
+
+    def test_subscriber_sees_published_config(self, name, publisher):
+        """Test that a subscriber loads what the publisher loaded."""
+        with NekoConf(SharedMemoryBackend(name, watch=False), read_only=True) as config:
+            assert config.get_all() == DATA
+            assert config.storage_backend.generation == publisher.storage_backend.generation
+
+    def test_subscriber_refreshes_on_new_generation(self, name, publisher):
+        """Test that saves are picked up by the background refresh."""
+        backend = SharedMemoryBackend(name, poll_interval=0.01)
+        config = NekoConf(backend, read_only=True, event_emission_enabled=True)
+        changes = []
+        config.on_change("server.port")(lambda new_value, **kwargs: changes.append(new_value))
+
+        publisher.set("server.port", 9000)
+        assert publisher.save()
+
+        assert wait_for(lambda: config.get("server.port") == 9000)
+        assert changes == [9000]
+        config.cleanup()
+
+    def test_lazy_subscriber(self, name, publisher):
+        """Test that lazy subscribers decode sections on access, across refreshes."""
+        backend = SharedMemoryBackend(name, lazy=True, watch=False)
+        config = NekoConf(backend, read_only=True)
+
+        assert config.get("server.port") == 8000
+        assert list(config.data) == ["server"]
+
+        publisher.set("server.port", 9000)
+        publisher.set("flags.new_ui", False)
+        publisher.save()
+        assert backend.refresh()
+        backend._sync_refresh()
+
+        assert list(config.data) == ["server"]
+        assert config.get("server.port") == 9000
+        assert config.get("flags.new_ui") is False
+        config.cleanup()
+
+    def test_publishes_file_changes(self, name, config_file):
+        """Test that reloads of the wrapped backend are published."""
+        file_backend = FileStorageBackend(config_file)
+        publisher = NekoConf(SharedMemoryBackend(name, file_backend))
+        subscriber = SharedMemoryBackend(name, watch=False)
+        subscriber.load()
+
+        file_backend.sync(dict(DATA, server={"port": 7000}))
+
+        assert subscriber.refresh()
+        assert subscriber.load()["server"] == {"port": 7000}
+        assert publisher.get("server.port") == 7000
+        subscriber.cleanup()
+        publisher.cleanup()
+
+    def test_nothing_published(self, name):
+        """Test subscribing before anything is published."""
+        backend = SharedMemoryBackend(name, watch=False)
+
+        with pytest.raises(StorageError):
+            backend.load()
+        assert not backend.refresh()
+        assert not backend.save(DATA)
+
+    def test_publisher_restart(self, name, config_file):
+        """Test that a new publisher under the same name is picked up."""
+        first = SharedMemoryBackend(name, FileStorageBackend(config_file))
+        first.load()
+        subscriber = SharedMemoryBackend(name, watch=False)
+        subscriber.load()
+        first.cleanup()
+
+        second = SharedMemoryBackend(name, FileStorageBackend(config_file))
+        second.publish({"restarted": True})
+
+        assert subscriber.refresh()
+        assert subscriber.load() == {"restarted": True}
+        subscriber.cleanup()
+        second.cleanup()
+
+    def test_invalid_arguments(self, name, config_file):
+        """Test that invalid names and lazy publishers are rejected."""
+        with pytest.raises(ValueError):
+            SharedMemoryBackend("a/b", watch=False)
+        with pytest.raises(ValueError):
+            SharedMemoryBackend(name, FileStorageBackend(config_file), lazy=True)
+
+    def test_other_process(self, name, publisher):
+        """Test that a separate process attaches the published configuration."""
+        script = (
+            "import sys\n"
+            "from nekoconf.storage import SharedMemoryBackend\n"
+            "backend = SharedMemoryBackend(sys.argv[1], watch=False)\n"
+            "print(backend.load()['server']['port'])\n"
+            "backend.cleanup()\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script, name], capture_output=True, text=True, timeout=60
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "8000"
+        assert result.stderr == ""
+        assert SharedMemoryBackend(name, watch=False).load() == DATA
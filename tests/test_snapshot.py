@@ -0,0 +1,190 @@
+"""Test cases for the binary snapshot format and snapshot sidecars."""
+
+import datetime
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from nekoconf.core.config import NekoConf
+from nekoconf.storage.file import FileStorageBackend
+from nekoconf.utils.helper import load_file, save_file
+from nekoconf.utils.snapshot import (
+    Snapshot,
+    SnapshotError,
+    SnapshotList,
+    SnapshotMap,
+    encode_snapshot,
+)
+
+DATA = {
+    "server": {"host": "localhost", "port": 8000, "ratio": 0.5, "debug": False},
+    "zebra": None,
+    "alpha": [1, "two", [3.0], {"four": True}],
+    "big": 2**70,
+    "negative": -(2**63),
+    "unicode": "ñeko 猫",
+    "empty": {"dict": {}, "list": []},
+    "when": {"at": datetime.datetime(2024, 1, 2, 3, 4, 5), "on": datetime.date(2024, 1, 2)},
+    "binary": b"\x00\xff",
+}
+
+
+def old_stat(path, age=60):
+    """Back-date a file's mtime, outside the racy window."""
+    mtime = path.stat().st_mtime - age
+    os.utime(path, (mtime, mtime))
+
+
+class TestSnapshotFormat:
+    """Test cases for encoding and reading snapshots."""
+
+    def test_round_trip(self):
+        """Test that decoding restores the data, including key order and types."""
+        decoded = Snapshot(encode_snapshot(DATA)).to_python()
+
+        assert decoded == DATA
+        assert list(decoded) == list(DATA)
+        assert type(decoded["big"]) is int
+
+    def test_navigate_by_path(self):
+        """Test reading values by path without decoding the tree."""
+        snapshot = Snapshot(encode_snapshot(DATA))
+
+        assert snapshot.get("server.port") == 8000
+        assert snapshot.get("alpha[3].four") is True
+        assert snapshot.get("alpha[9]", "default") == "default"
+        assert snapshot.get("server.missing") is None
+        assert snapshot.get("zebra") is None
+        assert snapshot.get("unicode.nested", "default") == "default"
+
+    def test_views(self):
+        """Test that containers are exposed as read-only views."""
+        snapshot = Snapshot(encode_snapshot(DATA))
+
+        server = snapshot.get("server")
+        assert isinstance(server, SnapshotMap)
+        assert list(server) == ["host", "port", "ratio", "debug"]
+        assert server == DATA["server"]
+        assert server.to_dict() == DATA["server"]
+
+        alpha = snapshot.root["alpha"]
+        assert isinstance(alpha, SnapshotList)
+        assert alpha[-1]["four"] is True
+        assert alpha[1:3][0] == "two"
+        assert alpha.to_list() == DATA["alpha"]
+
+    def test_sections(self):
+        """Test the top-level section protocol used for lazy loading."""
+        snapshot = Snapshot(encode_snapshot(DATA))
+
+        assert snapshot.keys() == list(DATA)
+        assert "server" in snapshot
+        assert "missing" not in snapshot
+        assert snapshot.load("alpha") == DATA["alpha"]
+        with pytest.raises(KeyError):
+            snapshot.load("missing")
+
+    def test_repeated_strings_are_stored_once(self):
+        """Test that keys and values repeated across sections are deduplicated."""
+        section = {"enabled": True, "description": "a fairly long shared description"}
+        one = len(encode_snapshot({"s0": section}))
+        many = len(encode_snapshot({f"s{i}": dict(section) for i in range(100)}))
+
+        assert many < 100 * one / 3
+
+    def test_unsupported_data(self):
+        """Test that data without a snapshot representation is rejected."""
+        with pytest.raises(SnapshotError):
+            encode_snapshot({1: "int key"})
+        with pytest.raises(SnapshotError):
+            encode_snapshot({"value": object()})
+        with pytest.raises(SnapshotError):
+            Snapshot(b"not a snapshot at all, but long enough for a header")
+
+    def test_file_dispatch(self, tmp_path):
+        """Test that .nks files load and save through the codec registry."""
+        path = tmp_path / "config.nks"
+
+        assert save_file(path, DATA)
+
+        assert load_file(path, use_cache=False) == DATA
+        snapshot = Snapshot.open(path)
+        assert snapshot.get("server.host") == "localhost"
+        snapshot.close()
+
+
+class TestSnapshotSidecar:
+    """Test cases for FileStorageBackend keeping a snapshot next to the file."""
+
+    @pytest.fixture
+    def config_file(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text(yaml.safe_dump({"server": {"port": 8000}, "flags": {"a": True}}))
+        return path
+
+    def test_snapshot_written_on_load_and_save(self, config_file):
+        """Test that the sidecar follows the file content."""
+        backend = FileStorageBackend(config_file, snapshot=True)
+        sidecar = config_file.with_name("config.yaml.nks")
+
+        backend.load()
+        assert Snapshot(sidecar.read_bytes()).get("server.port") == 8000
+
+        assert backend.save({"server": {"port": 9000}})
+        assert Snapshot(sidecar.read_bytes()).get("server.port") == 9000
+
+    def test_fresh_snapshot_skips_parsing(self, config_file):
+        """Test that an up-to-date snapshot is used instead of the file."""
+        FileStorageBackend(config_file, snapshot=True).load()
+        old_stat(config_file)
+        FileStorageBackend(config_file, snapshot=True).load()
+
+        with patch("nekoconf.storage.file.read_file_data") as read:
+            data = FileStorageBackend(config_file, snapshot=True).load()
+
+        read.assert_not_called()
+        assert data == {"server": {"port": 8000}, "flags": {"a": True}}
+
+    def test_stale_snapshot_is_ignored(self, config_file):
+        """Test that an edited file is parsed again, even within the same second."""
+        FileStorageBackend(config_file, snapshot=True).load()
+        stat = config_file.stat()
+        config_file.write_text(yaml.safe_dump({"server": {"port": 7000}, "flags": {"a": 1}}))
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert FileStorageBackend(config_file, snapshot=True).load()["server"]["port"] == 7000
+
+    def test_lazy_yaml_from_snapshot(self, config_file):
+        """Test that lazy loading of any format works through the snapshot."""
+        FileStorageBackend(config_file, snapshot=True).load()
+        old_stat(config_file)
+        FileStorageBackend(config_file, snapshot=True).load()
+
+        with patch("nekoconf.storage.file.read_file_data") as read:
+            config = NekoConf(FileStorageBackend(config_file, lazy=True, snapshot=True))
+            assert config.get("server.port") == 8000
+            assert list(config.data) == ["server"]
+        read.assert_not_called()
+
+        config.set("server.port", 9000)
+        assert config.save()
+        saved = yaml.safe_load(config_file.read_text())
+        assert saved == {"server": {"port": 9000}, "flags": {"a": True}}
+        config.cleanup()
+
+    def test_lazy_without_usable_snapshot(self, config_file):
+        """Test lazy loading when the data cannot be stored in a snapshot."""
+        config_file.write_text("1: int key\nserver:\n  port: 8000\n")
+
+        config = NekoConf(FileStorageBackend(config_file, lazy=True, snapshot=True))
+
+        assert config.get("server.port") == 8000
+        assert config.to_dict() == {1: "int key", "server": {"port": 8000}}
+        config.cleanup()
+
+    def test_lazy_yaml_requires_snapshot(self, config_file):
+        """Test that lazy loading of YAML without a snapshot is rejected."""
+        with pytest.raises(ValueError):
+            FileStorageBackend(config_file, lazy=True)
@@ -0,0 +1,217 @@
+"""Stress tests for NekoConf in thread-safe mode."""
+
+import sys
+import threading
+
+import pytest
+
+from nekoconf.core.config import NekoConf
+from nekoconf.core.persistent import PersistentMap
+
+WRITERS = 8
+READERS = 8
+WRITES_PER_THREAD = 200
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """Switch threads as often as possible to provoke interleavings."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(targets):
+    """Start all targets together and re-raise the first failure."""
+    barrier = threading.Barrier(len(targets))
+    errors = []
+
+    def wrap(target):
+        def run():
+            barrier.wait()
+            try:
+                target()
+            except BaseException as e:  # noqa: BLE001 - reported below
+                errors.append(e)
+
+        return run
+
+    threads = [threading.Thread(target=wrap(target)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert not any(thread.is_alive() for thread in threads), "threads did not finish"
+    if errors:
+        raise errors[0]
+
+
+class TestThreadSafeConfig:
+    """Concurrent readers and writers on a thread-safe NekoConf."""
+
+    def test_thread_safe_implies_persistent(self):
+        """Test that thread-safe mode uses the immutable tree."""
+        config = NekoConf({"a": 1}, thread_safe=True)
+
+        assert config.persistent
+        assert isinstance(config.data, PersistentMap)
+
+    def test_no_lost_updates(self):
+        """Test that read-modify-write transactions are serialized."""
+        config = NekoConf({"counter": 0}, thread_safe=True)
+
+        def increment():
+            for _ in range(WRITES_PER_THREAD):
+                with config.transaction() as txn:
+                    txn.set("counter", txn.get("counter") + 1)
+
+        run_threads([increment] * WRITERS)
+
+        assert config.get("counter") == WRITERS * WRITES_PER_THREAD
+
+    def test_concurrent_sets_on_distinct_keys(self):
+        """Test that concurrent path-copying writes never drop each other."""
+        config = NekoConf({}, thread_safe=True)
+
+        def writer(index):
+            def run():
+                for i in range(WRITES_PER_THREAD):
+                    config.set(f"writer{index}.key{i}", i)
+
+            return run
+
+        run_threads([writer(index) for index in range(WRITERS)])
+
+        for index in range(WRITERS):
+            assert len(config.get(f"writer{index}")) == WRITES_PER_THREAD
+
+    def test_readers_see_consistent_monotonic_states(self):
+        """Test linearizability of reads against atomic multi-key writes.
+
+        Every write sets a version and a payload derived from it in one operation.
+        Readers must never see a torn state, and the versions each reader observes
+        must never go backwards.
+        """
+        config = NekoConf({"version": 0, "payload": {"a": 0, "b": 0}}, thread_safe=True)
+        version_lock = threading.Lock()
+        next_version = [0]
+        done = threading.Event()
+
+        def writer():
+            for i in range(WRITES_PER_THREAD):
+                with version_lock:
+                    next_version[0] += 1
+                    version = next_version[0]
+                    # Alternate between the write operations that publish new roots
+                    if i % 3 == 0:
+                        config.update(
+                            {"version": version, "payload": {"a": version, "b": -version}}
+                        )
+                    elif i % 3 == 1:
+                        config.replace(
+                            {"version": version, "payload": {"a": version, "b": -version}}
+                        )
+                    else:
+                        with config.transaction() as txn:
+                            txn.set("version", version)
+                            txn.set("payload.a", version)
+                            txn.set("payload.b", -version)
+
+        def reader():
+            last_seen = 0
+            while not done.is_set() or last_seen < next_version[0]:
+                snapshot = config.get_all()
+                version = snapshot["version"]
+                assert snapshot["payload"]["a"] == version
+                assert snapshot["payload"]["b"] == -version
+                assert version >= last_seen
+                last_seen = version
+
+        def writers_then_done():
+            try:
+                run_threads([writer] * WRITERS)
+            finally:
+                done.set()
+
+        run_threads([writers_then_done] + [reader] * READERS)
+
+        assert config.get("version") == WRITERS * WRITES_PER_THREAD
+
+    def test_background_sync_does_not_tear_reads(self):
+        """Test a storage sync thread replacing the config while others read it."""
+        configs = [{f"key{i}": generation for i in range(50)} for generation in range(20)]
+        config = NekoConf(dict(configs[0]), thread_safe=True)
+        done = threading.Event()
+
+        def sync():
+            try:
+                for _ in range(10):
+                    for data in configs:
+                        config._handle_storage_sync(data)
+            finally:
+                done.set()
+
+        def reader():
+            while not done.is_set():
+                snapshot = config.get_all()
+                assert len(set(snapshot.values())) == 1
+
+        run_threads([sync] + [reader] * READERS)
+
+    def test_events_follow_commit_order(self):
+        """Test that change events are delivered in the order writes are published."""
+        config = NekoConf({"counter": 0}, event_emission_enabled=True, thread_safe=True)
+        seen = []
+
+        @config.on_change("counter")
+        def record(new_value, **kwargs):
+            seen.append(new_value)
+
+        def increment():
+            for _ in range(WRITES_PER_THREAD):
+                with config.transaction() as txn:
+                    txn.set("counter", txn.get("counter") + 1)
+
+        run_threads([increment] * WRITERS)
+
+        assert seen == list(range(1, WRITERS * WRITES_PER_THREAD + 1))
+
+    def test_failed_transaction_releases_lock(self):
+        """Test that an exception inside a transaction does not keep writers blocked."""
+        config = NekoConf({"a": 1}, thread_safe=True)
+
+        with pytest.raises(RuntimeError):
+            with config.transaction() as txn:
+                txn.set("a", 2)
+                raise RuntimeError("abort")
+
+        def write():
+            config.set("a", 3)
+
+        run_threads([write])
+        assert config.get("a") == 3
+
+    def test_transaction_failing_to_start_releases_lock(self, monkeypatch):
+        """Test that a transaction failing before its body runs does not keep writers blocked."""
+        config = NekoConf({"a": 1}, thread_safe=True)
+
+        def fail(self):
+            raise RuntimeError("materialize failed")
+
+        monkeypatch.setattr(NekoConf, "_materialize", fail)
+        with pytest.raises(RuntimeError):
+            with config.transaction():
+                pass
+        monkeypatch.undo()
+
+        acquired = []
+
+        def write():
+            if config._write_lock.acquire(timeout=5):
+                acquired.append(True)
+                config._write_lock.release()
+
+        run_threads([write])
+        assert acquired == [True]
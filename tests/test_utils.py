@@ -4,23 +4,43 @@ This module provides comprehensive test coverage for the utility functions in Ne
 including file operations, data parsing, dictionary operations, and other helper functions.
 """
 
+import json
 import logging
+import math
 import os
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 import yaml
 
 from nekoconf.utils.helper import (
+    JSON_BACKENDS,
+    Codec,
+    CompiledPath,
+    clear_parse_cache,
+    clear_path_cache,
+    codec_info,
+    compile_path,
+    configure_parse_cache,
     create_file_if_not_exists,
     deep_merge,
+    delete_nested_value,
+    get_codec,
     get_nested_value,
     getLogger,
     is_async_callable,
     load_file,
+    load_string,
+    parse_cache_info,
+    parse_path,
     parse_value,
+    path_cache_info,
+    read_file_data,
+    register_codec,
     save_file,
+    serialize_file_data,
     set_nested_value,
+    use_json_backend,
 )
 
 
@@ -596,6 +616,237 @@ class TestDictionaryOperations:
         assert isinstance(data["a"]["b"]["c"]["d"]["e"], dict)
 
 
+class TestCompiledPath:
+    """Test suite for compiled path caching."""
+
+    def test_compile_path_segments(self):
+        """Test that compiled paths pre-split keys and convert list indices."""
+        compiled = compile_path("servers[0].config.*.port")
+
+        assert compiled.keys == ("servers", "0", "config", "*", "port")
+        assert compiled.segments == ("servers", 0, "config", "*", "port")
+        assert str(compiled) == "servers[0].config.*.port"
+        assert parse_path(compiled) == parse_path("servers[0].config.*.port")
+
+        assert len(compile_path("")) == 0
+        assert parse_path("") == []
+
+    def test_compile_path_is_interned(self):
+        """Test that the same path string yields the same cached object."""
+        clear_path_cache()
+
+        first = compile_path("database.host")
+        second = compile_path("database.host")
+
+        assert first is second
+        assert compile_path(first) is first
+
+        info = path_cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+        assert info.currsize == 1
+
+    def test_nested_value_functions_accept_compiled_paths(self):
+        """Test get/set/delete with compiled paths."""
+        data = {"servers": [{"host": "a"}], "database": {"host": "localhost"}}
+        host = compile_path("servers[0].host")
+
+        assert get_nested_value(data, host) == "a"
+        assert set_nested_value(data, host, "b") is True
+        assert get_nested_value(data, host) == "b"
+
+        assert delete_nested_value(data, CompiledPath("database.host")) == (True, "localhost")
+        assert data["database"] == {}
+
+        # Numeric keys are still set as dict keys when the parent is a dictionary
+        assert set_nested_value(data, compile_path("database.0"), "zero") is True
+        assert data["database"] == {"0": "zero"}
+
+
+class TestParseCache:
+    """Test cases for the load_file parse cache."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        info = parse_cache_info()
+        clear_parse_cache()
+        yield
+        configure_parse_cache(info["max_entries"], info["max_bytes"])
+
+    @staticmethod
+    def write(path, content, age=60):
+        """Write a file with an mtime in the past, outside the racy window."""
+        path.write_text(content)
+        mtime = path.stat().st_mtime - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        """Test that repeated loads of an unchanged file hit the cache."""
+        path = self.write(tmp_path / "config.yaml", "server:\n  port: 8000\n")
+
+        parse_file = lambda p, content: yaml.safe_load(content)  # noqa: E731
+        with patch("nekoconf.utils.helper.parse_file_data", side_effect=parse_file) as parse:
+            for _ in range(5):
+                assert load_file(path) == {"server": {"port": 8000}}
+
+        assert parse.call_count == 1
+        assert parse_cache_info()["hits"] == 4
+
+    def test_callers_get_private_copies(self, tmp_path):
+        """Test that mutating loaded data does not corrupt the cache."""
+        path = self.write(tmp_path / "config.yaml", "servers:\n  - host: a\n")
+
+        data = load_file(path)
+        data["servers"][0]["host"] = "changed"
+        data["new"] = True
+
+        assert load_file(path) == {"servers": [{"host": "a"}]}
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        """Test that a new file version misses and replaces the old entry."""
+        path = self.write(tmp_path / "config.yaml", "value: 1\n", age=120)
+        assert load_file(path) == {"value": 1}
+
+        self.write(path, "value: 2\n", age=60)
+
+        assert load_file(path) == {"value": 2}
+        assert parse_cache_info()["entries"] == 1
+
+    def test_recently_modified_file_is_not_cached(self, tmp_path):
+        """Test that files inside the racy mtime window are always parsed."""
+        path = tmp_path / "config.yaml"
+        path.write_text("value: 1\n")
+        load_file(path)
+
+        path.write_text("value: 2\n")
+
+        assert load_file(path) == {"value": 2}
+        assert parse_cache_info()["entries"] == 0
+
+    def test_eviction_bounds(self, tmp_path):
+        """Test that the cache evicts least recently used files when full."""
+        configure_parse_cache(max_entries=2, max_bytes=1024)
+        paths = [self.write(tmp_path / f"c{i}.yaml", f"value: {i}\n") for i in range(3)]
+        big = self.write(tmp_path / "big.yaml", "value: " + "x" * 2048 + "\n")
+
+        for path in paths:
+            load_file(path)
+        load_file(big)
+
+        info = parse_cache_info()
+        assert info["entries"] == 2
+        assert info["evictions"] == 1
+        assert info["bytes"] <= 1024
+
+    def test_bypass_cache(self, tmp_path):
+        """Test reading a file without the cache, with its content fingerprint."""
+        path = self.write(tmp_path / "config.json", '{"value": 1}')
+
+        data, fingerprint = read_file_data(path, use_cache=False)
+
+        assert data == {"value": 1}
+        assert fingerprint == read_file_data(path)[1]
+        assert parse_cache_info()["misses"] == 1
+
+
+class TestCodecs:
+    """Test cases for the serialization codec registry."""
+
+    @pytest.fixture(autouse=True)
+    def restore_codecs(self):
+        codecs = {fmt: get_codec(fmt) for fmt in codec_info()}
+        yield
+        for fmt, codec in codecs.items():
+            register_codec(fmt, codec)
+
+    DATA = {
+        "server": {"host": "localhost", "port": 8000, "ratio": 0.5, "enabled": True},
+        "tags": ["a", "b"],
+        "name": "ñeko 猫",
+        "empty": {},
+        "unset": None,
+    }
+
+    def test_format_by_extension(self):
+        """Test that codecs are chosen by file extension, defaulting to YAML."""
+        assert get_codec("config.JSON") is get_codec("json")
+        assert get_codec("config.yml") is get_codec("yaml")
+        assert get_codec("config.toml") is get_codec("toml")
+        assert get_codec("config.conf") is get_codec("yaml")
+
+    @pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml not available")
+    def test_yaml_uses_libyaml(self):
+        """Test that the C loader and dumper are used when available."""
+        assert codec_info()["yaml"] == "yaml-libyaml"
+
+    def test_yaml_output_unchanged(self):
+        """Test that the YAML codec writes what yaml.dump wrote before."""
+        expected = yaml.dump(self.DATA, default_flow_style=False, sort_keys=False, indent=2)
+
+        assert serialize_file_data("config.yaml", self.DATA) == expected.encode("utf-8")
+        assert get_codec("yaml").loads(expected.encode("utf-8")) == self.DATA
+
+    @pytest.mark.parametrize("backend", [name for name, codec in JSON_BACKENDS.items() if codec])
+    def test_json_backends_are_interchangeable(self, backend):
+        """Test that every installed JSON backend writes the same documents."""
+        expected = json.dumps(self.DATA, indent=2, ensure_ascii=False).encode("utf-8")
+
+        codec = use_json_backend(backend)
+
+        assert get_codec("config.json") is codec
+        assert serialize_file_data("config.json", self.DATA) == expected
+        assert codec.loads(expected) == self.DATA
+
+    @pytest.mark.parametrize("backend", [name for name, codec in JSON_BACKENDS.items() if codec])
+    def test_json_backends_fall_back_to_stdlib(self, backend):
+        """Test data the fast backends cannot handle themselves."""
+        codec = use_json_backend(backend)
+
+        assert json.loads(codec.dumps({"big": 2**70})) == {"big": 2**70}
+        assert math.isnan(codec.loads(b'{"value": NaN}')["value"])
+        with pytest.raises(ValueError):
+            codec.loads(b"{not json")
+
+    def test_default_json_backend_keeps_non_finite_floats(self):
+        """Test that the default JSON codec is the standard library, which keeps NaN."""
+        codec = get_codec("json")
+
+        assert codec.name == "json"
+        assert math.isinf(codec.loads(codec.dumps({"value": float("inf")}))["value"])
+        assert math.isnan(codec.loads(codec.dumps({"value": float("nan")}))["value"])
+
+    def test_unknown_json_backend(self):
+        """Test that unknown or missing backends are rejected."""
+        with pytest.raises(ValueError):
+            use_json_backend("simplejson")
+
+        with patch.dict(JSON_BACKENDS, {"ujson": None}):
+            with pytest.raises(ImportError):
+                use_json_backend("ujson")
+
+    def test_register_custom_codec(self, tmp_path):
+        """Test that registered codecs are used for loading and saving."""
+        codec = Codec(
+            "lines",
+            lambda content: dict(line.split("=", 1) for line in content.decode().splitlines()),
+            lambda data: "".join(f"{k}={v}\n" for k, v in data.items()).encode(),
+        )
+        register_codec("lines", codec, [".env"])
+        path = tmp_path / "app.env"
+
+        assert save_file(path, {"host": "localhost"})
+        assert path.read_text() == "host=localhost\n"
+        assert load_file(path, use_cache=False) == {"host": "localhost"}
+
+    def test_load_string_uses_codecs(self):
+        """Test that load_string parses through the registry."""
+        assert load_string("a: 1", "yaml") == {"a": 1}
+        assert load_string('{"a": 1}', "json") == {"a": 1}
+        assert load_string("a = 1", "toml") == {"a": 1}
+        assert load_string('{"a": 1}', "unknown") == {"a": 1}
+
+
 class TestAsyncUtils:
     """Test suite for async-related utility functions."""
 
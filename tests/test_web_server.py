@@ -1,6 +1,8 @@
 """Tests for the web server module."""
 
 import asyncio
+import json
+from datetime import date
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -33,14 +35,16 @@ class TestWebSocketManager:
         # Broadcast
         test_message = {"type": "test"}
         await manager.broadcast(test_message)
+        await manager.join()
 
-        # Both should receive the message
-        websocket1.send_json.assert_called_once_with(test_message)
-        websocket2.send_json.assert_called_once_with(test_message)
+        # Both should receive the message, encoded once
+        websocket1.send_text.assert_called_once_with('{"type":"test"}')
+        websocket2.send_text.assert_called_once_with('{"type":"test"}')
+        assert websocket1.send_text.call_args.args[0] is websocket2.send_text.call_args.args[0]
 
         # Reset mocks for next test
-        websocket1.send_json.reset_mock()
-        websocket2.send_json.reset_mock()
+        websocket1.send_text.reset_mock()
+        websocket2.send_text.reset_mock()
 
         # Disconnect one
         manager.disconnect(websocket1)
@@ -51,10 +55,11 @@ class TestWebSocketManager:
 
         # Broadcast again
         await manager.broadcast(test_message)
+        await manager.join()
 
         # Only second websocket should receive
-        websocket1.send_json.assert_not_called()
-        websocket2.send_json.assert_called_once()
+        websocket1.send_text.assert_not_called()
+        websocket2.send_text.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_broadcast_with_failed_send(self):
@@ -64,7 +69,7 @@ class TestWebSocketManager:
         # Create WebSockets - one that will fail on send
         websocket1 = AsyncMock(spec=WebSocket)
         websocket2 = AsyncMock(spec=WebSocket)
-        websocket2.send_json.side_effect = Exception("Connection failed")
+        websocket2.send_text.side_effect = Exception("Connection failed")
 
         # Connect them
         await manager.connect(websocket1)
@@ -72,6 +77,7 @@ class TestWebSocketManager:
 
         # Broadcast should handle the exception and disconnect the failing client
         await manager.broadcast({"type": "test"})
+        await manager.join()
 
         # Second websocket should be disconnected
         assert len(manager.connections) == 1
@@ -357,6 +363,58 @@ class TestConfigApp:
         # Verify that the websocket manager's broadcast was called
         # Note: This test verifies the event pipeline is set up, actual event handling may vary
 
+    @pytest.mark.parametrize("persistent", [False, True], ids=["dict", "persistent"])
+    def test_payload_cached_per_version(self, persistent):
+        """Test that the configuration is serialized once per version."""
+        config = NekoConf(
+            {"server": {"port": 8000}, "day": date(2025, 1, 1)},
+            event_emission_enabled=True,
+            persistent=persistent,
+        )
+        app = ConfigApp("test-app", config)
+
+        payload = app.payload()
+        assert app.payload() is payload
+        assert json.loads(payload.body) == {"server": {"port": 8000}, "day": "2025-01-01"}
+        message = json.loads(app.full_message("initial_config"))
+        assert message == {
+            "type": "initial_config",
+            "version": 0,
+            "etag": app.etag,
+            "data": {"server": {"port": 8000}, "day": "2025-01-01"},
+        }
+        assert app.payload() is payload
+
+        config.set("server.port", 9000)
+
+        assert app.payload() is not payload
+        assert app.payload().version == 1
+        assert json.loads(app.payload().text)["server"]["port"] == 9000
+
+    def test_payload_without_events(self):
+        """Test that configurations without events are serialized on every call."""
+        app = ConfigApp("test-app", NekoConf({"a": 1}))
+
+        assert app.payload() is not app.payload()
+        assert app.payload().etag is None
+
+    @pytest.mark.asyncio
+    async def test_update_serialized_once(self):
+        """Test that a change is sent to every client as the same encoded message."""
+        config = NekoConf({"test": "value"}, event_emission_enabled=True)
+        app = ConfigApp("test-app", config)
+        websockets = [AsyncMock(spec=WebSocket) for _ in range(3)]
+        for websocket in websockets:
+            await app.ws_manager.connect(websocket)
+
+        config.set("test", "new_value")
+        await asyncio.sleep(0.01)
+
+        sent = [websocket.send_text.call_args.args[0] for websocket in websockets]
+        assert sent[0] is sent[1] is sent[2]
+        assert json.loads(sent[0])["data"] == {"test": "new_value"}
+        assert app.full_message("update") == sent[0]
+
     def test_config_app_cleanup(self):
         """Test ConfigApp cleanup."""
         config = NekoConf({"test": "value"})
@@ -661,6 +719,92 @@ class TestNekoConfOrchestrator:
                 with client.websocket_connect("/ws/nonexistent") as websocket:
                     pass
 
+    def test_api_config_etag(self):
+        """Test conditional configuration requests with ETags."""
+        with patch("signal.signal"):
+            orchestrator = NekoConfOrchestrator()
+            client = TestClient(orchestrator.app)
+            orchestrator.manager.create_app("test-app")
+
+            response = client.get("/api/apps/test-app/config")
+            etag = response.headers["ETag"]
+            assert response.headers["Cache-Control"] == "no-cache"
+
+            for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+                response = client.get(
+                    "/api/apps/test-app/config", headers={"If-None-Match": header}
+                )
+                assert response.status_code == 304
+                assert response.headers["ETag"] == etag
+                assert response.content == b""
+
+            response = client.get(
+                "/api/apps/test-app/config/server.host", headers={"If-None-Match": etag}
+            )
+            assert response.status_code == 304
+
+            # Changes and recreated apps get new tags
+            client.put("/api/apps/test-app/config/server.host", json={"value": "new-host"})
+            response = client.get("/api/apps/test-app/config", headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.json()["server"]["host"] == "new-host"
+            assert response.headers["ETag"] != etag
+
+            etag = response.headers["ETag"]
+            orchestrator.manager.delete_app("test-app")
+            orchestrator.manager.create_app("test-app")
+            response = client.get("/api/apps/test-app/config", headers={"If-None-Match": etag})
+            assert response.status_code == 200
+
+    def test_api_config_precompressed(self):
+        """Test that large configurations are served from a cached compressed body."""
+        with patch("signal.signal"):
+            data = {"values": {f"key_{i}": f"value {i}" for i in range(200)}}
+            orchestrator = NekoConfOrchestrator(
+                apps={"test-app": NekoConf(data, event_emission_enabled=True)}
+            )
+            client = TestClient(orchestrator.app)
+            app = orchestrator.manager.get_app("test-app")
+
+            first = client.get("/api/apps/test-app/config", headers={"Accept-Encoding": "gzip"})
+            gzipped = app.payload().gzipped
+            second = client.get("/api/apps/test-app/config", headers={"Accept-Encoding": "gzip"})
+            plain = client.get("/api/apps/test-app/config", headers={"Accept-Encoding": ""})
+
+            assert first.headers["Content-Encoding"] == "gzip"
+            assert first.json() == second.json() == plain.json() == data
+            assert app.payload().gzipped is gzipped
+            assert "Content-Encoding" not in plain.headers
+
+    def test_api_config_without_events(self):
+        """Test that configurations without events are not tagged."""
+        with patch("signal.signal"):
+            orchestrator = NekoConfOrchestrator(apps={"test-app": NekoConf({"a": 1})})
+            client = TestClient(orchestrator.app)
+
+            response = client.get("/api/apps/test-app/config", headers={"If-None-Match": "*"})
+
+            assert response.status_code == 200
+            assert "ETag" not in response.headers
+
+    def test_websocket_since_current_version(self):
+        """Test that WebSocket clients with a current copy are not sent it again."""
+        with patch("signal.signal"):
+            orchestrator = NekoConfOrchestrator()
+            client = TestClient(orchestrator.app)
+            app = orchestrator.manager.create_app("test-app")
+            etag = app.etag
+
+            with client.websocket_connect(f"/ws/test-app?protocol=delta&since={etag}") as ws:
+                assert ws.receive_json() == {"type": "unchanged", "version": 0, "etag": etag}
+
+            app.config.set("server.port", 9000)
+            with client.websocket_connect(f"/ws/test-app?protocol=delta&since={etag}") as ws:
+                data = ws.receive_json()
+                assert data["type"] == "initial_config"
+                assert data["version"] == 1
+                assert data["etag"] == app.etag
+
     def test_api_error_handling(self):
         """Test API error handling for various edge cases."""
         with patch("signal.signal"):
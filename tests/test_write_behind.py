@@ -0,0 +1,190 @@
+"""Test cases for the write-behind storage backend."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from nekoconf.core.config import NekoConf
+from nekoconf.storage.base import StorageBackend
+from nekoconf.storage.file import FileStorageBackend
+from nekoconf.storage.writebehind import WriteBehindBackend
+from nekoconf.utils.helper import serialize_file_data
+
+
+class RecordingBackend(StorageBackend):
+    """In-memory backend recording every save."""
+
+    def __init__(self, fail=False):
+        super().__init__()
+        self.saved = []
+        self.data = {}
+        self.fail = fail
+        self.cleaned_up = False
+
+    def load(self):
+        return self.data
+
+    def save(self, data):
+        if self.fail:
+            return False
+        self.saved.append(data)
+        self.data = data
+        return True
+
+    def cleanup(self):
+        self.cleaned_up = True
+
+
+class TestWriteBehindBackend:
+    """Test cases for save coalescing."""
+
+    def test_burst_is_coalesced_into_one_write(self):
+        """Test that many saves within the window produce a single write."""
+        inner = RecordingBackend()
+        backend = WriteBehindBackend(inner, flush_interval=60, max_pending=1000)
+
+        for i in range(500):
+            assert backend.save({"value": i})
+
+        assert inner.saved == []
+        assert backend.pending == 500
+
+        assert backend.flush()
+        assert inner.saved == [{"value": 499}]
+
+        metrics = backend.metrics()
+        assert metrics["saves"] == 500
+        assert metrics["coalesced_saves"] == 499
+        assert metrics["pending_saves"] == 0
+        assert metrics["flushes"] == 1
+        assert metrics["max_flush_latency"] >= metrics["last_flush_latency"] >= 0
+        backend.cleanup()
+
+    def test_flush_after_interval(self):
+        """Test that pending data is written once the window has passed."""
+        inner = RecordingBackend()
+        backend = WriteBehindBackend(inner, flush_interval=0.05)
+
+        backend.save({"value": 1})
+        backend.save({"value": 2})
+
+        deadline = time.monotonic() + 5
+        while not inner.saved and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert inner.saved == [{"value": 2}]
+        assert backend.metrics()["max_staleness"] >= 0.05
+        backend.cleanup()
+
+    def test_max_pending_flushes_immediately(self):
+        """Test that reaching max_pending writes synchronously."""
+        inner = RecordingBackend()
+        backend = WriteBehindBackend(inner, flush_interval=60, max_pending=3)
+
+        for i in range(7):
+            backend.save({"value": i})
+
+        assert inner.saved == [{"value": 2}, {"value": 5}]
+        assert backend.pending == 1
+        backend.cleanup()
+
+    def test_cleanup_flushes_and_cleans_up_backend(self):
+        """Test that cleanup writes pending data before releasing the backend."""
+        inner = RecordingBackend()
+        backend = WriteBehindBackend(inner, flush_interval=60)
+
+        backend.save({"value": 1})
+        backend.cleanup()
+
+        assert inner.saved == [{"value": 1}]
+        assert inner.cleaned_up
+
+    def test_load_sees_pending_data(self):
+        """Test that loading flushes first, so it never returns stale data."""
+        inner = RecordingBackend()
+        backend = WriteBehindBackend(inner, flush_interval=60)
+
+        backend.save({"value": 1})
+
+        assert backend.load() == {"value": 1}
+        backend.cleanup()
+
+    def test_failed_flush_keeps_data_pending(self):
+        """Test that data is not lost when the wrapped backend fails."""
+        inner = RecordingBackend(fail=True)
+        backend = WriteBehindBackend(inner, flush_interval=60)
+
+        backend.save({"value": 1})
+        assert not backend.flush()
+        assert backend.pending == 1
+        assert backend.metrics()["failed_flushes"] == 1
+
+        inner.fail = False
+        assert backend.flush()
+        assert inner.saved == [{"value": 1}]
+        backend.cleanup()
+
+    def test_saved_data_is_copied(self):
+        """Test that changes made after a save do not reach the pending write."""
+        inner = RecordingBackend()
+        backend = WriteBehindBackend(inner, flush_interval=60)
+
+        data = {"section": {"value": 1}}
+        backend.save(data)
+        data["section"]["value"] = 2
+        data["other"] = True
+
+        assert backend.flush()
+        assert inner.saved == [{"section": {"value": 1}}]
+        backend.cleanup()
+
+    def test_invalid_settings(self):
+        """Test that invalid coalescing settings are rejected."""
+        with pytest.raises(ValueError):
+            WriteBehindBackend(RecordingBackend(), flush_interval=-1)
+        with pytest.raises(ValueError):
+            WriteBehindBackend(RecordingBackend(), max_pending=0)
+
+    def test_sync_handler_ignores_own_flushes(self):
+        """Test that flushes are not echoed back, while external syncs still are."""
+        inner = RecordingBackend()
+        backend = WriteBehindBackend(inner, flush_interval=60)
+        synced = []
+        backend._sync_handler = synced.append
+
+        # A backend that echoes its saves through the sync handler
+        inner.save = lambda data: inner.sync(data) or True
+        backend.save({"value": 1})
+        backend.flush()
+        assert synced == []
+
+        inner.sync({"value": "remote"})
+        assert synced == [{"value": "remote"}]
+        backend.cleanup()
+
+
+class TestWriteBehindConfig:
+    """Test cases for NekoConf with a write-behind file backend."""
+
+    def test_burst_of_updates_serializes_once(self, tmp_path):
+        """Test that 500 saved updates cost a single serialization."""
+        config_path = tmp_path / "config.yaml"
+        backend = WriteBehindBackend(
+            FileStorageBackend(config_path), flush_interval=60, max_pending=1000
+        )
+        config = NekoConf(backend, persistent=True)
+
+        with patch(
+            "nekoconf.storage.file.serialize_file_data", wraps=serialize_file_data
+        ) as serialize:
+            for i in range(500):
+                config.set(f"values.key{i}", i)
+                assert config.save()
+            config.cleanup()
+
+        assert serialize.call_count == 1
+        saved = yaml.safe_load(config_path.read_text())
+        assert len(saved["values"]) == 500
+        assert config.get("values.key499") == 499